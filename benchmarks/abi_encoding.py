@@ -0,0 +1,116 @@
+"""
+Microbenchmark of the calldata encoding of the hot contract methods.
+
+Compares Contract.encodeABI (the function is resolved by name in the ABI and the
+arguments go through the generic encoder on every call) with the compiled
+encoders of abi_encoder.encode_abi, checks that both give the same calldata and
+reports the time per call. Results are saved as JSON.
+
+Usage:
+    python -m benchmarks.abi_encoding
+    python -m benchmarks.abi_encoding --iterations 20000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+from web3 import Web3
+
+from min_library.models.contracts.abi_encoder import encode_abi
+from min_library.models.others.dataclasses import DefaultAbis
+from min_library.utils.helpers import read_json
+from tasks.coredao.coredao_contracts import CoreDaoBridgeContracts
+from tasks.stargate.stargate_contracts import StargateContracts
+
+RESULTS_FOLDER = os.path.join('benchmarks', 'results')
+
+ADDRESS = Web3.to_checksum_address('0x2d3a8b6e1c4fb0b4f0e4e16e1e0f1c3a9b3be2a1')
+TOKEN = '0x55d398326f99059fF775485246999027B3197955'
+SHADOW_ROUTER_ABI = read_json(path=('data', 'abis', 'shadow_swap', 'shadow_router_abi.json'))
+
+
+def get_cases() -> list[tuple[str, list[dict], str, tuple]]:
+    return [
+        ('erc20.approve', DefaultAbis.Token, 'approve', (ADDRESS, 2 ** 256 - 1)),
+        ('erc20.transfer', DefaultAbis.Token, 'transfer', (ADDRESS, 10 ** 18)),
+        (
+            'stargate.swap', StargateContracts.STARGATE_ROUTER_ABI, 'swap',
+            (102, 2, 2, ADDRESS, 10 ** 20, 995 * 10 ** 17, (0, 0, ADDRESS), ADDRESS, '0x')
+        ),
+        (
+            'stargate.swapETH', StargateContracts.STARGATE_ROUTER_ETH_ABI, 'swapETH',
+            (110, ADDRESS, ADDRESS, 10 ** 17, 995 * 10 ** 14)
+        ),
+        (
+            'stargate.sendTokens', StargateContracts.STARGATE_STG_ABI, 'sendTokens',
+            (102, ADDRESS, 10 ** 19, '0x0000000000000000000000000000000000000000',
+             '0x00010000000000000000000000000000000000000000000000000000000000014c08')
+        ),
+        (
+            'coredao.bridge', CoreDaoBridgeContracts.TO_CORE_BRIDGE_ABI, 'bridge',
+            (TOKEN, 10 ** 18, ADDRESS, (ADDRESS, '0x0000000000000000000000000000000000000000'), '0x')
+        ),
+        (
+            'shadowswap.swapExactTokensForETH', SHADOW_ROUTER_ABI, 'swapExactTokensForETH',
+            (10 ** 18, 10 ** 15, [TOKEN, ADDRESS], ADDRESS, 1_900_000_000)
+        ),
+    ]
+
+
+def time_per_call(function: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+
+    return (time.perf_counter() - start) / iterations
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure calldata encoding time')
+    parser.add_argument('--iterations', type=int, default=5_000)
+    parser.add_argument('--output', help='path to save the JSON results')
+    args = parser.parse_args(argv)
+
+    w3 = Web3()
+    results = []
+
+    for name, abi, fn_name, fn_args in get_cases():
+        contract = w3.eth.contract(address=TOKEN, abi=abi)
+
+        expected = contract.encodeABI(fn_name, args=fn_args)
+        if encode_abi(contract, fn_name, fn_args) != expected:
+            print(f'{name}: calldata of encode_abi differs from encodeABI')
+            return 1
+
+        before = time_per_call(lambda: contract.encodeABI(fn_name, args=fn_args), args.iterations)
+        after = time_per_call(lambda: encode_abi(contract, fn_name, fn_args), args.iterations)
+
+        results.append({
+            'name': name,
+            'encodeABI_us': round(before * 10 ** 6, 2),
+            'encode_abi_us': round(after * 10 ** 6, 2),
+            'speedup': round(before / after, 1),
+        })
+
+    for row in results:
+        print(
+            f'{row["name"]:<36} {row["encodeABI_us"]:>9} us -> '
+            f'{row["encode_abi_us"]:>7} us  x{row["speedup"]}'
+        )
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f'abi_encoding_{time.strftime("%Y%m%d_%H%M%S")}.json'
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({'python': sys.version, 'args': vars(args), 'results': results}, file, indent=2)
+    print(f'Results saved to {output}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
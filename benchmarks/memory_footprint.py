@@ -0,0 +1,167 @@
+"""
+Memory footprint of the core models created in large numbers per step.
+
+Measures the memory allocated by 10k accounts (AccountInfo with a SwapInfo and
+a SwapQuery each) and by 100k TokenAmount objects, plus the time to create them.
+Results are saved as JSON; pass --compare to check them against a previous result.
+
+Usage:
+    python -m benchmarks.memory_footprint
+    python -m benchmarks.memory_footprint --compare benchmarks/results/previous.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from min_library.models.account.account_manager import AccountInfo
+from min_library.models.contracts.raw_contract import TokenContract
+from min_library.models.networks.networks import Networks
+from min_library.models.others.constants import TokenSymbol
+from min_library.models.others.token_amount import TokenAmount
+from min_library.models.swap.swap_info import SwapInfo
+from min_library.models.swap.swap_query import SwapQuery
+from min_library.models.transactions.tx_args import TxArgs
+
+RESULTS_FOLDER = os.path.join('benchmarks', 'results')
+
+TOKEN = TokenContract(
+    title=TokenSymbol.USDT,
+    address='0x55d398326f99059fF775485246999027B3197955',
+    decimals=18
+)
+
+
+def measure(name: str, build: Callable[[], list[Any]]) -> dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    objects = build()
+    duration = time.perf_counter() - start
+
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'name': name,
+        'objects': len(objects),
+        'memory_mb': round(size / 1024 ** 2, 3),
+        'bytes_per_object': round(size / len(objects), 1),
+        'build_time_ms': round(duration * 1000, 3),
+    }
+    del objects
+
+    return result
+
+
+def build_accounts(count: int) -> list[Any]:
+    accounts = []
+
+    for index in range(count):
+        amount = TokenAmount(amount=index + 1, decimals=18, wei=True)
+        accounts.append((
+            AccountInfo(
+                account_id=index,
+                private_key=f'0x{index:064x}',
+                proxy=f'127.0.0.1:{8000 + index % 1000}'
+            ),
+            SwapInfo(
+                from_network=Networks.BSC,
+                to_network=Networks.Polygon,
+                from_token=TokenSymbol.USDT,
+                to_token=TokenSymbol.USDT,
+                amount=1.5
+            ),
+            SwapQuery(from_token=TOKEN, amount_from=amount, min_to_amount=amount),
+            TxArgs(amount=amount.Wei, to=index, slippage=50)
+        ))
+
+    return accounts
+
+
+def build_amounts(count: int, wei: bool) -> list[Any]:
+    if wei:
+        return [TokenAmount(amount=10 ** 18 + index, wei=True) for index in range(count)]
+
+    return [TokenAmount(amount=index / 1000, decimals=6) for index in range(count)]
+
+
+def build_amounts_with_views(count: int) -> list[Any]:
+    amounts = build_amounts(count, wei=True)
+    for amount in amounts:
+        amount.Ether
+
+    return amounts
+
+
+def compare(current: dict, previous: dict, threshold: float) -> list[str]:
+    previous_rows = {row['name']: row for row in previous.get('results', [])}
+    regressions = []
+
+    for row in current['results']:
+        old_row = previous_rows.get(row['name'])
+        if not old_row:
+            continue
+
+        for key in ('memory_mb', 'build_time_ms'):
+            if row[key] > old_row[key] * threshold:
+                regressions.append(
+                    f'{row["name"]}.{key}: {old_row[key]} -> {row[key]} '
+                    f'(x{round(row[key] / old_row[key], 2)})'
+                )
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure memory of the core models')
+    parser.add_argument('--accounts', type=int, default=10_000)
+    parser.add_argument('--amounts', type=int, default=100_000)
+    parser.add_argument('--output', help='path to save the JSON results')
+    parser.add_argument('--compare', help='path to previous JSON results')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    results = [
+        measure(f'accounts x{args.accounts}', lambda: build_accounts(args.accounts)),
+        measure(f'TokenAmount(wei=True) x{args.amounts}', lambda: build_amounts(args.amounts, True)),
+        measure(f'TokenAmount(ether) x{args.amounts}', lambda: build_amounts(args.amounts, False)),
+        measure(
+            f'TokenAmount(wei=True).Ether x{args.amounts}',
+            lambda: build_amounts_with_views(args.amounts)
+        ),
+    ]
+
+    for row in results:
+        print(
+            f'{row["name"]:<40} {row["memory_mb"]:>9} MB '
+            f'{row["bytes_per_object"]:>8} B/object {row["build_time_ms"]:>10} ms'
+        )
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f'memory_footprint_{time.strftime("%Y%m%d_%H%M%S")}.json'
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({'python': sys.version, 'args': vars(args), 'results': results}, file, indent=2)
+    print(f'Results saved to {output}')
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare({'results': results}, json.load(file), args.threshold)
+
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Benchmark of the transaction hot path and of full task modules against the local mock RPC.
+
+Measures Transaction.auto_add_params -> sign_transaction -> send_raw_transaction ->
+Tx.wait_for_tx_receipt per stage, RPC calls per transaction and throughput for
+1/10/100/1000 concurrent wallets, then runs each task module with the same
+concurrency levels. Results are saved as JSON; pass --compare to check them
+against a previous result.
+
+Usage:
+    python -m benchmarks.tx_hot_path
+    python -m benchmarks.tx_hot_path --concurrency 1 10 100 --modules stargate shadowswap
+    python -m benchmarks.tx_hot_path --compare benchmarks/results/previous.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from eth_utils import keccak
+
+from min_library.models.account.user_agents import user_agent_pool
+from min_library.models.contracts.allowance_ledger import allowance_ledger
+from min_library.models.logger.logger import CustomLogger, console_logger
+from min_library.models.mock_rpc.mock_chain import MockChain
+from min_library.models.mock_rpc.mock_rpc_server import MockRpcServer
+from min_library.models.networks.networks import Networks
+from min_library.models.prices.price_oracle import price_oracle
+from min_library.models.rpc.rpc_stats import rpc_stats
+from min_library.models.transactions.gas_model import gas_model
+
+PRICES_FILE = os.path.join('benchmarks', 'data', 'prices.json')
+RESULTS_FOLDER = os.path.join('benchmarks', 'results')
+STAGES = ('auto_add_params', 'sign_transaction', 'send_raw_transaction', 'wait_for_tx_receipt')
+
+
+def private_key(index: int) -> str:
+    return '0x' + keccak(text=f'benchmark-wallet-{index}').hex()
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+
+    values = sorted(values)
+
+    def percentile(percent: float) -> float:
+        index = min(int(round(percent / 100 * (len(values) - 1))), len(values) - 1)
+        return round(values[index] * 1000, 3)
+
+    return {
+        'count': len(values),
+        'mean_ms': round(statistics.fmean(values) * 1000, 3),
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'max_ms': round(values[-1] * 1000, 3),
+    }
+
+
+async def run_hot_path(server: MockRpcServer, concurrency: int) -> dict[str, Any]:
+    from min_library.models.client import Client
+
+    clients = [
+        Client(
+            account_id=index,
+            private_key=private_key(index),
+            network=Networks.BSC,
+            check_proxy=False,
+            create_log_file_per_account=False
+        )
+        for index in range(concurrency)
+    ]
+    timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+
+    async def one_tx(client: Client) -> None:
+        transaction = client.contract.transaction
+        tx_params = {
+            'to': '0x000000000000000000000000000000000000dEaD',
+            'value': 1,
+        }
+
+        start = time.perf_counter()
+        tx_params = await transaction.auto_add_params(tx_params)
+        timings['auto_add_params'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        signed_tx = await transaction.sign_transaction(tx_params)
+        timings['sign_transaction'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        tx_hash = await client.account_manager.w3.eth.send_raw_transaction(
+            signed_tx.rawTransaction
+        )
+        timings['send_raw_transaction'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await client.account_manager.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=120, poll_latency=0.1
+        )
+        timings['wait_for_tx_receipt'].append(time.perf_counter() - start)
+
+    calls_before = Counter(server.chain.calls)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(one_tx(client) for client in clients), return_exceptions=True
+    )
+    wall_time = time.perf_counter() - start
+    rpc_calls = Counter(server.chain.calls) - calls_before
+
+    errors = [repr(result) for result in results if isinstance(result, Exception)]
+    succeeded = concurrency - len(errors)
+
+    return {
+        'concurrency': concurrency,
+        'succeeded': succeeded,
+        'errors': errors[:5],
+        'wall_time_s': round(wall_time, 3),
+        'throughput_tx_per_s': round(succeeded / wall_time, 3) if wall_time else None,
+        'stages': {stage: summarize(values) for stage, values in timings.items()},
+        'rpc_calls_per_tx': {
+            method: round(count / max(succeeded, 1), 3)
+            for method, count in sorted(rpc_calls.items())
+        },
+        'rpc_calls_total_per_tx': round(sum(rpc_calls.values()) / max(succeeded, 1), 3),
+    }
+
+
+def get_module_runners() -> dict[str, Callable[[Any], Awaitable[Any]]]:
+    from min_library.models.others.constants import TokenSymbol
+    from min_library.models.swap.swap_info import SwapInfo
+    from user_data.settings import modules_settings
+
+    return {
+        'stargate': lambda account: modules_settings.bridge_stargate(
+            account,
+            SwapInfo(
+                from_network=Networks.BSC,
+                to_network=Networks.Polygon,
+                from_token=TokenSymbol.USDT,
+                to_token=TokenSymbol.USDT,
+                slippage=0.3
+            )
+        ),
+        'coredao': lambda account: modules_settings.bridge_coredao(account),
+        'shadowswap': lambda account: modules_settings.swap_shadowswap(account),
+        'pancakeswap': lambda account: modules_settings.swap_pancake(
+            account,
+            SwapInfo(
+                from_network=Networks.BSC,
+                from_token=TokenSymbol.USDT,
+                to_token=TokenSymbol.USDC
+            )
+        ),
+    }
+
+
+async def run_module(
+    server: MockRpcServer,
+    name: str,
+    runner: Callable[[Any], Awaitable[Any]],
+    concurrency: int
+) -> dict[str, Any]:
+    from min_library.models.account.account_manager import AccountInfo
+    from min_library.models.account.account_session import AccountSession
+
+    accounts = [
+        AccountInfo(account_id=index, private_key=private_key(index))
+        for index in range(concurrency)
+    ]
+    for account in accounts:
+        account.session = AccountSession(account, create_log_file_per_account=False)
+    durations = []
+
+    async def one_run(account: AccountInfo) -> Any:
+        start = time.perf_counter()
+        result = await runner(account)
+        durations.append(time.perf_counter() - start)
+
+        if not result:
+            raise RuntimeError(f'{name} returned {result!r}')
+
+        return result
+
+    calls_before = Counter(server.chain.calls)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(one_run(account) for account in accounts), return_exceptions=True
+    )
+    wall_time = time.perf_counter() - start
+    rpc_calls = Counter(server.chain.calls) - calls_before
+
+    errors = [repr(result) for result in results if isinstance(result, Exception)]
+    succeeded = concurrency - len(errors)
+
+    return {
+        'concurrency': concurrency,
+        'succeeded': succeeded,
+        'errors': sorted(set(errors))[:5],
+        'wall_time_s': round(wall_time, 3),
+        'throughput_runs_per_s': round(succeeded / wall_time, 3) if wall_time else None,
+        'run_latency': summarize(durations),
+        'rpc_calls_per_run': round(sum(rpc_calls.values()) / concurrency, 3),
+        'rpc_calls_by_method': dict(sorted(rpc_calls.items())),
+    }
+
+
+def compare(current: dict, previous: dict, threshold: float) -> list[str]:
+    """
+    Find p50 latencies and RPC counts that became worse than `threshold` times.
+
+    Returns:
+        list[str]: the regressions found.
+
+    """
+    regressions = []
+
+    def check(label: str, new: float | None, old: float | None) -> None:
+        if new and old and new > old * threshold:
+            regressions.append(f'{label}: {old} -> {new} (x{round(new / old, 2)})')
+
+    previous_hot_path = {row['concurrency']: row for row in previous.get('hot_path', [])}
+    for row in current.get('hot_path', []):
+        old_row = previous_hot_path.get(row['concurrency'])
+        if not old_row:
+            continue
+        for stage in STAGES:
+            check(
+                f'hot_path[{row["concurrency"]}].{stage}.p50_ms',
+                row['stages'].get(stage, {}).get('p50_ms'),
+                old_row['stages'].get(stage, {}).get('p50_ms')
+            )
+        check(
+            f'hot_path[{row["concurrency"]}].rpc_calls_total_per_tx',
+            row['rpc_calls_total_per_tx'], old_row['rpc_calls_total_per_tx']
+        )
+
+    for module, rows in current.get('modules', {}).items():
+        previous_rows = {
+            row['concurrency']: row for row in previous.get('modules', {}).get(module, [])
+        }
+        for row in rows:
+            old_row = previous_rows.get(row['concurrency'])
+            if not old_row:
+                continue
+            check(
+                f'{module}[{row["concurrency"]}].run_latency.p50_ms',
+                row['run_latency'].get('p50_ms'), old_row['run_latency'].get('p50_ms')
+            )
+            check(
+                f'{module}[{row["concurrency"]}].rpc_calls_per_run',
+                row['rpc_calls_per_run'], old_row['rpc_calls_per_run']
+            )
+
+    return regressions
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    server = MockRpcServer(
+        chain=MockChain(block_time=args.block_time, error_rate=args.error_rate),
+        latency=args.latency,
+        jitter=args.jitter
+    )
+    Networks.override_rpc(server.start())
+    price_oracle.prices_file = PRICES_FILE
+    # benchmark wallets and mock receipts must not be saved next to the real ones
+    user_agent_pool.assignments_path = None
+    gas_model.path = None
+    allowance_ledger.path = None
+    # mock events and logs must not be mixed with the real ones either
+    CustomLogger.EVENTS = None
+    CustomLogger.MAIN_LOG_FILE = None
+    for handler in [handler for handler in console_logger.handlers if isinstance(handler, logging.FileHandler)]:
+        console_logger.removeHandler(handler)
+        handler.close()
+
+    results: dict[str, Any] = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'hot_path': [],
+        'modules': {},
+    }
+
+    try:
+        for concurrency in args.concurrency:
+            row = await run_hot_path(server, concurrency)
+            results['hot_path'].append(row)
+            print(
+                f'hot_path x{concurrency}: {row["throughput_tx_per_s"]} tx/s, '
+                f'{row["rpc_calls_total_per_tx"]} RPC/tx, '
+                f'errors: {concurrency - row["succeeded"]}'
+            )
+
+        module_runners = get_module_runners()
+        for name in args.modules:
+            results['modules'][name] = []
+            for concurrency in args.concurrency:
+                row = await run_module(server, name, module_runners[name], concurrency)
+                results['modules'][name].append(row)
+                print(
+                    f'{name} x{concurrency}: {row["throughput_runs_per_s"]} runs/s, '
+                    f'{row["rpc_calls_per_run"]} RPC/run, '
+                    f'errors: {concurrency - row["succeeded"]}'
+                )
+    finally:
+        server.stop()
+
+    results['rpc_stats'] = rpc_stats.snapshot()
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the transaction hot path')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument(
+        '--modules', nargs='*', default=['stargate', 'coredao', 'shadowswap', 'pancakeswap']
+    )
+    parser.add_argument('--block-time', type=float, default=0)
+    parser.add_argument('--latency', type=float, default=0, help='mock RPC latency, secs')
+    parser.add_argument('--jitter', type=float, default=0, help='mock RPC jitter, secs')
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--output', help='path to save the JSON results')
+    parser.add_argument('--compare', help='path to previous JSON results')
+    parser.add_argument(
+        '--threshold', type=float, default=1.2,
+        help='report a regression when a value is this many times worse'
+    )
+    parser.add_argument('--verbose', action='store_true', help='keep module logs')
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # custom log levels (APPROVED, BRIDGED, ...) are above CRITICAL
+        logging.disable(1000)
+
+    results = asyncio.run(run(args))
+
+    output = args.output or os.path.join(
+        RESULTS_FOLDER, f'tx_hot_path_{time.strftime("%Y%m%d_%H%M%S")}.json'
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2, default=str)
+    print(f'Results saved to {output}')
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
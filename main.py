@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import random
 import sys
@@ -10,7 +11,19 @@ from questionary import (
 )
 
 from min_library.models.account.account_manager import AccountInfo
-from min_library.models.logger.logger import console_logger
+from min_library.models.account.key_store import load_keystore_keys
+from min_library.models.logger.logger import CustomLogger, console_logger
+from min_library.models.metrics.metrics import (
+    ACCOUNTS_QUEUED, ACTIVE_ACCOUNTS, MODULE_RUNS, MetricsExporter, metrics
+)
+from min_library.models.profiling.loop_monitor import LoopMonitor
+from min_library.models.profiling.profiler import AsyncProfiler
+from min_library.models.rpc.rate_limiter import rate_limiter
+from min_library.models.rpc.rpc_stats import rpc_stats
+from min_library.models.runner.coordinator import Coordinator
+from min_library.models.runner.sharded_runner import ShardedRunner
+from min_library.models.runner.worker import CoordinatorWorker
+from min_library.models.tracing.tracer import tracer
 from min_library.utils.config import (
     ACCOUNT_NAMES, PRIVATE_KEYS, PROXIES, RECIPIENTS
 )
@@ -21,11 +34,42 @@ from user_data.settings.modules_settings import (
     bridge_coredao, bridge_stargate, custom_routes, swap_shadowswap, transfer_tokens
 )
 from user_data.settings.settings import (
+    ACCOUNTS_PER_SHARD,
+    COORDINATOR_HOST,
+    COORDINATOR_JOURNAL_FILE,
+    COORDINATOR_PORT,
+    COORDINATOR_TOKEN,
+    HEARTBEAT_INTERVAL,
     IS_ACCOUNT_NAMES,
+    IS_LOOP_MONITOR,
+    IS_METRICS,
+    IS_RPC_STATS,
     IS_SHUFFLE_WALLETS,
-    IS_SLEEP
+    IS_SLEEP,
+    LEASE_TTL,
+    LOOP_BLOCK_THRESHOLD,
+    MAX_CONCURRENT_ACCOUNTS,
+    MAX_JOB_ATTEMPTS,
+    METRICS_FILE,
+    METRICS_INTERVAL,
+    METRICS_PORT,
+    NETWORK_CONCURRENCY_LIMITS,
+    PROFILE_FOLDER,
+    PROFILE_INTERVAL,
+    RPC_STATS_FILE,
+    SHARDS,
+    SLEEP_BETWEEN_ACCS_FROM,
+    SLEEP_BETWEEN_ACCS_TO,
+    TRACE_FILE,
+    WORKER_CAPACITY
 )
 
+# the modules that workers run by the name from the coordinator
+MODULES = {
+    module.__name__: module
+    for module in (bridge_stargate, bridge_coredao, swap_shadowswap, transfer_tokens, custom_routes)
+}
+
 
 def greetings():
     name_label = "========= zkBridge Minter Software ========="
@@ -133,27 +177,187 @@ def measure_time_for_all_work(start_time: float):
     )
 
 
-async def main(module):
+def parse_args():
+    parser = argparse.ArgumentParser(description='zkBridge Minter Software')
+    parser.add_argument(
+        '--profile', action='store_true',
+        help=f'sample the event loop and save a report to {PROFILE_FOLDER}'
+    )
+    parser.add_argument(
+        '--no-collapsed', action='store_true',
+        help="don't save the flamegraph-compatible collapsed stacks with --profile"
+    )
+    parser.add_argument(
+        '--shards', type=int, default=SHARDS,
+        help=f'run the accounts in this number of processes ({SHARDS})'
+    )
+    parser.add_argument(
+        '--coordinator', action='store_true',
+        help=f'give the accounts to workers on http://{COORDINATOR_HOST}:{COORDINATOR_PORT}'
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='with --coordinator, skip the accounts succeeded in the last run of the journal'
+    )
+    parser.add_argument(
+        '--worker', metavar='URL',
+        help='run the accounts given by the coordinator on URL'
+    )
+
+    return parser.parse_args()
+
+
+async def profile(
+    module,
+    is_collapsed: bool = True,
+    shards: int = SHARDS,
+    is_coordinator: bool = False,
+    is_resume: bool = False,
+    worker_url: str | None = None
+):
+    profiler = AsyncProfiler(interval=PROFILE_INTERVAL)
+    profiler.start()
+
+    try:
+        await main(
+            module,
+            shards=shards,
+            is_coordinator=is_coordinator,
+            is_resume=is_resume,
+            worker_url=worker_url
+        )
+    finally:
+        profiler.stop()
+        paths = profiler.save(PROFILE_FOLDER, is_collapsed=is_collapsed)
+
+        for name, path in paths.items():
+            console_logger.info(f'Profile {name} is saved to {path}')
+
+
+async def run_accounts(module, accounts: List[AccountInfo]):
+    ACCOUNTS_QUEUED.set(len(accounts))
+
+    for account in accounts:
+        ACCOUNTS_QUEUED.dec()
+        ACTIVE_ACCOUNTS.inc()
+        try:
+            is_result = await run_module(module, account)
+        finally:
+            ACTIVE_ACCOUNTS.dec()
+            # the account is done, its clients are not needed anymore
+            account.session = None
+
+        MODULE_RUNS.inc(
+            module=module.__name__, result='success' if is_result else 'fail'
+        )
+
+        if IS_SLEEP and account != accounts[-1] and is_result:
+            await delay(
+                random.randint(SLEEP_BETWEEN_ACCS_FROM, SLEEP_BETWEEN_ACCS_TO),
+                'before next account'
+            )
+
+
+async def main(
+    module,
+    shards: int = SHARDS,
+    is_coordinator: bool = False,
+    is_resume: bool = False,
+    worker_url: str | None = None
+):
     accounts = get_accounts()
 
     if IS_SHUFFLE_WALLETS:
         random.shuffle(accounts)
 
-    for account in accounts:
-        is_result = await run_module(module, account)
+    metrics_exporter = None
+    if IS_METRICS:
+        metrics_exporter = MetricsExporter(
+            metrics,
+            file_path=METRICS_FILE,
+            port=METRICS_PORT,
+            interval=METRICS_INTERVAL
+        )
+        await metrics_exporter.start()
+
+    loop_monitor = None
+    if IS_LOOP_MONITOR:
+        loop_monitor = LoopMonitor(threshold=LOOP_BLOCK_THRESHOLD)
+        loop_monitor.start()
+
+    if worker_url:
+        worker = CoordinatorWorker(
+            worker_url,
+            accounts=accounts,
+            modules=MODULES,
+            capacity=WORKER_CAPACITY,
+            token=COORDINATOR_TOKEN,
+            heartbeat_interval=HEARTBEAT_INTERVAL
+        )
+        await worker.run()
+    elif is_coordinator:
+        coordinator = Coordinator(
+            module.__name__,
+            host=COORDINATOR_HOST,
+            port=COORDINATOR_PORT,
+            token=COORDINATOR_TOKEN,
+            journal_path=COORDINATOR_JOURNAL_FILE,
+            lease_ttl=LEASE_TTL,
+            max_attempts=MAX_JOB_ATTEMPTS
+        )
+        await coordinator.run([account.account_id for account in accounts], resume=is_resume)
+    elif shards > 1:
+        runner = ShardedRunner(
+            module,
+            shards=shards,
+            accounts_per_shard=ACCOUNTS_PER_SHARD,
+            max_concurrent_accounts=MAX_CONCURRENT_ACCOUNTS,
+            network_limits=NETWORK_CONCURRENCY_LIMITS
+        )
+        await runner.run(accounts)
+    else:
+        await run_accounts(module, accounts)
 
-        if IS_SLEEP and account != accounts[-1] and is_result:
-            await delay(message='before next account')
+    if metrics_exporter:
+        await metrics_exporter.stop()
+
+    if loop_monitor:
+        loop_monitor.stop()
+
+        for line in loop_monitor.summary_lines():
+            console_logger.info(line)
+
+    if CustomLogger.EVENTS:
+        CustomLogger.EVENTS.flush()
+
+    if IS_RPC_STATS and rpc_stats.methods:
+        rpc_stats.dump(RPC_STATS_FILE)
+
+        for line in rpc_stats.summary_lines():
+            console_logger.info(line)
+
+    if rate_limiter.buckets:
+        for line in rate_limiter.summary_lines():
+            console_logger.info(line)
+
+    if tracer.enabled:
+        tracer.export(TRACE_FILE)
+        console_logger.info(f'Trace of the run is saved to {TRACE_FILE}')
 
 if __name__ == '__main__':
+    args = parse_args()
+
     greetings()
 
+    PRIVATE_KEYS.extend(load_keystore_keys())
+
     if not is_bot_setuped_to_start():
         exit_label = "========= The bot has ended it's work! ========="
         format_output(exit_label)
         sys.exit()
 
-    module_data = get_module()
+    # workers take the module from the coordinator
+    module_data = None if args.worker else get_module()
 
     start_time = time.time()
 
@@ -161,7 +365,23 @@ if __name__ == '__main__':
         "The bot started to measure time for all work"
     )
 
-    asyncio.run(main(module_data))
+    if args.profile:
+        asyncio.run(profile(
+            module_data,
+            is_collapsed=not args.no_collapsed,
+            shards=args.shards,
+            is_coordinator=args.coordinator,
+            is_resume=args.resume,
+            worker_url=args.worker
+        ))
+    else:
+        asyncio.run(main(
+            module_data,
+            shards=args.shards,
+            is_coordinator=args.coordinator,
+            is_resume=args.resume,
+            worker_url=args.worker
+        ))
 
     measure_time_for_all_work(start_time)
     end_of_work()
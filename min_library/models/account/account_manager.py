@@ -5,12 +5,18 @@ from web3 import Web3
 from web3.eth import AsyncEth
 from web3.middleware import async_geth_poa_middleware
 from eth_account.signers.local import LocalAccount
-from fake_useragent import UserAgent
 
 from min_library.models.networks.network import Network
 from min_library.models.networks.networks import Networks
+from min_library.models.account.key_store import get_local_account
+from min_library.models.account.user_agents import user_agent_pool
 from min_library.models.logger.logger import CustomLogger
+from min_library.models.retry.retry_policy import build_retry_middleware
+from min_library.models.rpc.rate_limiter import build_rate_limit_middleware
+from min_library.models.rpc.rpc_stats import build_rpc_stats_middleware
+from min_library.models.tracing.tracer import build_tracing_middleware, tracer
 import min_library.models.others.exceptions as exceptions
+from user_data.settings.settings import IS_RPC_STATS
 
 
 class AccountManager:
@@ -30,21 +36,75 @@ class AccountManager:
         self.account_id = account_id
         self.network = network
         self.proxy = proxy
-        self._initialize_proxy(check_proxy)
-        self._initialize_headers()
 
-        self.w3 = Web3(
+        with tracer.span('AccountManager._initialize_proxy', 'setup'):
+            self._initialize_proxy(check_proxy)
+
+        with tracer.span('AccountManager._initialize_headers', 'setup'):
+            self._initialize_headers()
+
+        self.w3 = self.create_web3(self.network, self.proxy, self.headers)
+
+        self._initialize_account(private_key)
+        self._initialize_logger(create_log_file_per_account)
+
+    @staticmethod
+    def create_web3(
+        network: Network,
+        proxy: str | None = None,
+        headers: dict | None = None
+    ) -> Web3:
+        """
+        Create an async Web3 instance with all middlewares for a random RPC of the network.
+
+        Args:
+            network (Network): the network.
+            proxy (str | None): the proxy for RPC requests. (None)
+            headers (dict | None): the headers for RPC requests. (None)
+
+        Returns:
+            Web3: the Web3 instance.
+
+        """
+        endpoint_uri = random.choice(network.rpc)
+
+        w3 = Web3(
             Web3.AsyncHTTPProvider(
-                endpoint_uri=random.choice(self.network.rpc),
-                request_kwargs={'proxy': self.proxy, 'headers': self.headers}
+                endpoint_uri=endpoint_uri,
+                request_kwargs={'proxy': proxy, 'headers': headers}
             ),
             modules={'eth': (AsyncEth,)},
             middlewares=[]
         )
-        self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
 
-        self._initialize_account(private_key)
-        self._initialize_logger(create_log_file_per_account)
+        # injected before rpc_stats and tracing, so they see every attempt
+        w3.middleware_onion.inject(
+            build_retry_middleware(network.name, endpoint_uri),
+            name='retry',
+            layer=0
+        )
+
+        # inside the retry middleware, so a retry waits for the limiters too
+        rate_limit_middleware = build_rate_limit_middleware(endpoint_uri, proxy)
+        if rate_limit_middleware:
+            w3.middleware_onion.inject(rate_limit_middleware, name='rate_limit', layer=0)
+
+        if IS_RPC_STATS:
+            w3.middleware_onion.inject(
+                build_rpc_stats_middleware(network.name, endpoint_uri),
+                name='rpc_stats',
+                layer=0
+            )
+
+        if tracer.enabled:
+            w3.middleware_onion.inject(
+                build_tracing_middleware(network.name),
+                name='tracing',
+                layer=0
+            )
+
+        return w3
 
     def _initialize_proxy(self, check_proxy: bool):
         if not self.proxy:
@@ -67,7 +127,7 @@ class AccountManager:
             'Accept': '*/*',
             'Accept-Language': 'en-US,en;q=0.9',
             'Content-Type': 'application/json',
-            'User-Agent': UserAgent().random
+            'User-Agent': user_agent_pool.get(self.account_id)
         }
 
     def _initialize_logger(
@@ -83,8 +143,7 @@ class AccountManager:
 
     def _initialize_account(self, private_key: str | None):
         if private_key:
-            self.account = self.w3.eth.account.from_key(
-                private_key=private_key)
+            self.account = get_local_account(private_key)
 
         elif private_key == '':
             self.account = None
@@ -95,6 +154,8 @@ class AccountManager:
             
 
 class AccountInfo:
+    __slots__ = ('account_id', 'private_key', 'proxy', 'recipient_address', 'session')
+
     def __init__(
         self,
         account_id: str | int,
@@ -106,3 +167,5 @@ class AccountInfo:
         self.private_key = private_key
         self.proxy = proxy
         self.recipient_address = recepient_address
+        # AccountSession with clients reused by all steps of the account's route
+        self.session = None
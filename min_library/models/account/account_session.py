@@ -0,0 +1,86 @@
+from min_library.models.account.account_manager import AccountInfo
+from min_library.models.client import Client
+from min_library.models.networks.network import Network
+import min_library.models.others.exceptions as exceptions
+from user_data.settings.settings import IS_CREATE_LOGS_FOR_EVERY_WALLET
+
+
+class AccountSession:
+    """
+    Clients of one account, created lazily once per network and reused by all steps of a route.
+
+    The proxy is checked only when the first client is created, later clients
+    reuse the verdict. The account and the headers are shared through the caches
+    of AccountManager.
+
+    Attributes:
+        account_info (AccountInfo): the account.
+        clients (dict[str, Client]): the clients by network name.
+
+    """
+
+    def __init__(
+        self,
+        account_info: AccountInfo,
+        check_proxy: bool = True,
+        create_log_file_per_account: bool = IS_CREATE_LOGS_FOR_EVERY_WALLET
+    ) -> None:
+        self.account_info = account_info
+        self.check_proxy = check_proxy
+        self.create_log_file_per_account = create_log_file_per_account
+        self.clients: dict[str, Client] = {}
+
+        self._proxy_error: exceptions.InvalidProxy | None = None
+
+    def get_client(self, network: Network) -> Client:
+        """
+        Get the client of the account in the network.
+
+        Args:
+            network (Network): the network.
+
+        Returns:
+            Client: the client.
+
+        """
+        if network.name in self.clients:
+            return self.clients[network.name]
+
+        if self._proxy_error:
+            raise self._proxy_error
+
+        try:
+            client = Client(
+                account_id=self.account_info.account_id,
+                private_key=self.account_info.private_key,
+                network=network,
+                proxy=self.account_info.proxy,
+                check_proxy=self.check_proxy,
+                create_log_file_per_account=self.create_log_file_per_account
+            )
+        except exceptions.InvalidProxy as e:
+            self._proxy_error = e
+            raise
+
+        # the proxy works, there is no need to check it for other networks
+        self.check_proxy = False
+        self.clients[network.name] = client
+
+        return client
+
+
+def get_account_session(account_info: AccountInfo) -> AccountSession:
+    """
+    Get the session of the account, create it on the first call.
+
+    Args:
+        account_info (AccountInfo): the account.
+
+    Returns:
+        AccountSession: the session.
+
+    """
+    if not account_info.session:
+        account_info.session = AccountSession(account_info)
+
+    return account_info.session
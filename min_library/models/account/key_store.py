@@ -0,0 +1,174 @@
+"""
+Encrypted keystore (Web3 Secret Storage, scrypt/pbkdf2) support.
+
+Encrypt the plaintext keys of private_keys.txt into keystore files:
+    python -m min_library.models.account.key_store encrypt --kdf scrypt
+
+and clear private_keys.txt. Keystores are decrypted at startup with the password
+from the KEYSTORE_PASSWORD environment variable (or asked in the console).
+"""
+import argparse
+import getpass
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+from min_library.utils.helpers import read_txt
+from user_data.settings.settings import (
+    KEYSTORE_PASSWORD_ENV,
+    KEYSTORE_WORKERS,
+    KEYSTORES_FOLDER
+)
+
+
+_local_accounts: dict[str, LocalAccount] = {}
+
+
+def get_local_account(private_key: str) -> LocalAccount:
+    """
+    Get the account of the private key, derived only once per run.
+
+    Args:
+        private_key (str): the private key.
+
+    Returns:
+        LocalAccount: the account.
+
+    """
+    key = private_key.lower().removeprefix('0x')
+
+    if key not in _local_accounts:
+        _local_accounts[key] = Account.from_key(private_key)
+
+    return _local_accounts[key]
+
+
+def _decrypt(keystore_path: str, password: str) -> str:
+    with open(keystore_path, encoding='utf-8') as file:
+        keyfile = json.load(file)
+
+    return '0x' + bytes(Account.decrypt(keyfile, password)).hex()
+
+
+def get_keystore_paths(folder: str = KEYSTORES_FOLDER) -> list[str]:
+    if not os.path.isdir(folder):
+        return []
+
+    return sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name.endswith('.json') or name.startswith('UTC--')
+    )
+
+
+def decrypt_keystores(
+    paths: list[str],
+    password: str,
+    max_workers: int | None = KEYSTORE_WORKERS
+) -> list[str]:
+    """
+    Decrypt keystores in a process pool, the key derivation functions are CPU-bound.
+
+    Args:
+        paths (list[str]): the keystore files.
+        password (str): the password of all keystores.
+        max_workers (int | None): the number of processes. (all cores)
+
+    Returns:
+        list[str]: the private keys in the order of the paths.
+
+    """
+    if not paths:
+        return []
+
+    if len(paths) == 1:
+        private_keys = [_decrypt(paths[0], password)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            private_keys = list(executor.map(_decrypt, paths, [password] * len(paths)))
+
+    for private_key in private_keys:
+        get_local_account(private_key)
+
+    return private_keys
+
+
+def load_keystore_keys(folder: str = KEYSTORES_FOLDER) -> list[str]:
+    """
+    Decrypt all keystores of the folder with the password from the environment or the console.
+
+    Args:
+        folder (str): the keystores folder.
+
+    Returns:
+        list[str]: the private keys.
+
+    """
+    paths = get_keystore_paths(folder)
+    if not paths:
+        return []
+
+    password = os.environ.get(KEYSTORE_PASSWORD_ENV)
+    if password is None:
+        password = getpass.getpass(f'Password of {len(paths)} keystores: ')
+
+    return decrypt_keystores(paths, password)
+
+
+def _encrypt(private_key: str, password: str, kdf: str) -> dict:
+    return Account.encrypt(private_key, password, kdf=kdf)
+
+
+def encrypt_private_keys(
+    private_keys: list[str],
+    password: str,
+    folder: str = KEYSTORES_FOLDER,
+    kdf: str = 'scrypt',
+    max_workers: int | None = KEYSTORE_WORKERS
+) -> list[str]:
+    """
+    Encrypt private keys into keystore files named by the index and the address.
+
+    Returns:
+        list[str]: paths of the created files.
+
+    """
+    Path(folder).mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        keyfiles = list(executor.map(
+            _encrypt, private_keys, [password] * len(private_keys), [kdf] * len(private_keys)
+        ))
+
+    paths = []
+    for index, keyfile in enumerate(keyfiles, start=1):
+        # the index keeps the order of private_keys.txt, it matches account names
+        path = os.path.join(folder, f'{index:05d}_0x{keyfile["address"]}.json')
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(keyfile, file)
+        paths.append(path)
+
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Encrypt private keys into keystores')
+    parser.add_argument('command', choices=['encrypt'])
+    parser.add_argument('--keys', default='user_data/input_data/private_keys.txt')
+    parser.add_argument('--folder', default=KEYSTORES_FOLDER)
+    parser.add_argument('--kdf', choices=['scrypt', 'pbkdf2'], default='scrypt')
+    args = parser.parse_args()
+
+    private_keys = [key for key in read_txt(args.keys) if key]
+    password = os.environ.get(KEYSTORE_PASSWORD_ENV) or getpass.getpass('New password: ')
+
+    paths = encrypt_private_keys(private_keys, password, folder=args.folder, kdf=args.kdf)
+    print(f'{len(paths)} keystores are saved to {args.folder}')
+
+
+if __name__ == '__main__':
+    main()
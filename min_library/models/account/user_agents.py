@@ -0,0 +1,167 @@
+import atexit
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from min_library.models.logger.logger import console_logger
+from user_data.settings.settings import ACCOUNT_USER_AGENTS_FILE, USER_AGENTS_FILE
+
+
+class UserAgentPool:
+    """
+    User agents loaded once from a local snapshot with a stable user agent for every account.
+
+    The assignment is persisted to a JSON file, so every wallet keeps the same
+    user agent across runs even if the snapshot is updated.
+
+    Attributes:
+        snapshot_path (str): the JSON file with [{"useragent": ..., "percent": ...}].
+        assignments_path (str | None): the JSON file with {account_id: user_agent}.
+
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        assignments_path: str | None = None
+    ) -> None:
+        self.snapshot_path = snapshot_path
+        self.assignments_path = assignments_path
+
+        self._user_agents: list[str] | None = None
+        self._cumulative_weights: list[float] = []
+        self._assignments: dict[str, str] | None = None
+        self._is_changed = False
+        # the assignments made since take_changes
+        self._new_assignments: dict[str, str] = {}
+
+        atexit.register(self.save)
+
+    @property
+    def user_agents(self) -> list[str]:
+        if self._user_agents is None:
+            self._load_snapshot()
+
+        return self._user_agents
+
+    def get(self, account_id: int | str | None) -> str:
+        """
+        Get the user agent of the account, assign one if it has none.
+
+        Args:
+            account_id (int | str | None): the account id.
+
+        Returns:
+            str: the user agent.
+
+        """
+        if account_id is None:
+            return self._choose(os.urandom(8).hex())
+
+        assignments = self._get_assignments()
+        key = str(account_id)
+
+        if key not in assignments:
+            assignments[key] = self._new_assignments[key] = self._choose(key)
+            self._is_changed = True
+
+        return assignments[key]
+
+    def take_changes(self) -> dict[str, str]:
+        """
+        Get the assignments made since the last call.
+
+        Returns:
+            dict[str, str]: the user agents by account id.
+
+        """
+        changes, self._new_assignments = self._new_assignments, {}
+
+        return changes
+
+    def merge(self, changes: dict[str, str]) -> None:
+        """
+        Add the assignments of another process.
+
+        Args:
+            changes (dict[str, str]): the result of `take_changes` of the process.
+
+        """
+        self._get_assignments().update(changes)
+        self._is_changed = self._is_changed or bool(changes)
+
+    def save(self) -> None:
+        if not self._is_changed or not self.assignments_path:
+            return
+
+        Path(os.path.dirname(self.assignments_path) or '.').mkdir(parents=True, exist_ok=True)
+
+        temp_path = f'{self.assignments_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self._assignments, file, indent=2)
+        os.replace(temp_path, self.assignments_path)
+
+        self._is_changed = False
+
+    def _choose(self, key: str) -> str:
+        user_agents = self.user_agents
+
+        # a hash of the key instead of random, so the choice is the same on every run
+        # even when the assignments file is lost
+        digest = int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'big')
+        point = digest / 2 ** 64 * self._cumulative_weights[-1]
+
+        for user_agent, weight in zip(user_agents, self._cumulative_weights):
+            if point < weight:
+                return user_agent
+
+        return user_agents[-1]
+
+    def _get_assignments(self) -> dict[str, str]:
+        if self._assignments is not None:
+            return self._assignments
+
+        self._assignments = {}
+        if self.assignments_path and os.path.exists(self.assignments_path):
+            with open(self.assignments_path, encoding='utf-8') as file:
+                self._assignments = json.load(file)
+
+        return self._assignments
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as file:
+                rows = json.load(file)
+        except (OSError, ValueError) as e:
+            console_logger.warning(
+                f"Can not load user agents from {self.snapshot_path}: {e}, "
+                f"the dataset of fake_useragent is used"
+            )
+            rows = self._load_fake_useragent_rows()
+
+        self._user_agents = []
+        self._cumulative_weights = []
+        total = 0.0
+
+        for row in rows:
+            if isinstance(row, str):
+                row = {'useragent': row}
+
+            total += float(row.get('percent') or 1)
+            self._user_agents.append(row['useragent'])
+            self._cumulative_weights.append(total)
+
+    @staticmethod
+    def _load_fake_useragent_rows() -> list[dict]:
+        from fake_useragent import UserAgent
+
+        user_agent = UserAgent()
+
+        return [{'useragent': user_agent.random} for _ in range(50)]
+
+
+user_agent_pool = UserAgentPool(
+    snapshot_path=USER_AGENTS_FILE,
+    assignments_path=ACCOUNT_USER_AGENTS_FILE
+)
@@ -2,6 +2,8 @@ from min_library.models.contracts.raw_contract import RawContract
 
 
 class TokenBridgeInfo:
+    __slots__ = ('bridge_contract', 'pool_id')
+
     def __init__(
         self,
         bridge_contract: RawContract,
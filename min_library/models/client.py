@@ -4,6 +4,7 @@ from min_library.models.account.account_manager import AccountManager
 from min_library.models.contracts.contract import Contract
 from min_library.models.networks.network import Network
 from min_library.models.networks.networks import Networks
+from min_library.models.tracing.tracer import tracer
 from user_data.settings.settings import IS_CREATE_LOGS_FOR_EVERY_WALLET
 
 
@@ -36,4 +37,6 @@ class Client:
         self.account_manager.custom_logger.log_message(
             "INFO", f"Sleeping {sleep_time} secs {message}"
         )
-        await asyncio.sleep(sleep_time)
+
+        with tracer.span('step_delay', 'sleep', secs=sleep_time, message=message):
+            await asyncio.sleep(sleep_time)
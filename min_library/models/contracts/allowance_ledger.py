@@ -0,0 +1,196 @@
+import atexit
+import json
+import os
+from pathlib import Path
+
+from eth_utils import keccak
+
+from min_library.models.logger.logger import console_logger
+from user_data.settings.settings import ALLOWANCE_LEDGER_FILE, IS_ALLOWANCE_LEDGER
+
+
+APPROVAL_TOPIC = keccak(text='Approval(address,address,uint256)')
+
+# tokens don't decrease an allowance of max uint256 on transferFrom
+INFINITE_ALLOWANCE = 2 ** 255
+
+
+def _to_bytes(value: str | bytes) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value.removeprefix('0x'))
+
+    return bytes(value)
+
+
+class AllowanceLedger:
+    """
+    Known allowances by (chain id, owner, token, spender), kept across runs.
+
+    An allowance is recorded when it is read on chain and from Approval logs of
+    our receipts, and is decreased by the amounts we spend. A reverted
+    transaction to a spender drops the allowances of its sender for the spender,
+    so they are read on chain again. The ledger may only underestimate an
+    allowance unless it was changed outside of the bot.
+
+    Attributes:
+        path (str | None): the JSON file with the allowances.
+        is_enabled (bool): if False, the ledger is never consulted.
+
+    """
+
+    def __init__(self, path: str | None = None, is_enabled: bool = True) -> None:
+        self.path = path
+        self.is_enabled = is_enabled
+
+        self._allowances: dict[str, int] | None = None
+        self._is_changed = False
+        # the allowances changed since take_changes, None - dropped
+        self._changes: dict[str, int | None] = {}
+
+        atexit.register(self.save)
+
+    @staticmethod
+    def get_key(chain_id: int, owner: str, token: str, spender: str) -> str:
+        return f'{chain_id}:{owner.lower()}:{token.lower()}:{spender.lower()}'
+
+    def get(self, chain_id: int, owner: str, token: str, spender: str) -> int | None:
+        return self._get_allowances().get(self.get_key(chain_id, owner, token, spender))
+
+    def set(self, chain_id: int, owner: str, token: str, spender: str, amount: int) -> None:
+        key = self.get_key(chain_id, owner, token, spender)
+        self._get_allowances()[key] = amount
+        self._changes[key] = amount
+        self._is_changed = True
+
+    def spend(self, chain_id: int, owner: str, token: str, spender: str, amount: int) -> bool:
+        """
+        Take the amount from the known allowance if it is enough.
+
+        Args:
+            chain_id (int): the chain id.
+            owner (str): the token owner.
+            token (str): the token address.
+            spender (str): the spender address.
+            amount (int): the amount in Wei.
+
+        Returns:
+            bool: True if the known allowance was enough, False if it must be read on chain.
+
+        """
+        if not self.is_enabled:
+            return False
+
+        key = self.get_key(chain_id, owner, token, spender)
+        allowance = self._get_allowances().get(key)
+
+        if allowance is None or allowance < amount:
+            return False
+
+        if allowance < INFINITE_ALLOWANCE:
+            self._allowances[key] = self._changes[key] = allowance - amount
+            self._is_changed = True
+
+        return True
+
+    def observe(self, chain_id: int | None, tx_params: dict | None, receipt: dict | None) -> None:
+        """
+        Update the allowances from the receipt of our transaction.
+
+        Args:
+            chain_id (int | None): the chain id.
+            tx_params (dict | None): the transaction parameters.
+            receipt (dict | None): the receipt.
+
+        """
+        if not chain_id or not receipt:
+            return
+
+        if not receipt.get('status'):
+            if tx_params and tx_params.get('from') and tx_params.get('to'):
+                self._drop_spender(chain_id, tx_params['from'], tx_params['to'])
+            return
+
+        for log in receipt.get('logs') or []:
+            topics = log.get('topics') or []
+            if len(topics) != 3 or _to_bytes(topics[0]) != APPROVAL_TOPIC:
+                continue
+
+            data = _to_bytes(log.get('data') or b'')
+            self.set(
+                chain_id=chain_id,
+                owner='0x' + _to_bytes(topics[1])[12:].hex(),
+                token=log['address'],
+                spender='0x' + _to_bytes(topics[2])[12:].hex(),
+                amount=int.from_bytes(data[:32], 'big')
+            )
+
+    def take_changes(self) -> dict[str, int | None]:
+        """
+        Get the allowances changed since the last call.
+
+        Returns:
+            dict[str, int | None]: the allowances by key, None - the allowance is dropped.
+
+        """
+        changes, self._changes = self._changes, {}
+
+        return changes
+
+    def merge(self, changes: dict[str, int | None]) -> None:
+        """
+        Apply the changes of another process.
+
+        Args:
+            changes (dict[str, int | None]): the result of `take_changes` of the process.
+
+        """
+        allowances = self._get_allowances()
+
+        for key, amount in changes.items():
+            if amount is None:
+                allowances.pop(key, None)
+            else:
+                allowances[key] = amount
+
+        self._is_changed = self._is_changed or bool(changes)
+
+    def save(self) -> None:
+        if not self._is_changed or not self.path:
+            return
+
+        Path(os.path.dirname(self.path) or '.').mkdir(parents=True, exist_ok=True)
+
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            # allowances don't fit into the numbers of most JSON readers
+            json.dump({key: str(amount) for key, amount in self._allowances.items()}, file, indent=2)
+        os.replace(temp_path, self.path)
+
+        self._is_changed = False
+
+    def _drop_spender(self, chain_id: int, owner: str, spender: str) -> None:
+        prefix = f'{chain_id}:{owner.lower()}:'
+        suffix = f':{spender.lower()}'
+        allowances = self._get_allowances()
+
+        for key in [key for key in allowances if key.startswith(prefix) and key.endswith(suffix)]:
+            del allowances[key]
+            self._changes[key] = None
+            self._is_changed = True
+
+    def _get_allowances(self) -> dict[str, int]:
+        if self._allowances is not None:
+            return self._allowances
+
+        self._allowances = {}
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    self._allowances = {key: int(amount) for key, amount in json.load(file).items()}
+            except (OSError, ValueError) as e:
+                console_logger.warning(f'Can not load allowances from {self.path}: {e}')
+
+        return self._allowances
+
+
+allowance_ledger = AllowanceLedger(path=ALLOWANCE_LEDGER_FILE, is_enabled=IS_ALLOWANCE_LEDGER)
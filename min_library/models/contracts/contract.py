@@ -1,6 +1,4 @@
-import random
 from web3 import Web3
-from web3.eth import AsyncEth
 from web3.contract import Contract, AsyncContract
 from web3.types import (
     TxParams,
@@ -9,6 +7,7 @@ from web3.types import (
 from eth_typing import ChecksumAddress
 
 from min_library.models.account.account_manager import AccountManager
+from min_library.models.contracts.abi_encoder import encode_abi
 from min_library.models.contracts.raw_contract import TokenContract
 from min_library.models.networks.network import Network
 from min_library.models.others.dataclasses import CommonValues, DefaultAbis
@@ -16,13 +15,14 @@ from min_library.models.others.params_types import ParamsTypes
 from min_library.models.others.token_amount import TokenAmount
 from min_library.models.transactions.transaction import Transaction
 from min_library.models.transactions.tx_args import TxArgs
-from min_library.utils.helpers import make_request
+from min_library.utils.helpers import make_request, to_checksum_address
 
 
 class Contract:
     def __init__(self, account_manager: AccountManager):
         self.account_manager = account_manager
         self.transaction = Transaction(account_manager)
+        self._web3_by_network: dict[str, Web3] = {}
 
     @staticmethod
     async def get_signature(hex_signature: str) -> list | None:
@@ -64,7 +64,7 @@ class Contract:
         else:
             address, abi = contract.address, contract.abi
 
-        return Web3.to_checksum_address(address), abi
+        return to_checksum_address(address), abi
 
     async def approve(
         self,
@@ -102,7 +102,7 @@ class Contract:
 
         decimals = await self.get_decimals(token_contract=token_contract)
         token_contract = await self.get_token_contract(token=token_contract)
-        spender_address = Web3.to_checksum_address(spender_address)
+        spender_address = to_checksum_address(spender_address)
 
         if not amount:
             if is_approve_infinity:
@@ -117,7 +117,8 @@ class Contract:
         else:
             token_amount = amount.Wei
 
-        data = token_contract.encodeABI(
+        data = encode_abi(
+            token_contract,
             'approve',
             args=TxArgs(
                 spender=spender_address,
@@ -190,10 +191,10 @@ class Contract:
 
         """
         if type(token) in ParamsTypes.Address.__args__:
-            address = Web3.to_checksum_address(token)
+            address = to_checksum_address(token)
             abi = DefaultAbis.Token
         else:
-            address = Web3.to_checksum_address(token.address)
+            address = to_checksum_address(token.address)
 
             if token.abi:
                 abi = token.abi
@@ -228,7 +229,7 @@ class Contract:
 
         amount = await token_contract.functions.allowance(
             owner,
-            Web3.to_checksum_address(spender_address),
+            to_checksum_address(spender_address),
         ).call()
 
         return TokenAmount(amount, decimals, wei=True)
@@ -336,17 +337,18 @@ class Contract:
 
         if token_contract.is_native_token:
             new_tx_params = TxParams(
-                to=Web3.to_checksum_address(recipient_address),
+                to=to_checksum_address(recipient_address),
                 value=token_amount.Wei
             )
 
         else:
             new_tx_params = TxParams(
                 to=contract.address,
-                data=contract.encodeABI(
+                data=encode_abi(
+                    contract,
                     fn_name='transfer',
                     args=[
-                        Web3.to_checksum_address(recipient_address),
+                        to_checksum_address(recipient_address),
                         token_amount.Wei
                     ]
                 ),
@@ -423,18 +425,15 @@ class Contract:
         tx_params['gas'] = gas_limit.Wei
         return tx_params
 
-    def get_web3_with_network(self, network: Network) -> Web3:        
-        return Web3(
-            Web3.AsyncHTTPProvider(
-                endpoint_uri=random.choice(network.rpc),
-                request_kwargs={
-                    'proxy': self.account_manager.proxy,
-                    'headers': self.account_manager.headers
-                }
-            ),
-            modules={'eth': (AsyncEth,)},
-            middlewares=[]
-        )
+    def get_web3_with_network(self, network: Network) -> Web3:
+        if network.name not in self._web3_by_network:
+            self._web3_by_network[network.name] = AccountManager.create_web3(
+                network,
+                proxy=self.account_manager.proxy,
+                headers=self.account_manager.headers
+            )
+
+        return self._web3_by_network[network.name]
 
     def get_custom_settings_for_tx_params(
         self,
@@ -1,3 +1,4 @@
+from min_library.models.networks.network import Network
 from min_library.models.networks.networks import Networks
 from min_library.models.others.constants import TokenSymbol
 from min_library.models.others.common import Singleton
@@ -10,31 +11,50 @@ from min_library.utils.helpers import read_json
 
 
 class ContractsFactory:
-    @staticmethod
-    def get_contract(network_name: str, token_symbol: str):
-        match(network_name):
-            case Networks.Ethereum.name:
-                return EthereumTokenContracts.get_token(token_symbol)
-            case Networks.Arbitrum.name:
-                return ArbitrumTokenContracts.get_token(token_symbol)
-            case Networks.Avalanche.name:
-                return AvalancheTokenContracts.get_token(token_symbol)
-            case Networks.BSC.name:
-                return BscTokenContracts.get_token(token_symbol)
-            case Networks.Core.name:
-                return CoreTokenContracts.get_token(token_symbol)
-            case Networks.Fantom.name:
-                return FantomTokenContracts.get_token(token_symbol)
-            # case Networks.Kava.name:
-            #     return KavaTokenContracts.get_token(token_symbol)
-            case Networks.Optimism.name:
-                return OptimismTokenContracts.get_token(token_symbol)
-            case Networks.Polygon.name:
-                return PolygonTokenContracts.get_token(token_symbol)
-            # case Networks.ZkSync.name:
-            #     return ZkSyncTokenContracts.get_token(token_symbol)
-            case _:
-                raise ValueError("Network not supported")
+    """
+    Token contracts of all networks indexed once by (network name | chain id, symbol) and by address.
+
+    The index is filled by the TokenContractData subclasses when they are created.
+
+    """
+    _contracts_by_network: dict[str | int, type['TokenContractData']] = {}
+    _tokens_by_address: dict[tuple[int, str], TokenContract] = {}
+
+    @classmethod
+    def register(cls, contracts: type['TokenContractData']) -> None:
+        network = contracts.network
+
+        cls._contracts_by_network[network.name] = contracts
+        cls._contracts_by_network[network.chain_id] = contracts
+
+        for token in contracts.tokens.values():
+            cls._tokens_by_address.setdefault(
+                (network.chain_id, token.address.lower()), token
+            )
+
+    @classmethod
+    def get_contract(cls, network_name: str | int, token_symbol: str) -> TokenContract:
+        """
+        Get the token contract of the network.
+
+        Args:
+            network_name (str | int): the network name or chain id.
+            token_symbol (str): the token symbol (like USDC or USDC_E).
+
+        Returns:
+            TokenContract: the token contract.
+
+        """
+        contracts = cls._contracts_by_network.get(network_name)
+
+        if not contracts:
+            raise ValueError("Network not supported")
+
+        return contracts.get_token(token_symbol)
+
+    @classmethod
+    def get_contract_by_address(cls, chain_id: int, address: str) -> TokenContract | None:
+        return cls._tokens_by_address.get((chain_id, address.lower()))
 
 
 class TokenContractData(metaclass=Singleton):
@@ -42,6 +62,22 @@ class TokenContractData(metaclass=Singleton):
 
     ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
 
+    network: Network | None = None
+    tokens: dict[str, TokenContract] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        cls.tokens = {
+            name: value
+            for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, TokenContract)
+        }
+
+        if cls.network:
+            ContractsFactory.register(cls)
+
     @classmethod
     def get_token(
         cls,
@@ -54,19 +90,25 @@ class TokenContractData(metaclass=Singleton):
             else f'{token_symbol.upper()}'
         )
 
-        if not hasattr(cls, contract_name):
+        token = cls.tokens.get(contract_name)
+
+        if not token:
             raise exceptions.ContractNotExists(
                 f"The contract has not been added "
                 f"to {cls.__class__.__name__} contracts"
             )
 
-        return getattr(cls, contract_name)
+        return token
 
 
 class EthereumTokenContracts(TokenContractData):
+    network = Networks.Ethereum
+
     ETH = TokenContractData.NATIVE_ETH
 
 class ArbitrumTokenContracts(TokenContractData):
+    network = Networks.Arbitrum
+
     ETH = TokenContractData.NATIVE_ETH
 
     ARB = TokenContract(
@@ -125,6 +167,8 @@ class ArbitrumTokenContracts(TokenContractData):
 
 
 class AvalancheTokenContracts(TokenContractData):
+    network = Networks.Avalanche
+
     AVAX = NativeTokenContract(title=TokenSymbol.AVAX)
 
     ETH = TokenContract(
@@ -163,6 +207,8 @@ class AvalancheTokenContracts(TokenContractData):
 
 
 class BscTokenContracts(TokenContractData):
+    network = Networks.BSC
+
     BNB = NativeTokenContract(title=TokenSymbol.BNB)
 
     USDT = TokenContract(
@@ -196,6 +242,8 @@ class BscTokenContracts(TokenContractData):
     )
 
 class CoreTokenContracts(TokenContractData):
+    network = Networks.Core
+
     CORE = NativeTokenContract(title=TokenSymbol.CORE)
     
     USDT = TokenContract(
@@ -217,6 +265,8 @@ class CoreTokenContracts(TokenContractData):
     )
 
 class FantomTokenContracts(TokenContractData):
+    network = Networks.Fantom
+
     USDC = TokenContract(
         title=TokenSymbol.USDC,
         address='0x04068DA6C83AFCFA0e13ba15A6696662335D5B75',
@@ -238,6 +288,8 @@ class FantomTokenContracts(TokenContractData):
 
 
 class OptimismTokenContracts(TokenContractData):
+    network = Networks.Optimism
+
     ETH = TokenContractData.NATIVE_ETH
 
     USDC = TokenContract(
@@ -278,6 +330,8 @@ class OptimismTokenContracts(TokenContractData):
 
 
 class PolygonTokenContracts(TokenContractData):
+    network = Networks.Polygon
+
     MATIC = NativeTokenContract(title=TokenSymbol.MATIC)
 
     USDC = TokenContract(
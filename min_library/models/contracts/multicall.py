@@ -0,0 +1,66 @@
+from web3 import AsyncWeb3
+from eth_typing import HexStr
+
+from min_library.models.contracts.raw_contract import RawContract
+
+
+MULTICALL3 = RawContract(
+    title='Multicall3',
+    address='0xcA11bde05977b3631167028862bE2a173976CA11',
+    abi=[
+        {
+            'inputs': [
+                {'internalType': 'bool', 'name': 'requireSuccess', 'type': 'bool'},
+                {
+                    'components': [
+                        {'internalType': 'address', 'name': 'target', 'type': 'address'},
+                        {'internalType': 'bytes', 'name': 'callData', 'type': 'bytes'}
+                    ],
+                    'internalType': 'struct Multicall3.Call[]',
+                    'name': 'calls',
+                    'type': 'tuple[]'
+                }
+            ],
+            'name': 'tryBlockAndAggregate',
+            'outputs': [
+                {'internalType': 'uint256', 'name': 'blockNumber', 'type': 'uint256'},
+                {'internalType': 'bytes32', 'name': 'blockHash', 'type': 'bytes32'},
+                {
+                    'components': [
+                        {'internalType': 'bool', 'name': 'success', 'type': 'bool'},
+                        {'internalType': 'bytes', 'name': 'returnData', 'type': 'bytes'}
+                    ],
+                    'internalType': 'struct Multicall3.Result[]',
+                    'name': 'returnData',
+                    'type': 'tuple[]'
+                }
+            ],
+            'stateMutability': 'payable',
+            'type': 'function'
+        }
+    ]
+)
+
+
+async def try_block_and_aggregate(
+    w3: AsyncWeb3,
+    calls: list[tuple[str, HexStr | bytes]]
+) -> tuple[int, list[tuple[bool, bytes]]]:
+    """
+    Execute read calls in one eth_call through Multicall3 (deployed at the same address in most networks).
+
+    Args:
+        w3 (AsyncWeb3): the web3 of the network.
+        calls (list[tuple[str, HexStr | bytes]]): (target address, calldata) pairs.
+
+    Returns:
+        tuple[int, list[tuple[bool, bytes]]]: the block number and (success, return data) of every call.
+
+    """
+    contract = w3.eth.contract(address=MULTICALL3.address, abi=MULTICALL3.abi)
+
+    block_number, _, results = await contract.functions.tryBlockAndAggregate(
+        False, calls
+    ).call()
+
+    return block_number, [(success, return_data) for success, return_data in results]
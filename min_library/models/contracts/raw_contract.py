@@ -1,14 +1,12 @@
 import json
 
-from web3 import (
-    Web3,
-    types
-)
+from web3 import types
 from typing import Any
 from eth_typing import ChecksumAddress
 
 from min_library.models.others.common import AutoRepr
 from min_library.models.others.dataclasses import DefaultAbis
+from min_library.utils.helpers import to_checksum_address
 
 
 class RawContract(AutoRepr):
@@ -42,7 +40,7 @@ class RawContract(AutoRepr):
             is_native_token (bool): is this contract native token of network (False)
         """
         self.title = title
-        self.address = Web3.to_checksum_address(address)
+        self.address = to_checksum_address(address)
         self.abi = json.loads(abi) if isinstance(abi, str) else abi
 
 
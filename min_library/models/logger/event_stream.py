@@ -0,0 +1,55 @@
+import atexit
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+class EventStream:
+    """
+    A buffered writer of machine-readable events in JSONL format.
+
+    Events are kept in memory and appended to the file when the buffer is
+    full, on `flush()` or at interpreter exit.
+
+    Attributes:
+        path (str): the path of the JSONL file.
+        buffer_size (int): how many events to keep before writing them.
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = 100
+    ) -> None:
+        self.path = path
+        self.buffer_size = max(buffer_size, 1)
+        self._buffer: list[str] = []
+
+        atexit.register(self.flush)
+
+    def write(self, event: dict[str, Any]) -> None:
+        """
+        Add the event to the buffer.
+
+        Args:
+            event (dict[str, Any]): the event, values must be JSON-serializable
+                or convertible to str.
+
+        """
+        self._buffer.append(json.dumps(event, default=str))
+
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+
+        Path(os.path.dirname(self.path) or '.').mkdir(parents=True, exist_ok=True)
+
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('\n'.join(self._buffer) + '\n')
+
+        self._buffer.clear()
@@ -0,0 +1,107 @@
+import gzip
+import logging
+import os
+import shutil
+from collections import OrderedDict
+from logging.handlers import RotatingFileHandler
+
+
+class AccountLogHandlerPool:
+    """
+    An LRU pool of open per-account log file handlers.
+
+    Only `max_open_files` handlers are kept open at the same time, the least
+    recently used one is closed when a new account needs a file. A closed
+    handler is reopened in append mode on the next message of its account.
+
+    Attributes:
+        folder_name (str): the folder for account log files.
+        max_open_files (int): the maximum number of simultaneously open files.
+        max_bytes (int): the size of a log file to rotate it (0 - no rotation).
+        backup_count (int): the number of rotated files to keep.
+        compress (bool): whether to gzip rotated files.
+
+    """
+
+    def __init__(
+        self,
+        folder_name: str,
+        max_open_files: int = 64,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        compress: bool = True
+    ) -> None:
+        self.folder_name = folder_name
+        self.max_open_files = max(max_open_files, 1)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self._handlers: OrderedDict[str, logging.Handler] = OrderedDict()
+
+    def get_handler(
+        self,
+        account_id: str | int,
+        formatter: logging.Formatter
+    ) -> logging.Handler:
+        """
+        Get an open file handler of the account, opening it if needed.
+
+        Args:
+            account_id (str | int): the account ID.
+            formatter (logging.Formatter): the formatter for a new handler.
+
+        Returns:
+            logging.Handler: the file handler of the account.
+
+        """
+        key = str(account_id)
+
+        if key in self._handlers:
+            self._handlers.move_to_end(key)
+            return self._handlers[key]
+
+        while len(self._handlers) >= self.max_open_files:
+            _, evicted_handler = self._handlers.popitem(last=False)
+            evicted_handler.close()
+
+        handler = self._create_handler(key)
+        handler.setLevel(logging.INFO)
+        handler.setFormatter(formatter)
+        self._handlers[key] = handler
+
+        return handler
+
+    def close_all(self) -> None:
+        while self._handlers:
+            _, handler = self._handlers.popitem(last=False)
+            handler.close()
+
+    @property
+    def open_files(self) -> int:
+        return len(self._handlers)
+
+    def _create_handler(self, key: str) -> logging.Handler:
+        handler = RotatingFileHandler(
+            filename=os.path.join(self.folder_name, f'log_{key}.log'),
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding='utf-8',
+            delay=True
+        )
+
+        if self.compress and self.max_bytes:
+            handler.namer = self._gzip_namer
+            handler.rotator = self._gzip_rotator
+
+        return handler
+
+    @staticmethod
+    def _gzip_namer(name: str) -> str:
+        return f'{name}.gz'
+
+    @staticmethod
+    def _gzip_rotator(source: str, dest: str) -> None:
+        with open(source, 'rb') as source_file, gzip.open(dest, 'wb') as dest_file:
+            shutil.copyfileobj(source_file, dest_file)
+
+        os.remove(source)
@@ -2,14 +2,41 @@ import inspect
 import logging
 import os
 import sys
+import time
 from pathlib import Path
+from typing import Any
 
+from min_library.models.logger.event_stream import EventStream
+from min_library.models.logger.handler_pool import AccountLogHandlerPool
 from min_library.models.others.constants import LogStatus
+from user_data.settings.settings import (
+    ACCOUNT_LOG_BACKUP_COUNT,
+    ACCOUNT_LOG_MAX_BYTES,
+    EVENTS_BUFFER_SIZE,
+    EVENTS_FILE,
+    IS_COMPRESS_ACCOUNT_LOGS,
+    IS_WRITE_EVENTS,
+    MAX_OPEN_ACCOUNT_LOG_FILES
+)
 
 
 class CustomLogger:
     FOLDER_NAME: str = 'user_data/logs'
+    # None - the main log is written to the console only
+    MAIN_LOG_FILE: str | None = 'main.log'
     LOGGERS: dict[str, logging.Logger] = {}
+    ACCOUNT_HANDLERS = AccountLogHandlerPool(
+        folder_name=FOLDER_NAME,
+        max_open_files=MAX_OPEN_ACCOUNT_LOG_FILES,
+        max_bytes=ACCOUNT_LOG_MAX_BYTES,
+        backup_count=ACCOUNT_LOG_BACKUP_COUNT,
+        compress=IS_COMPRESS_ACCOUNT_LOGS
+    )
+    EVENTS: EventStream | None = (
+        EventStream(path=EVENTS_FILE, buffer_size=EVENTS_BUFFER_SIZE)
+        if IS_WRITE_EVENTS
+        else None
+    )
 
     def __init__(
         self,
@@ -21,6 +48,7 @@ class CustomLogger:
         self.account_id = account_id
         self.masked_address = address[:6] + "..." + address[-4:]
         self.network = network
+        self.module_name: str | None = None
         self.create_log_file_per_account = create_log_file_per_account
         if create_log_file_per_account:
             self._create_log_folder()
@@ -42,10 +70,11 @@ class CustomLogger:
             console_handler.setFormatter(MainConsoleLogFormatter())
             main_logger.addHandler(console_handler)
 
-            file_handler = logging.FileHandler(f"{name_of_file}.log")
-            file_handler.setLevel(logging.INFO)
-            file_handler.setFormatter(MainFileLogFormatter())
-            main_logger.addHandler(file_handler)
+            if self.MAIN_LOG_FILE:
+                file_handler = logging.FileHandler(self.MAIN_LOG_FILE, delay=True)
+                file_handler.setLevel(logging.INFO)
+                file_handler.setFormatter(MainFileLogFormatter())
+                main_logger.addHandler(file_handler)
 
             logging.addLevelName(403, LogStatus.FAILED)
             logging.addLevelName(204, LogStatus.SUCCESS)
@@ -59,19 +88,17 @@ class CustomLogger:
 
         return self.LOGGERS["main_logger"]
 
-    def _initialize_account_log(self, account_id: str) -> logging.Logger:
-        if account_id not in self.LOGGERS:
-            name_of_file = f'{self.FOLDER_NAME}/log_{account_id}'
+    def _initialize_account_log(self, account_id: str) -> logging.Handler:
+        if 'account_logger' not in self.LOGGERS:
+            account_logger = logging.getLogger(f'{self.FOLDER_NAME}/accounts')
+            account_logger.propagate = False
 
-            wallet_logger = logging.getLogger(name_of_file)
-            file_handler = logging.FileHandler(f"{name_of_file}.log")
-            file_handler.setLevel(logging.INFO)
-            file_handler.setFormatter(AccountFileLogFormatter())
-            wallet_logger.addHandler(file_handler)
+            self.LOGGERS['account_logger'] = account_logger
 
-            self.LOGGERS[account_id] = wallet_logger
-
-        return self.LOGGERS[account_id]
+        return self.ACCOUNT_HANDLERS.get_handler(
+            account_id=account_id,
+            formatter=AccountFileLogFormatter()
+        )
 
     def log_message(self, status: str, message: str) -> None:
         caller_frame = inspect.currentframe().f_back
@@ -92,12 +119,77 @@ class CustomLogger:
         )
 
         if self.create_log_file_per_account:
-            logger = self._initialize_account_log(self.account_id)
-            logger.log(
+            handler = self._initialize_account_log(self.account_id)
+            record = self.LOGGERS['account_logger'].makeRecord(
+                name=self.LOGGERS['account_logger'].name,
                 level=logging.getLevelName(status),
+                fn=caller_frame.f_code.co_filename,
+                lno=caller_frame.f_lineno,
                 msg=message_with_calling_line,
+                args=(),
+                exc_info=None,
                 extra=extra
             )
+            handler.handle(record)
+
+        if status == LogStatus.ERROR:
+            self.log_event(status=LogStatus.FAILED, message=message)
+
+    def log_event(
+        self,
+        status: str,
+        tx_hash: str | None = None,
+        gas_used: int | None = None,
+        gas_price: int | None = None,
+        from_token: str | None = None,
+        amount_from: Any = None,
+        to_token: str | None = None,
+        amount_to: Any = None,
+        to_network: str | None = None,
+        duration: float | None = None,
+        message: str | None = None
+    ) -> None:
+        """
+        Write a machine-readable event about the outcome of an operation.
+
+        Args:
+            status (str): the outcome (LogStatus.APPROVED, BRIDGED, SWAPPED, FAILED, ...).
+            tx_hash (str | None): the hash of the transaction. (None)
+            gas_used (int | None): the gas used by the transaction. (None)
+            gas_price (int | None): the effective gas price in Wei. (None)
+            from_token (str | None): the symbol of the source token. (None)
+            amount_from (Any): the amount of the source token. (None)
+            to_token (str | None): the symbol of the destination token. (None)
+            amount_to (Any): the (minimal) amount of the destination token. (None)
+            to_network (str | None): the destination network name. (None)
+            duration (float | None): the duration of the operation in seconds. (None)
+            message (str | None): the error or info message. (None)
+
+        """
+        if not self.EVENTS:
+            return
+
+        event = {
+            'ts': round(time.time(), 3),
+            'account_id': self.account_id,
+            'address': self.masked_address,
+            'network': self.network.lower(),
+            'module': self.module_name,
+            'status': status,
+            'tx_hash': tx_hash,
+            'gas_used': gas_used,
+            'gas_price': gas_price,
+            'from_token': from_token,
+            'amount_from': amount_from,
+            'to_token': to_token,
+            'amount_to': amount_to,
+            'to_network': to_network,
+            'duration': round(duration, 3) if duration is not None else None,
+            'message': message
+        }
+        self.EVENTS.write(
+            {key: value for key, value in event.items() if value is not None}
+        )
 
 
 class CustomLogData(logging.Formatter):
@@ -233,7 +325,7 @@ class ConsoleLoggerSingleton:
             console_handler.setFormatter(CommonConsoleLogFormatter())
             logger.addHandler(console_handler)
 
-            console_handler = logging.FileHandler("main.log")
+            console_handler = logging.FileHandler("main.log", delay=True)
             console_handler.setFormatter(CommonConsoleFileLogFormatter())
             logger.addHandler(console_handler)
             ConsoleLoggerSingleton._instance = logger
@@ -0,0 +1,365 @@
+import asyncio
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+from aiohttp import web
+from hexbytes import HexBytes
+
+from min_library.models.logger.logger import console_logger
+from min_library.models.rpc.rpc_stats import rpc_stats
+
+
+class Metric:
+    """
+    A metric with label values in the Prometheus text format.
+
+    Attributes:
+        name (str): the metric name.
+        description (str): the HELP text.
+        label_names (tuple[str, ...]): the label names.
+        values (dict[tuple[str, ...], float]): the values by label values.
+
+    """
+    metric_type = 'untyped'
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(label, '')) for label in self.label_names)
+
+    def get(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f'# HELP {self.name} {self.description}',
+            f'# TYPE {self.name} {self.metric_type}'
+        ]
+
+        if not self.label_names and not self.values:
+            lines.append(f'{self.name} 0')
+
+        for key, value in sorted(self.values.items()):
+            if self.label_names:
+                labels = ','.join(
+                    f'{label}="{_escape(label_value)}"'
+                    for label, label_value in zip(self.label_names, key)
+                )
+                lines.append(f'{self.name}{{{labels}}} {_format(value)}')
+            else:
+                lines.append(f'{self.name} {_format(value)}')
+
+        return lines
+
+
+class Counter(Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class MetricsRegistry:
+    """
+    Metrics of the run and collectors that refresh derived metrics before rendering.
+    """
+
+    def __init__(self, prefix: str = 'min_library') -> None:
+        self.prefix = prefix
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(f'{self.prefix}_{name}', description, label_names))
+
+    def gauge(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(f'{self.prefix}_{name}', description, label_names))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: the metrics.
+
+        """
+        for collector in self.collectors:
+            collector()
+
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> dict[str, dict[tuple[str, ...], float]]:
+        """
+        Get the values of all metrics, for example, to send them to another process.
+
+        Returns:
+            dict[str, dict[tuple[str, ...], float]]: the values by label values by metric name.
+
+        """
+        for collector in self.collectors:
+            collector()
+
+        return {name: dict(metric.values) for name, metric in self.metrics.items()}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name not in self.metrics:
+            self.metrics[metric.name] = metric
+
+        return self.metrics[metric.name]
+
+
+class MetricsExporter:
+    """
+    Publish metrics to a text file (for node_exporter's textfile collector) and/or via HTTP.
+
+    Attributes:
+        registry (MetricsRegistry): the metrics.
+        file_path (str | None): the file to rewrite every `interval` secs.
+        port (int | None): the port of the HTTP endpoint /metrics.
+        interval (float): how often the file is rewritten in secs.
+
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        file_path: str | None = None,
+        port: int | None = None,
+        host: str = '0.0.0.0',
+        interval: float = 15
+    ) -> None:
+        self.registry = registry
+        self.file_path = file_path
+        self.port = port
+        self.host = host
+        self.interval = interval
+
+        self._task: asyncio.Task | None = None
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        if self.port:
+            app = web.Application()
+            app.router.add_get('/metrics', self._handle_metrics)
+
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, self.host, self.port).start()
+
+            console_logger.info(f'Metrics are available on http://{self.host}:{self.port}/metrics')
+
+        if self.file_path:
+            self._task = asyncio.create_task(self._write_periodically())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        if self.file_path:
+            self.write_file()
+
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def write_file(self) -> None:
+        Path(os.path.dirname(self.file_path) or '.').mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so that scrapers never read a half-written file
+        temp_path = f'{self.file_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(self.registry.render())
+        os.replace(temp_path, self.file_path)
+
+    async def _write_periodically(self) -> None:
+        while True:
+            try:
+                self.write_file()
+            except OSError as e:
+                console_logger.error(f'Can not write metrics: {e}')
+
+            await asyncio.sleep(self.interval)
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.registry.render(),
+            content_type='text/plain',
+            charset='utf-8'
+        )
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value: float) -> str:
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+
+    return str(int(value))
+
+
+metrics = MetricsRegistry()
+
+ACTIVE_ACCOUNTS = metrics.gauge(
+    'active_accounts', 'Accounts being processed right now'
+)
+ACCOUNTS_QUEUED = metrics.gauge(
+    'accounts_queued', 'Accounts waiting in the scheduler queue'
+)
+MODULE_RUNS = metrics.counter(
+    'module_runs_total', 'Finished module runs', ('module', 'result')
+)
+TXS_SENT = metrics.counter(
+    'txs_sent_total', 'Sent transactions', ('network',)
+)
+TXS_IN_FLIGHT = metrics.gauge(
+    'txs_in_flight', 'Sent transactions waiting for a receipt', ('network',)
+)
+TX_CONFIRMATIONS = metrics.counter(
+    'tx_confirmations_total', 'Received transaction receipts', ('network', 'status')
+)
+CONFIRMATIONS_PER_MINUTE = metrics.gauge(
+    'confirmations_per_minute', 'Receipts received during the last 60 secs'
+)
+GAS_SPENT = metrics.counter(
+    'gas_spent_total', 'Gas fees spent in the native coin of the network', ('network',)
+)
+RPC_REQUESTS = metrics.counter(
+    'rpc_requests_total', 'JSON-RPC requests', ('network', 'method')
+)
+RPC_ERRORS = metrics.counter(
+    'rpc_errors_total', 'Failed JSON-RPC requests', ('network', 'method', 'error')
+)
+RPC_THROTTLED = metrics.counter(
+    'rpc_throttled_total', 'JSON-RPC requests that waited for a rate limiter', ('limiter',)
+)
+RPC_THROTTLED_SECONDS = metrics.counter(
+    'rpc_throttled_seconds_total', 'Time JSON-RPC requests waited for rate limiters', ('limiter',)
+)
+
+# a sent transaction nobody waits a receipt for stops being in flight after this time (secs)
+TX_IN_FLIGHT_TTL = 600
+
+_confirmation_times: deque[float] = deque()
+# network -> hash of a sent transaction -> send time
+_txs_in_flight: dict[str, dict[HexBytes, float]] = {}
+
+
+def observe_tx_sent(network: str, tx_hash: str | bytes) -> None:
+    TXS_SENT.inc(network=network)
+
+    txs = _txs_in_flight.setdefault(network, {})
+    txs[HexBytes(tx_hash)] = time.monotonic()
+    TXS_IN_FLIGHT.set(len(txs), network=network)
+
+
+def observe_tx_receipt(
+    network: str,
+    tx_hash: str | bytes | None,
+    receipt: dict | None,
+    decimals: int = 18
+) -> None:
+    """
+    Count a finished wait for a transaction receipt.
+
+    Args:
+        network (str): the network name.
+        tx_hash (str | bytes | None): the transaction hash.
+        receipt (dict | None): the receipt, None if it wasn't received.
+        decimals (int): the decimals of the native coin. (18)
+
+    """
+    # a second wait for the same transaction or a wait for a transaction that
+    # was not sent by this process does not change the in-flight ones
+    txs = _txs_in_flight.get(network)
+    if txs is not None and tx_hash:
+        txs.pop(HexBytes(tx_hash), None)
+        TXS_IN_FLIGHT.set(len(txs), network=network)
+
+    if not receipt:
+        TX_CONFIRMATIONS.inc(network=network, status='timeout')
+        return
+
+    TX_CONFIRMATIONS.inc(
+        network=network, status='success' if receipt.get('status') else 'reverted'
+    )
+    _confirmation_times.append(time.monotonic())
+
+    gas_price = receipt.get('effectiveGasPrice') or 0
+    GAS_SPENT.inc(
+        int(receipt.get('gasUsed') or 0) * int(gas_price) / 10 ** decimals,
+        network=network
+    )
+
+
+def _collect_confirmations_per_minute() -> None:
+    window_start = time.monotonic() - 60
+    while _confirmation_times and _confirmation_times[0] < window_start:
+        _confirmation_times.popleft()
+
+    CONFIRMATIONS_PER_MINUTE.set(len(_confirmation_times))
+
+
+def _collect_txs_in_flight() -> None:
+    sent_after = time.monotonic() - TX_IN_FLIGHT_TTL
+    for network, txs in _txs_in_flight.items():
+        for tx_hash in [tx_hash for tx_hash, sent_at in txs.items() if sent_at < sent_after]:
+            del txs[tx_hash]
+
+        TXS_IN_FLIGHT.set(len(txs), network=network)
+
+
+def _collect_rpc_stats() -> None:
+    requests: dict[tuple[str, str], int] = {}
+    errors: dict[tuple[str, str, str], int] = {}
+
+    # the same method may be called on several endpoints of one network
+    for (network, _, method), stats in rpc_stats.methods.items():
+        requests[(network, method)] = requests.get((network, method), 0) + stats.count
+        for error, count in stats.errors.items():
+            key = (network, method, error)
+            errors[key] = errors.get(key, 0) + count
+
+    RPC_REQUESTS.values = requests
+    RPC_ERRORS.values = errors
+
+
+metrics.add_collector(_collect_confirmations_per_minute)
+metrics.add_collector(_collect_txs_in_flight)
+metrics.add_collector(_collect_rpc_stats)
@@ -0,0 +1,430 @@
+import random
+import time
+from collections import Counter
+from typing import Any, Callable
+
+import rlp
+from eth_abi import abi
+from eth_account import Account
+from eth_utils import (
+    function_signature_to_4byte_selector,
+    keccak,
+    to_checksum_address,
+    to_hex
+)
+
+CallHandler = Callable[[bytes], bytes]
+
+
+def selector(signature: str) -> bytes:
+    return function_signature_to_4byte_selector(signature)
+
+
+class JsonRpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class MockChain:
+    """
+    An in-memory EVM chain state that answers JSON-RPC methods.
+
+    Blocks are produced every `block_time` seconds (0 - a new block on every
+    request), a sent transaction gets a receipt in the next block. `eth_call`
+    is answered from `call_handlers` by 4-byte selector, so router quote
+    functions can return canned values.
+
+    Attributes:
+        chain_id (int): the chain ID.
+        block_time (float): seconds between blocks.
+        gas_price (int): the gas price in Wei.
+        default_balance (int): the native and token balance of every address in Wei.
+        error_rate (float): the probability (0..1) to answer with a JSON-RPC error.
+        pair_reserves (tuple[int, int]): reserves of every Uniswap V2 pair.
+        pool_tick (int): the tick of every Uniswap V3 pool, the price is in the middle of it.
+        pool_liquidity (int): the liquidity of every Uniswap V3 pool.
+        calls (Counter): how many times every method was called.
+
+    """
+    APPROVAL_TOPIC = '0x' + keccak(text='Approval(address,address,uint256)').hex()
+    APPROVE_SELECTOR = selector('approve(address,uint256)')
+
+    def __init__(
+        self,
+        chain_id: int = 1,
+        block_time: float = 0,
+        gas_price: int = 10 ** 9,
+        max_priority_fee: int = 10 ** 8,
+        default_balance: int = 10 ** 24,
+        gas_estimate: int = 150_000,
+        gas_used_ratio: float = 0.8,
+        error_rate: float = 0,
+        error_code: int = -32005,
+        error_message: str = 'mock error',
+        pair_reserves: tuple[int, int] = (2 * 10 ** 24, 3 * 10 ** 24),
+        pool_tick: int = 5,
+        pool_liquidity: int = 10 ** 30,
+        seed: int | None = None
+    ) -> None:
+        self.chain_id = chain_id
+        self.block_time = block_time
+        self.gas_price = gas_price
+        self.max_priority_fee = max_priority_fee
+        self.default_balance = default_balance
+        self.gas_estimate = gas_estimate
+        self.gas_used_ratio = gas_used_ratio
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.error_message = error_message
+        self.pair_reserves = pair_reserves
+        self.pool_tick = pool_tick
+        self.pool_liquidity = pool_liquidity
+
+        self.calls: Counter = Counter()
+        self.nonces: Counter = Counter()
+        self.balances: dict[str, int] = {}
+        self.call_handlers: dict[bytes, CallHandler] = {}
+        self.receipts: dict[str, dict[str, Any]] = {}
+        self.transactions: dict[str, dict[str, Any]] = {}
+
+        self._random = random.Random(seed)
+        self._start_time = time.monotonic()
+        self._block_number = 1_000_000
+        self._pending: list[tuple[int, str]] = []
+
+        self._add_default_call_handlers()
+
+    def set_call_result(
+        self,
+        signature: str,
+        output_types: list[str],
+        values: list[Any]
+    ) -> None:
+        """
+        Answer `eth_call` of the function with constant values.
+
+        Args:
+            signature (str): the function signature, e.g. 'decimals()'.
+            output_types (list[str]): ABI types of the outputs.
+            values (list[Any]): the output values.
+
+        """
+        encoded = abi.encode(output_types, values)
+        self.call_handlers[selector(signature)] = lambda data: encoded
+
+    def set_call_handler(self, signature: str, handler: CallHandler) -> None:
+        """
+        Answer `eth_call` of the function with a handler of calldata arguments.
+
+        Args:
+            signature (str): the function signature.
+            handler (CallHandler): gets calldata without selector and returns encoded output.
+
+        """
+        self.call_handlers[selector(signature)] = handler
+
+    @property
+    def block_number(self) -> int:
+        if self.block_time:
+            elapsed = time.monotonic() - self._start_time
+            return 1_000_000 + int(elapsed / self.block_time)
+
+        return self._block_number
+
+    def handle(self, method: str, params: list[Any]) -> Any:
+        """
+        Execute a JSON-RPC method.
+
+        Args:
+            method (str): the method name.
+            params (list[Any]): the method params.
+
+        Returns:
+            Any: the JSON-serializable result.
+
+        """
+        self.calls[method] += 1
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise JsonRpcError(self.error_code, self.error_message)
+
+        if not self.block_time:
+            self._block_number += 1
+
+        self._mine_pending()
+
+        handler = getattr(self, f'_rpc_{method}', None)
+        if not handler:
+            raise JsonRpcError(-32601, f'The method {method} does not exist')
+
+        return handler(*params)
+
+    def _mine_pending(self) -> None:
+        current_block = self.block_number
+        still_pending = []
+
+        for block_number, tx_hash in self._pending:
+            if block_number <= current_block:
+                self._create_receipt(tx_hash, block_number)
+            else:
+                still_pending.append((block_number, tx_hash))
+
+        self._pending = still_pending
+
+    def _block_hash(self, number: int) -> str:
+        return to_hex(keccak(number.to_bytes(32, 'big')))
+
+    def _create_receipt(self, tx_hash: str, block_number: int) -> None:
+        tx = self.transactions[tx_hash]
+        gas_used = 21_000 if not tx['input'] else int(tx['gas'] * self.gas_used_ratio)
+        logs = []
+
+        if tx['input'][:4] == self.APPROVE_SELECTOR and tx['to']:
+            spender, amount = abi.decode(['address', 'uint256'], tx['input'][4:])
+            logs.append({
+                'address': tx['to'],
+                'topics': [
+                    self.APPROVAL_TOPIC,
+                    '0x' + abi.encode(['address'], [tx['from']]).hex(),
+                    '0x' + abi.encode(['address'], [spender]).hex(),
+                ],
+                'data': '0x' + abi.encode(['uint256'], [amount]).hex(),
+                'blockNumber': hex(block_number),
+                'transactionHash': tx_hash,
+                'transactionIndex': '0x0',
+                'blockHash': self._block_hash(block_number),
+                'logIndex': '0x0',
+                'removed': False,
+            })
+
+        self.receipts[tx_hash] = {
+            'transactionHash': tx_hash,
+            'transactionIndex': '0x0',
+            'blockHash': self._block_hash(block_number),
+            'blockNumber': hex(block_number),
+            'from': tx['from'],
+            'to': tx['to'],
+            'cumulativeGasUsed': hex(gas_used),
+            'gasUsed': hex(gas_used),
+            'effectiveGasPrice': hex(tx['gas_price']),
+            'contractAddress': None,
+            'logs': logs,
+            'logsBloom': '0x' + '00' * 256,
+            'status': '0x1',
+            'type': hex(tx['type']),
+        }
+
+    def _decode_raw_transaction(self, raw: bytes) -> dict[str, Any]:
+        if raw[0] == 2:
+            fields = rlp.decode(raw[1:])
+            nonce, gas, to, value, data = (
+                fields[1], fields[4], fields[5], fields[6], fields[7]
+            )
+            gas_price = min(
+                int.from_bytes(fields[3], 'big'),
+                self.gas_price + int.from_bytes(fields[2], 'big')
+            )
+            tx_type = 2
+        else:
+            fields = rlp.decode(raw)
+            nonce, gas_price, gas, to, value, data = fields[:6]
+            gas_price = int.from_bytes(gas_price, 'big')
+            tx_type = 0
+
+        return {
+            'nonce': int.from_bytes(nonce, 'big'),
+            'gas': int.from_bytes(gas, 'big'),
+            'gas_price': gas_price,
+            'to': to_checksum_address(to) if to else None,
+            'value': int.from_bytes(value, 'big'),
+            'input': data,
+            'type': tx_type,
+            'from': Account.recover_transaction(raw),
+        }
+
+    def _add_default_call_handlers(self) -> None:
+        self.set_call_result('decimals()', ['uint8'], [18])
+        self.set_call_result('balanceOf(address)', ['uint256'], [self.default_balance])
+        self.set_call_result('allowance(address,address)', ['uint256'], [2 ** 256 - 1])
+        self.set_call_result('color()', ['uint32'], [1])
+        self.set_call_result(
+            'getRole(uint8)', ['address'],
+            ['0x000000000000000000000000000000000000dEaD']
+        )
+        self.set_call_result('minDstGasLookup(uint16,uint16)', ['uint256'], [200_000])
+
+        fee = ['uint256', 'uint256']
+        fee_values = [10 ** 15, 0]
+        for signature in (
+            'quoteLayerZeroFee(uint16,uint8,bytes,bytes,(uint256,uint256,bytes))',
+            'estimateBridgeFee(bool,bytes)',
+            'estimateBridgeFee(uint16,bool,bytes)',
+            'estimateSendTokensFee(uint16,bool,bytes)',
+            'estimateSendFee(uint16,bytes,uint256,bool,bytes)',
+            'quoteSendFee((bytes32,uint256,uint256,uint32),bytes,bool,bytes)',
+            'quoteSendFee(uint32,bytes,bool,bytes)',
+        ):
+            self.set_call_result(signature, fee, fee_values)
+
+        def get_amounts_out(data: bytes) -> bytes:
+            amount_in, path = abi.decode(['uint256', 'address[]'], data)
+            amounts = [amount_in]
+
+            for token_in, token_out in zip(path, path[1:]):
+                reserve_in, reserve_out = (
+                    self.pair_reserves
+                    if int(token_in, 16) < int(token_out, 16)
+                    else self.pair_reserves[::-1]
+                )
+                amount_in_with_fee = amounts[-1] * 997
+                amounts.append(
+                    amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee)
+                )
+
+            return abi.encode(['uint256[]'], [amounts])
+
+        def get_pair(data: bytes) -> bytes:
+            token_a, token_b = sorted(abi.decode(['address', 'address'], data), key=lambda a: int(a, 16))
+            pair = keccak(bytes.fromhex(token_a[2:] + token_b[2:]))[12:]
+            return abi.encode(['address'], [to_checksum_address(pair)])
+
+        def try_block_and_aggregate(data: bytes) -> bytes:
+            _, calls = abi.decode(['bool', '(address,bytes)[]'], data)
+            results = []
+
+            for _, call_data in calls:
+                handler = self.call_handlers.get(call_data[:4])
+                results.append((bool(handler), handler(call_data[4:]) if handler else b''))
+
+            return abi.encode(
+                ['uint256', 'bytes32', '(bool,bytes)[]'],
+                [self.block_number, keccak(self.block_number.to_bytes(32, 'big')), results]
+            )
+
+        def quote_exact_input_single(data: bytes) -> bytes:
+            (_, _, amount_in, _, _), = abi.decode(
+                ['(address,address,uint256,uint24,uint160)'], data
+            )
+            return abi.encode(
+                ['uint256', 'uint160', 'uint32', 'uint256'],
+                [amount_in, 2 ** 96, 1, 100_000]
+            )
+
+        self.set_call_handler('getAmountsOut(uint256,address[])', get_amounts_out)
+        self.set_call_result(
+            'factory()', ['address'], ['0x000000000000000000000000000000000000fac7']
+        )
+        self.set_call_handler('getPair(address,address)', get_pair)
+        self.set_call_handler(
+            'getReserves()', lambda data: abi.encode(
+                ['uint112', 'uint112', 'uint32'], [*self.pair_reserves, int(time.time())]
+            )
+        )
+        self.set_call_handler(
+            'tryBlockAndAggregate(bool,(address,bytes)[])', try_block_and_aggregate
+        )
+        self.set_call_handler(
+            'slot0()', lambda data: abi.encode(
+                ['uint160', 'int24', 'uint16', 'uint16', 'uint16', 'uint32', 'bool'],
+                [int(1.0001 ** ((self.pool_tick + 0.5) / 2) * 2 ** 96), self.pool_tick, 0, 1, 1, 0, True]
+            )
+        )
+        self.set_call_handler(
+            'liquidity()', lambda data: abi.encode(['uint128'], [self.pool_liquidity])
+        )
+        self.set_call_handler(
+            'quoteExactInputSingle((address,address,uint256,uint24,uint160))',
+            quote_exact_input_single
+        )
+
+    def _rpc_eth_chainId(self) -> str:
+        return hex(self.chain_id)
+
+    def _rpc_net_version(self) -> str:
+        return str(self.chain_id)
+
+    def _rpc_eth_blockNumber(self) -> str:
+        return hex(self.block_number)
+
+    def _rpc_eth_gasPrice(self) -> str:
+        return hex(self.gas_price)
+
+    def _rpc_eth_maxPriorityFeePerGas(self) -> str:
+        return hex(self.max_priority_fee)
+
+    def _rpc_eth_estimateGas(self, tx: dict, block: str = 'latest') -> str:
+        return hex(21_000 if tx.get('data', '0x') in ('0x', '') else self.gas_estimate)
+
+    def _rpc_eth_getBalance(self, address: str, block: str = 'latest') -> str:
+        return hex(self.balances.get(address.lower(), self.default_balance))
+
+    def _rpc_eth_getTransactionCount(self, address: str, block: str = 'latest') -> str:
+        return hex(self.nonces[address.lower()])
+
+    def _rpc_eth_getCode(self, address: str, block: str = 'latest') -> str:
+        return '0x6080'
+
+    def _rpc_eth_call(self, tx: dict, block: str = 'latest', *overrides) -> str:
+        data = bytes.fromhex(tx.get('data', tx.get('input', '0x'))[2:])
+        handler = self.call_handlers.get(data[:4])
+
+        if not handler:
+            return '0x' + '00' * 32
+
+        return '0x' + handler(data[4:]).hex()
+
+    def _rpc_eth_sendRawTransaction(self, raw_tx: str) -> str:
+        raw = bytes.fromhex(raw_tx[2:])
+        tx_hash = to_hex(keccak(raw))
+        tx = self._decode_raw_transaction(raw)
+
+        sender = tx['from'].lower()
+        if tx['nonce'] < self.nonces[sender]:
+            raise JsonRpcError(-32000, 'nonce too low')
+
+        self.nonces[sender] = tx['nonce'] + 1
+        self.transactions[tx_hash] = tx
+        self._pending.append((self.block_number + 1, tx_hash))
+
+        return tx_hash
+
+    def _rpc_eth_getTransactionReceipt(self, tx_hash: str) -> dict | None:
+        return self.receipts.get(tx_hash)
+
+    def _rpc_eth_getTransactionByHash(self, tx_hash: str) -> dict | None:
+        tx = self.transactions.get(tx_hash)
+        if not tx:
+            return None
+
+        return {
+            'hash': tx_hash,
+            'nonce': hex(tx['nonce']),
+            'gas': hex(tx['gas']),
+            'gasPrice': hex(tx['gas_price']),
+            'from': tx['from'],
+            'to': tx['to'],
+            'value': hex(tx['value']),
+            'input': '0x' + tx['input'].hex(),
+            'type': hex(tx['type']),
+        }
+
+    def _rpc_eth_getBlockByNumber(self, block: str, full_transactions: bool = False) -> dict:
+        number = self.block_number if block in ('latest', 'pending') else int(block, 16)
+
+        return {
+            'number': hex(number),
+            'hash': self._block_hash(number),
+            'parentHash': self._block_hash(number - 1),
+            'timestamp': hex(int(time.time())),
+            'gasLimit': hex(30_000_000),
+            'gasUsed': hex(0),
+            'baseFeePerGas': hex(self.gas_price),
+            'miner': '0x' + '00' * 20,
+            'extraData': '0x',
+            'transactions': [],
+        }
+
+    def _rpc_eth_getBlockTransactionCountByNumber(self, block: str) -> str:
+        return '0x0'
@@ -0,0 +1,202 @@
+"""
+A fake EVM JSON-RPC server for offline runs and benchmarks.
+
+Usage:
+    python -m min_library.models.mock_rpc.mock_rpc_server --port 8545 --block-time 2
+
+and set RPC_OVERRIDE = 'http://127.0.0.1:8545' in user_data/settings/settings.py.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+from typing import Any
+
+from aiohttp import web
+
+from min_library.models.mock_rpc.mock_chain import JsonRpcError, MockChain
+
+
+class MockRpcServer:
+    """
+    An HTTP JSON-RPC server over a MockChain, running in its own thread and event loop.
+
+    Attributes:
+        chain (MockChain): the chain state.
+        host (str): the host to listen on.
+        port (int): the port to listen on (0 - any free port).
+        latency (float): the extra delay of every response in seconds.
+        jitter (float): the random part of the delay in seconds.
+        throttle_rate (float): the probability (0..1) to answer with HTTP 429.
+
+    """
+
+    def __init__(
+        self,
+        chain: MockChain | None = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        throttle_rate: float = 0
+    ) -> None:
+        self.chain = chain or MockChain()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+
+        self.requests = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: web.AppRunner | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._start_error: BaseException | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def start(self, timeout: float = 10) -> str:
+        """
+        Start the server in a background thread.
+
+        Args:
+            timeout (float): how long (secs) to wait for the server to listen. (10)
+
+        Returns:
+            str: the URL of the server.
+
+        """
+        self._thread = threading.Thread(
+            target=self._run, name='mock-rpc-server', daemon=True
+        )
+        self._thread.start()
+
+        if not self._started.wait(timeout):
+            raise TimeoutError(f'The mock RPC server did not start in {timeout} secs')
+        if self._start_error:
+            # for example, the port is in use
+            raise self._start_error
+
+        return self.url
+
+    def stop(self) -> None:
+        if not self._loop:
+            return
+
+        asyncio.run_coroutine_threadsafe(
+            self._runner.cleanup(), self._loop
+        ).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop = None
+
+    def __enter__(self) -> 'MockRpcServer':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            loop.run_until_complete(self._serve())
+        except BaseException as e:
+            self._start_error = e
+            self._loop = None
+            if self._runner:
+                loop.run_until_complete(self._runner.cleanup())
+            loop.close()
+            return
+        finally:
+            # start() waits for the server to listen or fail
+            self._started.set()
+
+        loop.run_forever()
+        loop.close()
+
+    async def _serve(self) -> None:
+        app = web.Application()
+        app.router.add_post('/', self._handle_http)
+        app.router.add_post('/{tail:.*}', self._handle_http)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _handle_http(self, request: web.Request) -> web.Response:
+        self.requests += 1
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            return web.Response(status=429, text='Too Many Requests')
+
+        payload = await request.json()
+
+        if isinstance(payload, list):
+            result = [self._handle_one(item) for item in payload]
+        else:
+            result = self._handle_one(payload)
+
+        return web.Response(text=json.dumps(result), content_type='application/json')
+
+    def _handle_one(self, payload: dict[str, Any]) -> dict[str, Any]:
+        response = {'jsonrpc': '2.0', 'id': payload.get('id')}
+
+        try:
+            response['result'] = self.chain.handle(
+                payload['method'], payload.get('params') or []
+            )
+        except JsonRpcError as e:
+            response['error'] = {'code': e.code, 'message': e.message}
+        except Exception as e:
+            response['error'] = {'code': -32603, 'message': str(e)}
+
+        return response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run a fake EVM JSON-RPC server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--chain-id', type=int, default=1)
+    parser.add_argument('--block-time', type=float, default=0)
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--jitter', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--throttle-rate', type=float, default=0)
+    args = parser.parse_args()
+
+    server = MockRpcServer(
+        chain=MockChain(
+            chain_id=args.chain_id,
+            block_time=args.block_time,
+            error_rate=args.error_rate
+        ),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate
+    )
+    print(f'Mock JSON-RPC server is listening on {server.start()}')
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -23,7 +23,7 @@ class Network:
         explorer: str | None = None,
     ) -> None:
         self.name: str = name.lower()
-        self.rpc: str = rpc if isinstance(rpc, str) else random.choice(rpc)
+        self.rpc: List[str] = [rpc] if isinstance(rpc, str) else list(rpc)
         self.chain_id: int | None = chain_id
         self.tx_type: int = tx_type
         self.coin_symbol: str | None = coin_symbol
@@ -38,7 +38,9 @@ class Network:
         if self.chain_id:
             return
         try:
-            self.chain_id = Web3(Web3.HTTPProvider(self.rpc)).eth.chain_id
+            self.chain_id = Web3(
+                Web3.HTTPProvider(random.choice(self.rpc))
+            ).eth.chain_id
         except Exception as err:
             raise exceptions.WrongChainId(f'Can not get chainId: {err}')
 
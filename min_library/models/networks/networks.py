@@ -2,6 +2,7 @@ import min_library.models.others.exceptions as exceptions
 
 from min_library.models.others.constants import TokenSymbol
 from min_library.models.others.common import Singleton
+from user_data.settings.settings import RPC_OVERRIDE
 from .network import Network
 
 
@@ -206,11 +207,74 @@ class Networks(metaclass=Singleton):
         cls,
         network_name: str,
     ) -> Network:
-        network_name = network_name.capitalize()
+        """
+        Get the network by its name (like op_bnb) or the class attribute name (like OpBNB).
 
-        if not hasattr(cls, network_name):
+        Args:
+            network_name (str): the network name.
+
+        Returns:
+            Network: the network.
+
+        """
+        network = cls._get_index()[0].get(network_name.lower())
+
+        if not network:
             raise exceptions.NetworkNotAdded(
                 f"The network has not been added to {__class__.__name__} class"
             )
 
-        return getattr(cls, network_name)
+        return network
+
+    @classmethod
+    def get_network_by_chain_id(cls, chain_id: int) -> Network:
+        network = cls._get_index()[1].get(chain_id)
+
+        if not network:
+            raise exceptions.NetworkNotAdded(
+                f"The network with chain id {chain_id} has not been added "
+                f"to {__class__.__name__} class"
+            )
+
+        return network
+
+    @classmethod
+    def get_all_networks(cls) -> list[Network]:
+        return list(cls._get_index()[2])
+
+    @classmethod
+    def _get_index(cls) -> tuple[dict[str, Network], dict[int, Network], tuple[Network, ...]]:
+        # the networks are class attributes, they never change after the import
+        if '_index' not in vars(cls):
+            by_name = {}
+            by_chain_id = {}
+            networks = []
+
+            for attribute_name, value in vars(cls).items():
+                if not isinstance(value, Network):
+                    continue
+
+                networks.append(value)
+                by_name.setdefault(value.name, value)
+                by_name.setdefault(attribute_name.lower(), value)
+                by_chain_id.setdefault(value.chain_id, value)
+
+            cls._index = (by_name, by_chain_id, tuple(networks))
+
+        return cls._index
+
+    @classmethod
+    def override_rpc(cls, rpc: str | list[str]) -> None:
+        """
+        Point all networks at other RPC endpoints, e.g. at a local mock server.
+
+        Args:
+            rpc (str | list[str]): the RPC URL or URLs.
+
+        """
+        for network in cls.get_all_networks():
+            network.rpc = [rpc] if isinstance(rpc, str) else list(rpc)
+
+
+if RPC_OVERRIDE:
+    Networks.override_rpc(RPC_OVERRIDE)
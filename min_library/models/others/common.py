@@ -1,11 +1,23 @@
 class AutoRepr:
     """Contains a __repr__ function that automatically builds the output of a class using all its variables."""
+    __slots__ = ()
 
     def __repr__(self) -> str:
         values = ('{}={!r}'.format(key, value)
-                  for key, value in vars(self).items())
+                  for key, value in self._get_variables().items())
         return '{}({})'.format(self.__class__.__name__, ', '.join(values))
 
+    def _get_variables(self) -> dict:
+        if hasattr(self, '__dict__'):
+            return vars(self)
+
+        return {
+            name: getattr(self, name)
+            for cls in reversed(self.__class__.__mro__)
+            for name in getattr(cls, '__slots__', ())
+            if hasattr(self, name)
+        }
+
 
 class Singleton(type):
     """A class that implements the singleton pattern."""
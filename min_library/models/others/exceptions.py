@@ -21,6 +21,28 @@ class TransactionException(Exception):
     pass
 
 
+class CircuitBreakerOpen(ClientException):
+    pass
+
+
+class LeaseLost(ClientException):
+    pass
+
+
+class RetryableRPCError(Exception):
+    """
+    A JSON-RPC error response that may succeed if the request is sent again.
+
+    Attributes:
+        response (dict[str, Any]): the JSON-RPC response with the error.
+
+    """
+
+    def __init__(self, response: dict[str, Any]) -> None:
+        super().__init__(response.get('error'))
+        self.response = response
+
+
 class GasPriceTooHigh(Exception):
     pass
 
@@ -1,10 +1,33 @@
-from decimal import Decimal
+from decimal import Decimal, ROUND_DOWN
+
+
+BPS_DENOMINATOR = 10_000
+
+
+def percent_to_bps(percent: int | float | Decimal) -> int:
+    """
+    Convert a percent (like slippage 0.5) to basis points (50).
+
+    Args:
+        percent (int | float | Decimal): the percent.
+
+    Returns:
+        int: the basis points.
+
+    """
+    if isinstance(percent, int):
+        return percent * 100
+
+    return int(round(Decimal(str(percent)) * 100))
 
 
 class TokenAmount:
     """
     A class representing a token amount.
 
+    Only Wei is stored, Ether and GWei are computed on the first access and cached.
+    Arithmetic and comparisons are exact and work on integer Wei.
+
     Attributes:
         Wei (int): The amount in Wei.
         Ether (Decimal): The amount in Ether.
@@ -12,10 +35,10 @@ class TokenAmount:
         GWei (int): The amount in Gwei.
 
     """
+    __slots__ = ('Wei', 'decimals', '_ether', '_gwei', '_is_wei')
+
     Wei: int
-    Ether: Decimal
     decimals: int
-    GWei: int
 
     def __init__(
         self,
@@ -31,23 +54,63 @@ class TokenAmount:
             amount (int | float | Decimal | str): The amount.
             decimals (int): The number of decimal places (default is 18).
             wei (bool): If True, the amount is in Wei; otherwise, it's in Ether (default is False).
-            set_gwei (bool): If True, the GWei attribute will be calculated and set (default is False).
+            set_gwei (bool): Kept for compatibility, GWei is always available (default is False).
 
         """
+        self.decimals = decimals
+        self._gwei = None
+        self._is_wei = wei
+
         if wei:
             self.Wei: int = int(amount)
-            self.Ether: Decimal = Decimal(str(amount)) / 10 ** decimals
-            
-            if set_gwei:                
-                self.GWei: Decimal = int(amount / 10 ** 9)
+            self._ether = None
+        elif isinstance(amount, int):
+            self.Wei: int = amount * 10 ** decimals
+            self._ether = None
         else:
-            self.Wei: int = int(Decimal(str(amount)) * 10 ** decimals)
-            self.Ether: Decimal = Decimal(str(amount))
-            
-            if set_gwei:                
-                self.GWei: int = int(Decimal(str(amount)) * 10 ** 9)
+            ether = Decimal(str(amount))
+            self.Wei: int = int(ether * 10 ** decimals)
+            # keep the given value, it may be more precise than the decimals allow
+            self._ether = ether
 
-        self.decimals = decimals
+    @classmethod
+    def from_wei(cls, amount: int, decimals: int = 18) -> 'TokenAmount':
+        """
+        Create the TokenAmount from integer Wei without any conversions.
+
+        Args:
+            amount (int): The amount in Wei.
+            decimals (int): The number of decimal places (default is 18).
+
+        Returns:
+            TokenAmount: The token amount.
+
+        """
+        token_amount = cls.__new__(cls)
+        token_amount.Wei = amount
+        token_amount.decimals = decimals
+        token_amount._ether = None
+        token_amount._gwei = None
+        token_amount._is_wei = True
+
+        return token_amount
+
+    @property
+    def Ether(self) -> Decimal:
+        if self._ether is None:
+            self._ether = Decimal(self.Wei) / 10 ** self.decimals
+
+        return self._ether
+
+    @property
+    def GWei(self) -> int:
+        if self._gwei is None:
+            if self._is_wei:
+                self._gwei = self.Wei // 10 ** 9
+            else:
+                self._gwei = int(self.Ether * 10 ** 9)
+
+        return self._gwei
 
     def __str__(self) -> str:
         """
@@ -58,3 +121,105 @@ class TokenAmount:
 
         """
         return f'{self.Ether}'
+
+    def __repr__(self) -> str:
+        return f'TokenAmount(Wei={self.Wei}, decimals={self.decimals})'
+
+    def apply_slippage(self, slippage_bps: int) -> 'TokenAmount':
+        """
+        Get the minimum amount after the slippage, rounded down.
+
+        Args:
+            slippage_bps (int): The slippage in basis points (50 = 0.5%).
+
+        Returns:
+            TokenAmount: The minimum amount.
+
+        """
+        return self.mul_div(BPS_DENOMINATOR - slippage_bps, BPS_DENOMINATOR)
+
+    def mul_div(self, numerator: int, denominator: int) -> 'TokenAmount':
+        """
+        Get the amount multiplied by numerator / denominator, rounded down.
+
+        Returns:
+            TokenAmount: The new amount.
+
+        """
+        return TokenAmount.from_wei(self.Wei * numerator // denominator, self.decimals)
+
+    def _to_wei(self, other: object) -> int:
+        if isinstance(other, TokenAmount):
+            if other.decimals == self.decimals:
+                return other.Wei
+            raise ValueError(
+                f'Can not combine amounts with {self.decimals} and {other.decimals} decimals'
+            )
+
+        if isinstance(other, int):
+            return other
+
+        return NotImplemented
+
+    def __add__(self, other: 'TokenAmount | int') -> 'TokenAmount':
+        wei = self._to_wei(other)
+        if wei is NotImplemented:
+            return NotImplemented
+
+        return TokenAmount.from_wei(self.Wei + wei, self.decimals)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: 'TokenAmount | int') -> 'TokenAmount':
+        wei = self._to_wei(other)
+        if wei is NotImplemented:
+            return NotImplemented
+
+        return TokenAmount.from_wei(self.Wei - wei, self.decimals)
+
+    def __mul__(self, other: int | float | Decimal) -> 'TokenAmount':
+        if isinstance(other, int):
+            return TokenAmount.from_wei(self.Wei * other, self.decimals)
+
+        if isinstance(other, float | Decimal):
+            wei = (self.Wei * Decimal(str(other))).to_integral_value(rounding=ROUND_DOWN)
+            return TokenAmount.from_wei(int(wei), self.decimals)
+
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other: int) -> 'TokenAmount':
+        if isinstance(other, int):
+            return TokenAmount.from_wei(self.Wei // other, self.decimals)
+
+        return NotImplemented
+
+    def _compare(self, other: object, operator) -> bool:
+        wei = self._to_wei(other)
+        if wei is NotImplemented:
+            return NotImplemented
+
+        return operator(self.Wei, wei)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TokenAmount) and other.decimals != self.decimals:
+            return False
+
+        return self._compare(other, int.__eq__)
+
+    def __lt__(self, other: 'TokenAmount | int') -> bool:
+        return self._compare(other, int.__lt__)
+
+    def __le__(self, other: 'TokenAmount | int') -> bool:
+        return self._compare(other, int.__le__)
+
+    def __gt__(self, other: 'TokenAmount | int') -> bool:
+        return self._compare(other, int.__gt__)
+
+    def __ge__(self, other: 'TokenAmount | int') -> bool:
+        return self._compare(other, int.__ge__)
+
+    def __hash__(self) -> int:
+        # equal to the hash of int Wei, since an amount is equal to its int Wei
+        return hash(self.Wei)
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import time
+from typing import Iterable
+
+import aiohttp
+
+from min_library.models.others.constants import TokenSymbol
+from min_library.utils.helpers import read_json
+from user_data.settings.settings import (
+    PRICE_CACHE_TTL,
+    PRICES_FILE
+)
+
+
+class PriceOracle:
+    """
+    A shared source of token prices.
+
+    Prices are fetched from Binance in one batched ticker request for all
+    missing symbols, cached for `ttl` seconds, and concurrent requests for the
+    same symbol wait for the same fetch. If `prices_file` is set, prices are
+    read from this JSON file (`{"ETH": 3000.5, "BNB": 550}`) and the network
+    is never used.
+
+    Attributes:
+        ttl (float): how long a price is valid in seconds.
+        prices_file (str | None): the path to the JSON file with prices.
+        quote_symbol (str): the symbol all prices are quoted in.
+
+    """
+    TICKER_URL = 'https://api.binance.com/api/v3/ticker/price'
+    STABLES = (
+        TokenSymbol.USDT,
+        TokenSymbol.USDC,
+        TokenSymbol.USDC_E,
+        TokenSymbol.USDV
+    )
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        prices_file: str | None = None,
+        quote_symbol: str = TokenSymbol.USDT,
+        retries: int = 3
+    ) -> None:
+        self.ttl = ttl
+        self.prices_file = prices_file
+        self.quote_symbol = quote_symbol
+        self.retries = retries
+        self._cache: dict[str, tuple[float, float]] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._local_prices: dict[str, float] | None = None
+
+    @classmethod
+    def normalize_symbol(cls, symbol: str) -> str:
+        symbol = symbol.upper()
+
+        if symbol.startswith('W') and symbol != 'W':
+            symbol = symbol[1:]
+
+        return symbol
+
+    async def get_price(
+        self,
+        first_token: str = TokenSymbol.ETH,
+        second_token: str = TokenSymbol.USDT
+    ) -> float:
+        """
+        Get the price of the first token in the second token.
+
+        Args:
+            first_token (str): the token to price. (ETH)
+            second_token (str): the token to price in. (USDT)
+
+        Returns:
+            float: the price.
+
+        """
+        first_token = self.normalize_symbol(first_token)
+        second_token = self.normalize_symbol(second_token)
+
+        prices = await self.get_prices([first_token, second_token])
+
+        return prices[first_token] / prices[second_token]
+
+    async def get_prices(self, symbols: Iterable[str]) -> dict[str, float]:
+        """
+        Get the prices of several tokens in the quote symbol at once.
+
+        Args:
+            symbols (Iterable[str]): the token symbols.
+
+        Returns:
+            dict[str, float]: the normalized symbol and its price.
+
+        """
+        symbols = {self.normalize_symbol(symbol) for symbol in symbols}
+        prices = {}
+        to_fetch = []
+        waiting = {}
+
+        for symbol in symbols:
+            if self._is_stable(symbol):
+                prices[symbol] = 1.0
+            elif (cached := self._get_cached(symbol)) is not None:
+                prices[symbol] = cached
+            elif symbol in self._in_flight:
+                waiting[symbol] = self._in_flight[symbol]
+            else:
+                to_fetch.append(symbol)
+
+        if to_fetch:
+            loop = asyncio.get_running_loop()
+            futures = {symbol: loop.create_future() for symbol in to_fetch}
+            self._in_flight.update(futures)
+            waiting.update(futures)
+
+            try:
+                fetched = await self._fetch(to_fetch)
+                now = time.monotonic()
+
+                for symbol, future in futures.items():
+                    if symbol in fetched:
+                        self._cache[symbol] = (fetched[symbol], now)
+                        future.set_result(fetched[symbol])
+                    else:
+                        future.set_exception(ValueError(
+                            f'Can not get {symbol}{self.quote_symbol} price'
+                        ))
+            except Exception as e:
+                for future in futures.values():
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for symbol, future in futures.items():
+                    self._in_flight.pop(symbol, None)
+                    # the fetch was cancelled with the task of its caller, other callers must not hang
+                    if not future.done():
+                        future.set_exception(ValueError(
+                            f'Can not get {symbol}{self.quote_symbol} price: the request was cancelled'
+                        ))
+
+        results = await asyncio.gather(
+            *(asyncio.shield(future) for future in waiting.values())
+        )
+        prices.update(zip(waiting, results))
+
+        return prices
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._local_prices = None
+
+    def _is_stable(self, symbol: str) -> bool:
+        return symbol == self.quote_symbol or symbol in self.STABLES
+
+    def _get_cached(self, symbol: str) -> float | None:
+        if symbol not in self._cache:
+            return None
+
+        price, fetched_at = self._cache[symbol]
+        if time.monotonic() - fetched_at > self.ttl:
+            return None
+
+        return price
+
+    async def _fetch(self, symbols: list[str]) -> dict[str, float]:
+        if self.prices_file:
+            return self._read_local_prices(symbols)
+
+        pairs = {f'{symbol}{self.quote_symbol}': symbol for symbol in symbols}
+
+        async with aiohttp.ClientSession() as session:
+            tickers = await self._request_tickers(session, list(pairs))
+
+            if tickers is None:
+                # an unknown pair fails the whole batch, so ask one by one
+                tickers = {}
+                for pair in pairs:
+                    tickers.update(
+                        await self._request_tickers(session, [pair]) or {}
+                    )
+
+            prices = {
+                pairs[pair]: price
+                for pair, price in tickers.items()
+                if pair in pairs
+            }
+
+            for symbol in set(symbols) - set(prices):
+                reversed_tickers = await self._request_tickers(
+                    session, [f'{self.quote_symbol}{symbol}']
+                )
+                if reversed_tickers:
+                    prices[symbol] = 1 / next(iter(reversed_tickers.values()))
+
+        return prices
+
+    async def _request_tickers(
+        self,
+        session: aiohttp.ClientSession,
+        pairs: list[str]
+    ) -> dict[str, float] | None:
+        if len(pairs) == 1:
+            params = {'symbol': pairs[0]}
+        else:
+            params = {'symbols': json.dumps(pairs, separators=(',', ':'))}
+
+        for attempt in range(self.retries):
+            try:
+                async with session.get(self.TICKER_URL, params=params) as response:
+                    if response.status == 400:
+                        return None
+                    if response.status != 200:
+                        raise ValueError(f'Binance returned {response.status}')
+
+                    result = await response.json()
+                    if isinstance(result, dict):
+                        result = [result]
+
+                    return {
+                        ticker['symbol']: float(ticker['price'])
+                        for ticker in result
+                    }
+            except Exception as e:
+                if attempt == self.retries - 1:
+                    raise ValueError(
+                        f'Can not get {", ".join(pairs)} price from Binance: {e}'
+                    )
+                await asyncio.sleep(2 ** attempt)
+
+    def _read_local_prices(self, symbols: list[str]) -> dict[str, float]:
+        if self._local_prices is None:
+            self._local_prices = {
+                self.normalize_symbol(symbol.removesuffix(self.quote_symbol)): float(price)
+                for symbol, price in read_json(self.prices_file).items()
+            }
+
+        return {
+            symbol: self._local_prices[symbol]
+            for symbol in symbols
+            if symbol in self._local_prices
+        }
+
+
+price_oracle = PriceOracle(ttl=PRICE_CACHE_TTL, prices_file=PRICES_FILE)
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+
+from min_library.models.logger.logger import console_logger
+
+
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+
+def _is_project_frame(frame: FrameType) -> bool:
+    filename = os.path.abspath(frame.f_code.co_filename)
+
+    return (
+        filename.startswith(PROJECT_ROOT)
+        and 'site-packages' not in filename
+        and not filename.startswith(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+
+def _find_offender(frame: FrameType | None) -> str:
+    """
+    Find the innermost frame of the project code, which made the blocking call.
+    """
+    innermost = frame
+    while frame:
+        if _is_project_frame(frame):
+            code = frame.f_code
+            return (
+                f'{os.path.relpath(code.co_filename, PROJECT_ROOT)}:{frame.f_lineno} '
+                f'{getattr(code, "co_qualname", code.co_name)}'
+            )
+        frame = frame.f_back
+
+    if innermost:
+        return f'{innermost.f_code.co_filename}:{innermost.f_lineno} {innermost.f_code.co_name}'
+
+    return 'unknown'
+
+
+class LoopMonitor:
+    """
+    Measure the event loop lag and find callbacks that block the loop.
+
+    A heartbeat coroutine marks the loop as alive every `interval` secs. A watchdog
+    thread checks the heartbeat and, when the loop has been blocked for more than
+    `threshold` secs, captures the stack of the loop thread and logs it.
+
+    Attributes:
+        interval (float): the heartbeat interval in secs.
+        threshold (float): the blocking duration to report in secs.
+        lags (list[float]): the measured loop lags in secs.
+        offenders (dict[str, list[float]]): blocked durations by the blocking code line.
+
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.25,
+        is_log_stacks: bool = True
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.is_log_stacks = is_log_stacks
+        self.lags: list[float] = []
+        self.offenders: dict[str, list[float]] = {}
+
+        self._loop_thread_id: int | None = None
+        self._last_beat = 0.0
+        self._stall: tuple[str, float] | None = None
+        self._stop = threading.Event()
+        self._heartbeat: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Start monitoring, must be called from a coroutine running in the monitored event loop.
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        if self._thread:
+            self._thread.join()
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+
+            now = time.perf_counter()
+            self._last_beat = now
+            self.lags.append(max(now - expected, 0))
+
+            if self._stall:
+                offender, started_at = self._stall
+                self._stall = None
+                self.offenders.setdefault(offender, []).append(now - started_at)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            last_beat = self._last_beat
+            blocked_for = time.perf_counter() - last_beat
+
+            if blocked_for < self.threshold + self.interval or self._stall:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            offender = _find_offender(frame)
+            self._stall = (offender, last_beat)
+
+            message = (
+                f'The event loop is blocked for {round(blocked_for, 2)} secs by {offender}'
+            )
+            if self.is_log_stacks and frame:
+                message += '\n' + ''.join(traceback.format_stack(frame))
+
+            console_logger.warning(message)
+
+    def summary_lines(self, limit: int = 10) -> list[str]:
+        lags = sorted(self.lags)
+        if not lags:
+            return []
+
+        lines = [
+            f'Event loop lag: avg {round(sum(lags) / len(lags) * 1000, 2)} ms, '
+            f'p99 {round(lags[min(int(len(lags) * 0.99), len(lags) - 1)] * 1000, 2)} ms, '
+            f'max {round(lags[-1] * 1000, 2)} ms'
+        ]
+
+        offenders = sorted(
+            self.offenders.items(), key=lambda item: sum(item[1]), reverse=True
+        )
+        for offender, durations in offenders[:limit]:
+            lines.append(
+                f'Blocked {len(durations)} times, {round(sum(durations), 2)} secs in total, '
+                f'max {round(max(durations), 2)} secs: {offender}'
+            )
+
+        return lines
@@ -0,0 +1,244 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+
+# frames of these files are the event loop machinery or instrumentation wrappers,
+# not the code of the bot
+_IGNORED_PATHS = (
+    os.path.join('asyncio', ''),
+    'threading.py',
+    'selectors.py',
+    'runpy.py',
+    os.path.join('tracing', 'tracer.py'),
+)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    qualname = getattr(code, 'co_qualname', code.co_name)
+
+    return f'{module}:{qualname}'
+
+
+def _is_ignored(frame: FrameType) -> bool:
+    return any(path in frame.f_code.co_filename for path in _IGNORED_PATHS)
+
+
+def _thread_stack(frame: FrameType | None) -> list[str]:
+    stack = []
+    while frame:
+        if not _is_ignored(frame):
+            stack.append(_frame_label(frame))
+        frame = frame.f_back
+
+    return stack[::-1]
+
+
+def _task_stack(task: asyncio.Task) -> list[str]:
+    stack = []
+    awaitable = task.get_coro()
+
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'ag_frame', None)
+        if frame is None:
+            break
+
+        if not _is_ignored(frame):
+            stack.append(_frame_label(frame))
+
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'ag_await', None)
+
+    return stack
+
+
+class AsyncProfiler:
+    """
+    A sampling profiler for asyncio programs.
+
+    A background thread takes samples every `interval` secs:
+        - the stack of the event loop thread, when it runs Python code
+          (CPU time and blocking calls);
+        - the await chains of all suspended tasks (wall time spent awaiting).
+    A heartbeat coroutine measures the event loop lag.
+
+    Attributes:
+        interval (float): the sampling interval in secs.
+        cpu_samples (Counter): the loop thread stacks -> the number of samples.
+        await_samples (Counter): the task await chains -> the number of samples.
+        loop_lags (list[float]): the measured loop lags in secs.
+
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.cpu_samples: Counter = Counter()
+        self.await_samples: Counter = Counter()
+        self.idle_samples = 0
+        self.samples = 0
+        self.loop_lags: list[float] = []
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._started_at = 0.0
+        self._finished_at = 0.0
+
+    def start(self) -> None:
+        """
+        Start profiling, must be called from a coroutine running in the profiled event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._started_at = time.perf_counter()
+        self._stop.clear()
+
+        self._heartbeat = self._loop.create_task(self._measure_loop_lag())
+        self._thread = threading.Thread(target=self._sample, name='profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._finished_at = time.perf_counter()
+
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        if self._thread:
+            self._thread.join()
+
+    async def _measure_loop_lag(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval * 10
+            await asyncio.sleep(self.interval * 10)
+            self.loop_lags.append(max(time.perf_counter() - expected, 0))
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None or 'selectors.py' in frame.f_code.co_filename:
+                # the loop thread waits in select(), nothing is running
+                self.idle_samples += 1
+            else:
+                self.cpu_samples[tuple(_thread_stack(frame))] += 1
+
+            try:
+                tasks = list(asyncio.all_tasks(self._loop))
+            except RuntimeError:
+                # the set of tasks was changed by the loop thread during iteration
+                continue
+
+            for task in tasks:
+                if task is self._heartbeat or task.done():
+                    continue
+
+                task_stack = _task_stack(task)
+                if task_stack:
+                    self.await_samples[tuple(task_stack)] += 1
+
+    @staticmethod
+    def _cumulative(samples: Counter) -> tuple[Counter, Counter]:
+        cumulative = Counter()
+        own = Counter()
+
+        for stack, count in samples.items():
+            if not stack:
+                continue
+
+            for label in set(stack):
+                cumulative[label] += count
+            own[stack[-1]] += count
+
+        return cumulative, own
+
+    def report(self, limit: int = 40) -> str:
+        """
+        Build a text report with functions sorted by cumulative time.
+
+        Args:
+            limit (int): how many functions to show in every table. (40)
+
+        Returns:
+            str: the report.
+
+        """
+        duration = (self._finished_at or time.perf_counter()) - self._started_at
+        lags = sorted(self.loop_lags)
+
+        lines = [
+            f'Duration: {round(duration, 2)} secs, {self.samples} samples '
+            f'every {self.interval * 1000} ms',
+            f'Event loop busy: {round(sum(self.cpu_samples.values()) / max(self.samples, 1) * 100, 1)}%',
+        ]
+        if lags:
+            lines.append(
+                f'Event loop lag: avg {round(sum(lags) / len(lags) * 1000, 2)} ms, '
+                f'p99 {round(lags[min(int(len(lags) * 0.99), len(lags) - 1)] * 1000, 2)} ms, '
+                f'max {round(lags[-1] * 1000, 2)} ms'
+            )
+
+        for title, samples in (
+            ('CPU / blocking time on the event loop thread', self.cpu_samples),
+            ('Await time of tasks (sum over concurrent tasks)', self.await_samples),
+        ):
+            cumulative, own = self._cumulative(samples)
+
+            lines.extend(['', title, f'{"cumulative s":>13} {"own s":>9}  function'])
+            for label, count in cumulative.most_common(limit):
+                lines.append(
+                    f'{round(count * self.interval, 3):>13} '
+                    f'{round(own[label] * self.interval, 3):>9}  {label}'
+                )
+
+        return '\n'.join(lines) + '\n'
+
+    def collapsed_stacks(self) -> list[str]:
+        """
+        Get stacks in the collapsed format of flamegraph.pl / speedscope.
+
+        Returns:
+            list[str]: lines like 'main:main;stargate:Stargate.bridge 42'.
+
+        """
+        lines = []
+        for prefix, samples in (('cpu', self.cpu_samples), ('await', self.await_samples)):
+            for stack, count in samples.most_common():
+                lines.append(f'{prefix};{";".join(stack)} {count}')
+
+        return lines
+
+    def save(self, folder: str, is_collapsed: bool = True) -> dict[str, Any]:
+        """
+        Save the report (and the collapsed stacks) to the folder.
+
+        Args:
+            folder (str): the folder.
+            is_collapsed (bool): whether to save the collapsed stacks too. (True)
+
+        Returns:
+            dict[str, Any]: paths of the saved files.
+
+        """
+        Path(folder).mkdir(parents=True, exist_ok=True)
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+
+        paths = {'report': os.path.join(folder, f'profile_{timestamp}.txt')}
+        with open(paths['report'], 'w', encoding='utf-8') as file:
+            file.write(self.report())
+
+        if is_collapsed:
+            paths['collapsed'] = os.path.join(folder, f'profile_{timestamp}.collapsed')
+            with open(paths['collapsed'], 'w', encoding='utf-8') as file:
+                file.write('\n'.join(self.collapsed_stacks()) + '\n')
+
+        return paths
@@ -0,0 +1,403 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+from aiohttp import ClientError, ClientResponseError
+from web3.exceptions import ContractLogicError
+from web3.types import RPCEndpoint, RPCResponse
+
+from min_library.models.rpc.rpc_stats import RpcStats
+import min_library.models.others.exceptions as exceptions
+from user_data.settings.settings import (
+    CIRCUIT_BREAKER_FAILURES,
+    CIRCUIT_BREAKER_RESET,
+    RETRY_BUDGET_MAX,
+    RETRY_BUDGET_RATIO,
+    RETRY_RULES
+)
+
+
+class ErrorClass:
+    TRANSIENT = 'transient'
+    RATE_LIMITED = 'rate_limited'
+    NONCE = 'nonce'
+    UNDERPRICED = 'underpriced'
+    KNOWN = 'known'
+    REVERT = 'revert'
+    INSUFFICIENT_FUNDS = 'insufficient_funds'
+    FATAL = 'fatal'
+
+
+# the first matching part of an error message decides the class
+ERROR_MESSAGES = (
+    ('insufficient funds', ErrorClass.INSUFFICIENT_FUNDS),
+    ('already known', ErrorClass.KNOWN),
+    ('known transaction', ErrorClass.KNOWN),
+    ('underpriced', ErrorClass.UNDERPRICED),
+    ('fee too low', ErrorClass.UNDERPRICED),
+    ('less than block base fee', ErrorClass.UNDERPRICED),
+    ('nonce too low', ErrorClass.NONCE),
+    ('nonce too high', ErrorClass.NONCE),
+    ('invalid nonce', ErrorClass.NONCE),
+    ('execution reverted', ErrorClass.REVERT),
+    ('rate limit', ErrorClass.RATE_LIMITED),
+    ('too many requests', ErrorClass.RATE_LIMITED),
+    ('limit exceeded', ErrorClass.RATE_LIMITED),
+    ('header not found', ErrorClass.TRANSIENT),
+    ('timeout', ErrorClass.TRANSIENT),
+    ('timed out', ErrorClass.TRANSIENT),
+    ('try again', ErrorClass.TRANSIENT),
+    ('temporarily unavailable', ErrorClass.TRANSIENT),
+)
+
+ERROR_CODES = {
+    -32005: ErrorClass.RATE_LIMITED,  # limit exceeded (EIP-1474)
+    -32603: ErrorClass.TRANSIENT,  # internal error of the node
+    429: ErrorClass.RATE_LIMITED,
+}
+
+# the JSON-RPC methods that send transactions, they are retried by Transaction.sign_and_send
+UNSAFE_METHODS = frozenset({'eth_sendRawTransaction', 'eth_sendTransaction'})
+
+
+def get_endpoint_key(network_name: str, endpoint_uri: str) -> str:
+    return f'{network_name}:{RpcStats.get_endpoint_label(endpoint_uri)}'
+
+
+def classify_error(error: BaseException | dict[str, Any]) -> str:
+    """
+    Get the class of an error of an RPC request or a transaction.
+
+    Args:
+        error (BaseException | dict[str, Any]): the exception or the JSON-RPC error object.
+
+    Returns:
+        str: the ErrorClass value.
+
+    """
+    if isinstance(error, ContractLogicError):
+        return ErrorClass.REVERT
+
+    if isinstance(error, ClientResponseError):
+        if error.status == 429:
+            return ErrorClass.RATE_LIMITED
+        return ErrorClass.TRANSIENT if error.status >= 500 else ErrorClass.FATAL
+
+    if isinstance(error, (ClientError, asyncio.TimeoutError, ConnectionError)):
+        return ErrorClass.TRANSIENT
+
+    if isinstance(error, exceptions.RetryableRPCError):
+        error = error.response['error']
+
+    # web3 raises ValueError with the JSON-RPC error object
+    if isinstance(error, ValueError) and error.args and isinstance(error.args[0], dict):
+        error = error.args[0]
+
+    if isinstance(error, dict):
+        message = str(error.get('message', '')).lower()
+        code = error.get('code')
+    else:
+        message = str(error).lower()
+        code = None
+
+    for part, error_class in ERROR_MESSAGES:
+        if part in message:
+            return error_class
+
+    return ERROR_CODES.get(code, ErrorClass.FATAL)
+
+
+class RetryRule:
+    """
+    How an error class is retried.
+
+    Attributes:
+        max_attempts (int): the attempts including the first one (1 - no retries).
+        base_delay (float): the delay (secs) before the first retry.
+        max_delay (float): the maximum delay (secs).
+
+    """
+    __slots__ = ('max_attempts', 'base_delay', 'max_delay')
+
+    def __init__(self, max_attempts: int = 1, base_delay: float = 0, max_delay: float = 0) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, attempt: int) -> float:
+        # exponential backoff with full jitter, so clients don't retry in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Stops requests to an endpoint after failures in a row.
+
+    The circuit is open for reset_timeout secs, then one request is let through
+    (half-open): its success closes the circuit, its failure opens it again.
+
+    Attributes:
+        failure_threshold (int): failures in a row that open the circuit.
+        reset_timeout (float): how long (secs) the circuit is open.
+
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._is_probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        if self._is_probing or time.monotonic() - self._opened_at < self.reset_timeout:
+            return False
+
+        self._is_probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._is_probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._is_probing = False
+
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def cancel_probe(self) -> None:
+        # the probe request was cancelled before its result, the next request probes again
+        self._is_probing = False
+
+
+class RetryBudget:
+    """
+    Limits retries to a share of requests, so retries can't multiply the load of a failing endpoint.
+
+    Every request adds `ratio` tokens up to `max_tokens`, every retry takes one.
+    The budget starts full.
+
+    Attributes:
+        ratio (float): the retries allowed per request.
+        max_tokens (float): the retries allowed in a burst.
+
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 20) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = float(max_tokens)
+
+    def record_request(self) -> None:
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Retries of errors by their class with backoff, circuit breakers and retry budgets by endpoint.
+
+    Attributes:
+        rules (dict[str, RetryRule]): the rules by ErrorClass value, unlisted classes are not retried.
+        budget_ratio (float): see RetryBudget.
+        budget_max (float): see RetryBudget.
+        breaker_failures (int): see CircuitBreaker.
+        breaker_reset (float): see CircuitBreaker.
+
+    """
+
+    def __init__(
+        self,
+        rules: dict[str, RetryRule],
+        budget_ratio: float = 0.2,
+        budget_max: float = 20,
+        breaker_failures: int = 5,
+        breaker_reset: float = 30
+    ) -> None:
+        self.rules = rules
+        self.budget_ratio = budget_ratio
+        self.budget_max = budget_max
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+
+        self.retries: dict[str, int] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._budgets: dict[str, RetryBudget] = {}
+
+    def get_breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(self.breaker_failures, self.breaker_reset)
+
+        return self._breakers[endpoint]
+
+    def get_budget(self, endpoint: str) -> RetryBudget:
+        if endpoint not in self._budgets:
+            self._budgets[endpoint] = RetryBudget(self.budget_ratio, self.budget_max)
+
+        return self._budgets[endpoint]
+
+    def get_retry_delay(self, error_class: str, attempt: int, endpoint: str = '') -> float | None:
+        """
+        Get the delay before the next attempt after a failed one.
+
+        Args:
+            error_class (str): the ErrorClass of the failure.
+            attempt (int): the number of the failed attempt (from 1).
+            endpoint (str): the budget of the endpoint is used. ('' - the common budget)
+
+        Returns:
+            float | None: the delay in secs or None if the error must be raised.
+
+        """
+        rule = self.rules.get(error_class)
+        if not rule or attempt >= rule.max_attempts:
+            return None
+
+        if not self.get_budget(endpoint).try_spend():
+            return None
+
+        self.retries[error_class] = self.retries.get(error_class, 0) + 1
+
+        return rule.get_delay(attempt)
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        endpoint: str = '',
+        on_retry: Callable[[str], Awaitable[None]] | None = None,
+        **kwargs
+    ) -> Any:
+        """
+        Call the function and retry it on retryable errors.
+
+        Args:
+            func (Callable[..., Awaitable[Any]]): the async function.
+            endpoint (str): the endpoint of the breaker and the budget. ('')
+            on_retry (Callable[[str], Awaitable[None]] | None): called with the ErrorClass before a retry,
+                for example, to get a new nonce. (None)
+
+        Returns:
+            Any: the result of the function.
+
+        """
+        breaker = self.get_breaker(endpoint)
+        budget = self.get_budget(endpoint)
+        attempt = 0
+        last_error: Exception | None = None
+
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                # the failures of this call opened the circuit, callers check the class of the real error
+                if last_error:
+                    raise last_error
+                raise exceptions.CircuitBreakerOpen(f'Requests to {endpoint or "the endpoint"} are paused')
+
+            budget.record_request()
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                # for example, by asyncio.wait_for of web3's wait_for_transaction_receipt
+                breaker.cancel_probe()
+                raise
+            except Exception as e:
+                last_error = e
+                error_class = classify_error(e)
+                if error_class in (ErrorClass.TRANSIENT, ErrorClass.RATE_LIMITED):
+                    breaker.record_failure()
+                else:
+                    # the endpoint works, the request is wrong
+                    breaker.record_success()
+
+                retry_delay = self.get_retry_delay(error_class, attempt, endpoint)
+                if retry_delay is None:
+                    raise
+
+                if on_retry:
+                    await on_retry(error_class)
+                await asyncio.sleep(retry_delay)
+                continue
+
+            breaker.record_success()
+            return result
+
+
+def build_retry_middleware(
+    network_name: str,
+    endpoint_uri: str,
+    policy: RetryPolicy | None = None
+) -> Callable:
+    """
+    Build an async web3 middleware that retries failed read requests to the endpoint.
+
+    JSON-RPC errors of a transient class are retried like exceptions, after the
+    last attempt the error response is returned as is. Sent transactions are not
+    retried here, see Transaction.sign_and_send.
+
+    Args:
+        network_name (str): the network name.
+        endpoint_uri (str): the endpoint URL of the provider.
+        policy (RetryPolicy | None): the policy. (the global `retry_policy`)
+
+    Returns:
+        Callable: the middleware.
+
+    """
+    policy = policy or retry_policy
+    endpoint = get_endpoint_key(network_name, endpoint_uri)
+
+    async def retry_middleware(make_request: Callable, w3: Any) -> Callable:
+        async def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            if method in UNSAFE_METHODS:
+                return await make_request(method, params)
+
+            async def request() -> RPCResponse:
+                response = await make_request(method, params)
+
+                rpc_error = response.get('error') if isinstance(response, dict) else None
+                if isinstance(rpc_error, dict) and classify_error(rpc_error) in (
+                    ErrorClass.TRANSIENT, ErrorClass.RATE_LIMITED
+                ):
+                    raise exceptions.RetryableRPCError(response)
+
+                return response
+
+            try:
+                return await policy.call(request, endpoint=endpoint)
+            except exceptions.RetryableRPCError as e:
+                return e.response
+
+        return middleware
+
+    return retry_middleware
+
+
+retry_policy = RetryPolicy(
+    rules={
+        error_class: RetryRule(*rule)
+        for error_class, rule in RETRY_RULES.items()
+    },
+    budget_ratio=RETRY_BUDGET_RATIO,
+    budget_max=RETRY_BUDGET_MAX,
+    breaker_failures=CIRCUIT_BREAKER_FAILURES,
+    breaker_reset=CIRCUIT_BREAKER_RESET
+)
@@ -0,0 +1,214 @@
+import asyncio
+import time
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+from aiohttp import ClientResponseError
+from web3.types import RPCEndpoint, RPCResponse
+
+from min_library.models.metrics.metrics import RPC_THROTTLED, RPC_THROTTLED_SECONDS
+from min_library.models.rpc.rpc_stats import RpcStats
+from user_data.settings.settings import (
+    DEFAULT_RPC_RATE_LIMIT,
+    PROXY_RATE_LIMIT,
+    RPC_RATE_LIMITS
+)
+
+
+class TokenBucket:
+    """
+    A token bucket that queues requests instead of failing them.
+
+    A request takes a token, a request without a token waits until its token
+    is refilled. Tokens are reserved in the order of requests, so waiting
+    requests are served first in first out.
+
+    Attributes:
+        rate (float): the tokens refilled per second (requests per second).
+        burst (float): the bucket size (requests allowed at once).
+        requests (int): the number of requests.
+        throttled (int): the number of requests that waited.
+        throttled_time (float): the total wait in secs.
+        max_wait (float): the longest wait in secs.
+
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_time = 0.0
+        self.max_wait = 0.0
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    async def acquire(self) -> float:
+        """
+        Take a token, wait for it if the bucket is empty.
+
+        Returns:
+            float: the wait in secs.
+
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        self.requests += 1
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0
+
+        # the debt is paid by the refill, later requests wait behind this one
+        wait = -self._tokens / self.rate
+        self.throttled += 1
+        self.throttled_time += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        await asyncio.sleep(wait)
+
+        return wait
+
+    def drain(self) -> None:
+        # the server rate limited us, its real quota is lower than the bucket thinks
+        self._tokens = min(self._tokens, 0)
+
+
+class RateLimiter:
+    """
+    Token buckets of RPC endpoints and proxies.
+
+    Endpoints matching a key of `endpoint_limits` (a part of the URL, like
+    'rpc.ankr.com') share one bucket, since providers count the quota of a key
+    for all networks. Other endpoints get their own buckets with
+    `default_limit`, every proxy gets its own bucket with `proxy_limit`.
+
+    Attributes:
+        endpoint_limits (dict[str, tuple[float, float]]): (rate, burst) by a part of the endpoint URL.
+        default_limit (tuple[float, float] | None): (rate, burst) of other endpoints (None - no limit).
+        proxy_limit (tuple[float, float] | None): (rate, burst) of every proxy (None - no limit).
+        buckets (dict[str, TokenBucket]): the buckets by label.
+
+    """
+
+    def __init__(
+        self,
+        endpoint_limits: dict[str, tuple[float, float]] | None = None,
+        default_limit: tuple[float, float] | None = None,
+        proxy_limit: tuple[float, float] | None = None
+    ) -> None:
+        self.endpoint_limits = endpoint_limits or {}
+        self.default_limit = default_limit
+        self.proxy_limit = proxy_limit
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def get_endpoint_bucket(self, endpoint_uri: str) -> TokenBucket | None:
+        for part, limit in self.endpoint_limits.items():
+            if part in endpoint_uri:
+                return self._get_bucket(f'rpc {part}', limit)
+
+        if not self.default_limit:
+            return None
+
+        return self._get_bucket(f'rpc {RpcStats.get_endpoint_label(endpoint_uri)}', self.default_limit)
+
+    def get_proxy_bucket(self, proxy: str | None) -> TokenBucket | None:
+        if not proxy or not self.proxy_limit:
+            return None
+
+        # the label must not contain the proxy password
+        parsed = urlparse(proxy if '://' in proxy else f'http://{proxy}')
+
+        return self._get_bucket(f'proxy {parsed.hostname}:{parsed.port}', self.proxy_limit)
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+
+        for label, bucket in sorted(
+            self.buckets.items(), key=lambda item: item[1].throttled_time, reverse=True
+        ):
+            lines.append(
+                f'{label:<40} {bucket.requests:>7} requests {bucket.throttled:>7} throttled '
+                f'{round(bucket.throttled_time, 2):>9} secs waited {round(bucket.max_wait, 2):>7} secs max'
+            )
+
+        return lines
+
+    def _get_bucket(self, label: str, limit: tuple[float, float]) -> TokenBucket:
+        if label not in self.buckets:
+            self.buckets[label] = TokenBucket(*limit)
+
+        return self.buckets[label]
+
+
+def _is_rate_limited(response: Any) -> bool:
+    rpc_error = response.get('error') if isinstance(response, dict) else None
+
+    return isinstance(rpc_error, dict) and (
+        rpc_error.get('code') in (-32005, 429) or 'rate limit' in str(rpc_error.get('message', '')).lower()
+    )
+
+
+def build_rate_limit_middleware(
+    endpoint_uri: str,
+    proxy: str | None = None,
+    limiter: RateLimiter | None = None
+) -> Callable | None:
+    """
+    Build an async web3 middleware that waits for the buckets of the endpoint and the proxy.
+
+    Args:
+        endpoint_uri (str): the endpoint URL of the provider.
+        proxy (str | None): the proxy of the provider. (None)
+        limiter (RateLimiter | None): the buckets. (the global `rate_limiter`)
+
+    Returns:
+        Callable | None: the middleware or None if neither the endpoint nor the proxy is limited.
+
+    """
+    limiter = limiter or rate_limiter
+    used_buckets = [
+        bucket
+        for bucket in (limiter.get_endpoint_bucket(endpoint_uri), limiter.get_proxy_bucket(proxy))
+        if bucket
+    ]
+    if not used_buckets:
+        return None
+
+    buckets = {label: bucket for label, bucket in limiter.buckets.items() if bucket in used_buckets}
+
+    async def rate_limit_middleware(make_request: Callable, w3: Any) -> Callable:
+        async def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            for label, bucket in buckets.items():
+                wait = await bucket.acquire()
+                if wait:
+                    RPC_THROTTLED.inc(limiter=label)
+                    RPC_THROTTLED_SECONDS.inc(wait, limiter=label)
+
+            try:
+                response = await make_request(method, params)
+            except ClientResponseError as e:
+                if e.status == 429:
+                    for bucket in buckets.values():
+                        bucket.drain()
+                raise
+
+            if _is_rate_limited(response):
+                for bucket in buckets.values():
+                    bucket.drain()
+
+            return response
+
+        return middleware
+
+    return rate_limit_middleware
+
+
+rate_limiter = RateLimiter(
+    endpoint_limits=RPC_RATE_LIMITS,
+    default_limit=DEFAULT_RPC_RATE_LIMIT,
+    proxy_limit=PROXY_RATE_LIMIT
+)
@@ -0,0 +1,312 @@
+import json
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+from web3.types import RPCEndpoint, RPCResponse
+
+from user_data.settings.settings import IS_RPC_PAYLOAD_SIZES
+
+
+class MethodStats:
+    """
+    Counters of one JSON-RPC method on one endpoint.
+
+    Attributes:
+        count (int): the number of requests.
+        errors (Counter): the number of errors by error class.
+        total_time (float): the sum of latencies in seconds.
+        max_time (float): the maximum latency in seconds.
+        buckets (list[int]): the latency histogram, see LATENCY_BUCKETS_MS.
+        request_bytes (int): the total size of request params (0 - the sizes are not counted).
+        response_bytes (int): the total size of responses (0 - the sizes are not counted).
+
+    """
+    LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    __slots__ = (
+        'count', 'errors', 'total_time', 'max_time',
+        'buckets', 'request_bytes', 'response_bytes'
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors: Counter = Counter()
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.buckets = [0] * (len(self.LATENCY_BUCKETS_MS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def observe(
+        self,
+        latency: float,
+        request_bytes: int,
+        response_bytes: int,
+        error: str | None = None
+    ) -> None:
+        self.count += 1
+        self.total_time += latency
+        self.max_time = max(self.max_time, latency)
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+
+        latency_ms = latency * 1000
+        for index, bound in enumerate(self.LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+        if error:
+            self.errors[error] += 1
+
+    def merge(self, other: 'MethodStats') -> None:
+        self.count += other.count
+        self.errors.update(other.errors)
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.buckets = [amount + other_amount for amount, other_amount in zip(self.buckets, other.buckets)]
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Estimate the latency percentile in milliseconds from the histogram.
+
+        Returns:
+            float | None: the upper bound of the bucket with the percentile.
+
+        """
+        if not self.count:
+            return None
+
+        rank = self.count * percent / 100
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= rank:
+                if index < len(self.LATENCY_BUCKETS_MS):
+                    return float(self.LATENCY_BUCKETS_MS[index])
+                return round(self.max_time * 1000, 3)
+
+        return round(self.max_time * 1000, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': dict(self.errors),
+            'total_time_s': round(self.total_time, 4),
+            'avg_ms': round(self.total_time / self.count * 1000, 3) if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'max_ms': round(self.max_time * 1000, 3),
+            'histogram_ms': dict(zip(
+                [f'<={bound}' for bound in self.LATENCY_BUCKETS_MS] + ['inf'],
+                self.buckets
+            )),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+
+
+class RpcStats:
+    """
+    Per (network, endpoint, method) statistics of all JSON-RPC requests of the run.
+    """
+
+    def __init__(self) -> None:
+        self.methods: dict[tuple[str, str, str], MethodStats] = {}
+        self.started_at = time.time()
+
+    @staticmethod
+    def get_endpoint_label(endpoint_uri: str) -> str:
+        """
+        Get the endpoint host and path without API keys.
+
+        Args:
+            endpoint_uri (str): the endpoint URL.
+
+        Returns:
+            str: the label of the endpoint.
+
+        """
+        parsed = urlparse(str(endpoint_uri))
+        path = re.sub(r'/[A-Za-z0-9_\-]{24,}', '/***', parsed.path.rstrip('/'))
+
+        return f'{parsed.netloc}{path}'
+
+    def observe(
+        self,
+        network: str,
+        endpoint: str,
+        method: str,
+        latency: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error: str | None = None
+    ) -> None:
+        key = (network, endpoint, method)
+
+        if key not in self.methods:
+            self.methods[key] = MethodStats()
+
+        self.methods[key].observe(latency, request_bytes, response_bytes, error)
+
+    def merge(self, methods: dict[tuple[str, str, str], MethodStats]) -> None:
+        """
+        Add the statistics of another registry (of another process).
+
+        Args:
+            methods (dict[tuple[str, str, str], MethodStats]): the statistics by (network, endpoint, method).
+
+        """
+        for key, stats in methods.items():
+            if key not in self.methods:
+                self.methods[key] = MethodStats()
+
+            self.methods[key].merge(stats)
+
+    def reset(self) -> None:
+        self.methods.clear()
+        self.started_at = time.time()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """
+        Get statistics sorted by total time spent, the heaviest first.
+
+        Returns:
+            list[dict[str, Any]]: a row per (network, endpoint, method).
+
+        """
+        rows = [
+            {
+                'network': network,
+                'endpoint': endpoint,
+                'method': method,
+                **stats.to_dict()
+            }
+            for (network, endpoint, method), stats in self.methods.items()
+        ]
+
+        return sorted(rows, key=lambda row: row['total_time_s'], reverse=True)
+
+    def summary_lines(self, limit: int = 15) -> list[str]:
+        rows = self.snapshot()
+        total_time = sum(row['total_time_s'] for row in rows) or 1
+        total_count = sum(row['count'] for row in rows)
+
+        lines = [
+            f'RPC: {total_count} requests, '
+            f'{round(sum(row["total_time_s"] for row in rows), 2)} secs in total'
+        ]
+        for row in rows[:limit]:
+            errors = sum(row['errors'].values())
+            lines.append(
+                f'{row["network"]:<10} {row["method"]:<38} '
+                f'{row["count"]:>6} calls {row["avg_ms"]:>9} ms avg '
+                f'{row["p95_ms"]:>8} ms p95 '
+                f'{round(row["total_time_s"] / total_time * 100, 1):>5}% time '
+                f'{errors} errors'
+            )
+
+        return lines
+
+    def dump(self, path: str) -> None:
+        Path(os.path.dirname(path) or '.').mkdir(parents=True, exist_ok=True)
+
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'started_at': self.started_at,
+                    'finished_at': time.time(),
+                    'methods': self.snapshot()
+                },
+                file,
+                indent=2
+            )
+
+
+def _json_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _no_size(value: Any) -> int:
+    return 0
+
+
+def build_rpc_stats_middleware(
+    network_name: str,
+    endpoint_uri: str,
+    stats: RpcStats | None = None,
+    is_payload_sizes: bool = IS_RPC_PAYLOAD_SIZES
+) -> Callable:
+    """
+    Build an async web3 middleware that records every request to RpcStats.
+
+    Args:
+        network_name (str): the network name.
+        endpoint_uri (str): the endpoint URL of the provider.
+        stats (RpcStats | None): the registry. (the global `rpc_stats`)
+        is_payload_sizes (bool): serialize params and responses again to count their sizes.
+            (IS_RPC_PAYLOAD_SIZES)
+
+    Returns:
+        Callable: the middleware.
+
+    """
+    stats = stats or rpc_stats
+    endpoint = RpcStats.get_endpoint_label(endpoint_uri)
+    get_size = _json_size if is_payload_sizes else _no_size
+
+    async def rpc_stats_middleware(make_request: Callable, w3: Any) -> Callable:
+        async def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            start_time = time.perf_counter()
+            try:
+                response = await make_request(method, params)
+            except Exception as e:
+                stats.observe(
+                    network=network_name,
+                    endpoint=endpoint,
+                    method=method,
+                    latency=time.perf_counter() - start_time,
+                    request_bytes=get_size(params),
+                    error=e.__class__.__name__
+                )
+                raise
+
+            error = None
+            if isinstance(response, dict) and response.get('error'):
+                rpc_error = response['error']
+                error = (
+                    f'RPCError({rpc_error.get("code")})'
+                    if isinstance(rpc_error, dict)
+                    else 'RPCError'
+                )
+
+            stats.observe(
+                network=network_name,
+                endpoint=endpoint,
+                method=method,
+                latency=time.perf_counter() - start_time,
+                request_bytes=get_size(params),
+                response_bytes=get_size(response),
+                error=error
+            )
+
+            return response
+
+        return middleware
+
+    return rpc_stats_middleware
+
+
+rpc_stats = RpcStats()
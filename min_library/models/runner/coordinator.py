@@ -0,0 +1,346 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from min_library.models.logger.logger import console_logger
+from min_library.models.metrics.metrics import ACCOUNTS_QUEUED, ACTIVE_ACCOUNTS, MODULE_RUNS
+
+
+# the header with COORDINATOR_TOKEN in every request of workers
+TOKEN_HEADER = 'X-Coordinator-Token'
+
+
+class Job:
+    """
+    A module run for one account, leased to one worker at a time.
+
+    Attributes:
+        job_id (str): the account id and the module name.
+        account_id (str | int): the account id (workers take keys from their own files).
+        module (str): the name of the module in modules_settings.
+        attempts (int): how many times the job was leased.
+        worker_id (str | None): the worker holding the lease.
+        lease_expires_at (float): when the lease expires without a heartbeat (monotonic).
+
+    """
+    __slots__ = ('job_id', 'account_id', 'module', 'attempts', 'worker_id', 'lease_expires_at')
+
+    def __init__(self, account_id: str | int, module: str) -> None:
+        self.job_id = f'{account_id}:{module}'
+        self.account_id = account_id
+        self.module = module
+        self.attempts = 0
+        self.worker_id: str | None = None
+        self.lease_expires_at = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'account_id': self.account_id,
+            'module': self.module,
+            'attempt': self.attempts,
+        }
+
+
+class Coordinator:
+    """
+    The owner of the account queue of a run, workers on other machines lease jobs over HTTP.
+
+    A worker leases one job per request and renews its leases with heartbeats.
+    A lease that is not renewed for lease_ttl secs (the worker died or lost the
+    network) is given to another worker, a job is failed after max_attempts
+    leases. Every lease and result is appended to the journal, a run started
+    with `resume` skips the jobs that succeeded in the last run of the journal.
+
+    Endpoints (JSON bodies):
+        POST /lease {"worker_id"} -> {"job": {...} | null, "is_finished"}
+        POST /heartbeat {"worker_id", "job_ids"} -> {"lost": [job ids]}
+        POST /complete {"worker_id", "job_id", "is_success", "error"} -> {}
+        GET /status -> the number of jobs by state
+
+    Attributes:
+        module_name (str): the name of the module in modules_settings.
+        host (str): the host to listen on.
+        port (int): the port to listen on.
+        token (str | None): the shared secret of workers (None - no check).
+        journal_path (str | None): the JSONL journal of the run.
+        lease_ttl (float): how long (secs) a lease lives without a heartbeat.
+        max_attempts (int): how many times a job is leased before it is failed.
+
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        host: str = '127.0.0.1',
+        port: int = 8600,
+        token: str | None = None,
+        journal_path: str | None = None,
+        lease_ttl: float = 60,
+        max_attempts: int = 3
+    ) -> None:
+        self.module_name = module_name
+        self.host = host
+        self.port = port
+        self.token = token
+        self.journal_path = journal_path
+        self.lease_ttl = lease_ttl
+        self.max_attempts = max_attempts
+
+        self.run_id: str | None = None
+        self.results = {'success': 0, 'fail': 0}
+
+        self._pending: deque[Job] = deque()
+        self._leased: dict[str, Job] = {}
+        self._finished: set[str] = set()
+        self._is_finished = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+
+    async def run(self, account_ids: list[str | int], resume: bool = False) -> dict[str, int]:
+        """
+        Serve the jobs of the accounts until every job is finished.
+
+        Args:
+            account_ids (list[str | int]): the accounts in the order of processing.
+            resume (bool): continue the last run of the journal. (False)
+
+        Returns:
+            dict[str, int]: the number of succeeded and failed jobs.
+
+        """
+        finished_job_ids = self._load_succeeded_jobs() if resume else set()
+        if not resume or not self.run_id:
+            self.run_id = time.strftime('%Y%m%d-%H%M%S')
+
+        for account_id in account_ids:
+            job = Job(account_id, self.module_name)
+            if job.job_id not in finished_job_ids:
+                self._pending.append(job)
+
+        ACCOUNTS_QUEUED.set(len(self._pending))
+        if not self._pending:
+            console_logger.info('All jobs of the run are finished already')
+            return self.results
+
+        app = web.Application(middlewares=[self._check_token])
+        app.router.add_post('/lease', self._handle_lease)
+        app.router.add_post('/heartbeat', self._handle_heartbeat)
+        app.router.add_post('/complete', self._handle_complete)
+        app.router.add_get('/status', self._handle_status)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        console_logger.info(
+            f'Coordinator of run {self.run_id} is waiting for workers on '
+            f'http://{self.host}:{self.port} ({len(self._pending)} jobs, '
+            f'{len(finished_job_ids)} succeeded before)'
+        )
+
+        expiry_task = asyncio.create_task(self._expire_leases())
+        try:
+            await self._is_finished.wait()
+            # idle workers learn that the run is finished from their next lease request
+            await asyncio.sleep(min(self.lease_ttl, 5))
+        finally:
+            expiry_task.cancel()
+            await self._runner.cleanup()
+            self._runner = None
+
+        console_logger.info(
+            f'Run {self.run_id} is finished: {self.results["success"]} jobs succeeded, '
+            f'{self.results["fail"]} failed'
+        )
+
+        return self.results
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            'run_id': self.run_id,
+            'pending': len(self._pending),
+            'leased': len(self._leased),
+            'workers': len({job.worker_id for job in self._leased.values()}),
+            **self.results,
+        }
+
+    def lease(self, worker_id: str) -> Job | None:
+        if not self._pending:
+            return None
+
+        job = self._pending.popleft()
+        job.attempts += 1
+        job.worker_id = worker_id
+        job.lease_expires_at = time.monotonic() + self.lease_ttl
+        self._leased[job.job_id] = job
+
+        ACCOUNTS_QUEUED.dec()
+        ACTIVE_ACCOUNTS.inc()
+        self._write_journal('leased', job)
+
+        return job
+
+    def heartbeat(self, worker_id: str, job_ids: list[str]) -> list[str]:
+        """
+        Renew the leases of the worker.
+
+        Returns:
+            list[str]: the jobs the worker doesn't hold anymore.
+
+        """
+        lost = []
+        expires_at = time.monotonic() + self.lease_ttl
+
+        for job_id in job_ids:
+            job = self._leased.get(job_id)
+            if job and job.worker_id == worker_id:
+                job.lease_expires_at = expires_at
+            else:
+                lost.append(job_id)
+
+        return lost
+
+    def complete(self, worker_id: str, job_id: str, is_success: bool, error: str | None = None) -> None:
+        if job_id in self._finished:
+            return
+
+        job = self._leased.get(job_id)
+        if job and job.worker_id != worker_id and not is_success:
+            # the job was leased again after its lease expired, the new worker reports it
+            return
+
+        job = self._leased.pop(job_id, None)
+        if job:
+            ACTIVE_ACCOUNTS.dec()
+        else:
+            # the lease expired, but the worker finished the job after all
+            job = next((job for job in self._pending if job.job_id == job_id), None)
+            if not job:
+                return
+            self._pending.remove(job)
+            ACCOUNTS_QUEUED.dec()
+
+        if job.worker_id != worker_id:
+            console_logger.warning(f'Job {job_id} is finished by {worker_id} after its lease expired')
+
+        self._finish(job, is_success, error)
+
+    def _finish(self, job: Job, is_success: bool, error: str | None = None) -> None:
+        self._finished.add(job.job_id)
+        self.results['success' if is_success else 'fail'] += 1
+        MODULE_RUNS.inc(module=job.module, result='success' if is_success else 'fail')
+        self._write_journal('succeeded' if is_success else 'failed', job, error=error)
+
+        if not self._pending and not self._leased:
+            self._is_finished.set()
+
+    async def _expire_leases(self) -> None:
+        while True:
+            await asyncio.sleep(1)
+
+            now = time.monotonic()
+            for job in [job for job in self._leased.values() if job.lease_expires_at < now]:
+                del self._leased[job.job_id]
+                ACTIVE_ACCOUNTS.dec()
+
+                if job.attempts >= self.max_attempts:
+                    console_logger.error(
+                        f'Job {job.job_id} of {job.worker_id} is failed: the lease expired '
+                        f'{job.attempts} times'
+                    )
+                    self._finish(job, False, 'lease expired')
+                    continue
+
+                console_logger.warning(
+                    f'Lease of job {job.job_id} of {job.worker_id} expired, it is queued again'
+                )
+                self._write_journal('expired', job)
+                # the job was taken long ago, it goes before the jobs queued after it
+                self._pending.appendleft(job)
+                ACCOUNTS_QUEUED.inc()
+
+    @web.middleware
+    async def _check_token(self, request: web.Request, handler) -> web.StreamResponse:
+        if self.token and request.headers.get(TOKEN_HEADER) != self.token:
+            return web.json_response({'error': 'invalid token'}, status=403)
+
+        return await handler(request)
+
+    async def _handle_lease(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        job = self.lease(str(data['worker_id']))
+
+        return web.json_response({
+            'job': job.to_dict() if job else None,
+            'is_finished': self._is_finished.is_set(),
+            'lease_ttl': self.lease_ttl,
+        })
+
+    async def _handle_heartbeat(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        lost = self.heartbeat(str(data['worker_id']), list(data.get('job_ids') or []))
+
+        return web.json_response({'lost': lost})
+
+    async def _handle_complete(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.complete(
+            str(data['worker_id']),
+            str(data['job_id']),
+            bool(data.get('is_success')),
+            data.get('error')
+        )
+
+        return web.json_response({})
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_status())
+
+    def _write_journal(self, event: str, job: Job, **fields) -> None:
+        if not self.journal_path:
+            return
+
+        Path(os.path.dirname(self.journal_path) or '.').mkdir(parents=True, exist_ok=True)
+
+        with open(self.journal_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({
+                'time': time.time(),
+                'run_id': self.run_id,
+                'event': event,
+                'job_id': job.job_id,
+                'worker_id': job.worker_id,
+                'attempt': job.attempts,
+                **fields
+            }) + '\n')
+
+    def _load_succeeded_jobs(self) -> set[str]:
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return set()
+
+        succeeded_job_ids: dict[str, set[str]] = {}
+        line = '\n'
+        with open(self.journal_path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    # the last line may be cut by a crash
+                    continue
+
+                self.run_id = row['run_id']
+                job_ids = succeeded_job_ids.setdefault(self.run_id, set())
+                if row['event'] == 'succeeded':
+                    job_ids.add(row['job_id'])
+
+        if not line.endswith('\n'):
+            # otherwise the first event of the resumed run is appended to the cut line
+            with open(self.journal_path, 'a', encoding='utf-8') as file:
+                file.write('\n')
+
+        return succeeded_job_ids.get(self.run_id, set())
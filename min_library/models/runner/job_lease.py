@@ -0,0 +1,38 @@
+import time
+from contextvars import ContextVar
+
+import min_library.models.others.exceptions as exceptions
+
+
+class JobLease:
+    """
+    The lease of a job run by a worker.
+
+    The coordinator gives the job to another worker when the lease is not
+    renewed in time, from then on the job must not send transactions. A
+    transaction already sent is left to finish, the job is stopped before its
+    next one by `check_lease`.
+
+    Attributes:
+        job_id (str): the job id.
+        is_lost (bool): the coordinator gave the job to another worker.
+        renewed_at (float): when the lease was taken or renewed last (monotonic).
+
+    """
+    __slots__ = ('job_id', 'is_lost', 'renewed_at')
+
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.is_lost = False
+        self.renewed_at = time.monotonic()
+
+
+# the lease of the job run by the current task, None outside of workers
+current_lease: ContextVar[JobLease | None] = ContextVar('current_lease', default=None)
+
+
+def check_lease() -> None:
+    lease = current_lease.get()
+
+    if lease and lease.is_lost:
+        raise exceptions.LeaseLost(f'Lease of job {lease.job_id} is lost, another worker may run it')
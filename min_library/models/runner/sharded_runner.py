@@ -0,0 +1,353 @@
+import asyncio
+import atexit
+import multiprocessing
+import os
+import queue
+import random
+import time
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from multiprocessing.sharedctypes import Synchronized
+from multiprocessing.synchronize import Semaphore
+from typing import Any, Callable
+
+from min_library.models.account.account_manager import AccountInfo
+from min_library.models.account.user_agents import user_agent_pool
+from min_library.models.contracts.allowance_ledger import allowance_ledger
+from min_library.models.logger.logger import CustomLogger, console_logger
+from min_library.models.metrics.metrics import (
+    ACCOUNTS_QUEUED, ACTIVE_ACCOUNTS, MODULE_RUNS, metrics
+)
+from min_library.models.rpc.rpc_stats import MethodStats, RpcStats, rpc_stats
+from min_library.models.runner.shared_slots import shared_slots
+from min_library.models.tracing.tracer import tracer
+from min_library.models.transactions.gas_model import gas_model
+from min_library.utils.helpers import delay
+from user_data.settings.settings import (
+    IS_SLEEP,
+    METRICS_INTERVAL,
+    SLEEP_BETWEEN_ACCS_FROM,
+    SLEEP_BETWEEN_ACCS_TO,
+    TRACE_FILE
+)
+
+
+# the metrics counted by the parent process, the rest are summed over the shards
+PARENT_METRICS = (ACTIVE_ACCOUNTS.name, ACCOUNTS_QUEUED.name, MODULE_RUNS.name)
+# the stores saved by the parent process, shards send their changes instead of saving whole files
+STORES = {
+    'allowances': allowance_ledger,
+    'gas_samples': gas_model,
+    'user_agents': user_agent_pool,
+}
+
+
+class ShardedRunner:
+    """
+    Run a module for accounts in several processes, each with its own event loop and connections.
+
+    Shards take the next account from a shared index when they have a free
+    slot, so a slow shard doesn't hold accounts others could process. The
+    parent process counts the results, sums the metrics and RPC statistics of
+    the shards, saves the allowances, gas samples and user agents they send
+    and gives them the semaphores of the global and per-network limits.
+
+    Attributes:
+        module (Callable): the module from modules_settings (must be importable by name).
+        shards (int): the number of processes.
+        accounts_per_shard (int): the accounts processed at the same time by one process.
+        max_concurrent_accounts (int | None): the accounts processed at the same time by all processes.
+        network_limits (dict[str, int]): the same by network name.
+        results (dict[str, int]): the number of succeeded and failed accounts.
+
+    """
+
+    def __init__(
+        self,
+        module: Callable,
+        shards: int,
+        accounts_per_shard: int = 1,
+        max_concurrent_accounts: int | None = None,
+        network_limits: dict[str, int] | None = None
+    ) -> None:
+        self.module = module
+        self.shards = shards
+        self.accounts_per_shard = accounts_per_shard
+        self.max_concurrent_accounts = max_concurrent_accounts
+        self.network_limits = network_limits or {}
+        self.results = {'success': 0, 'fail': 0}
+
+        # the latest snapshots of every shard, they are cumulative
+        self._shard_metrics: dict[int, dict[str, dict[tuple[str, ...], float]]] = {}
+        self._shard_rpc_stats: dict[int, dict[tuple[str, str, str], MethodStats]] = {}
+        # the accounts started and not finished by every shard
+        self._in_flight: dict[int, set[str | int]] = {}
+
+    async def run(self, accounts: list[AccountInfo]) -> dict[str, int]:
+        """
+        Process all accounts and wait for all shards.
+
+        Args:
+            accounts (list[AccountInfo]): the accounts.
+
+        Returns:
+            dict[str, int]: the number of succeeded and failed accounts.
+
+        """
+        # a forked child would inherit the running event loop and open connections
+        context = multiprocessing.get_context('spawn')
+
+        next_index = context.Value('i', 0)
+        messages = context.Queue()
+        account_slots = (
+            context.BoundedSemaphore(self.max_concurrent_accounts)
+            if self.max_concurrent_accounts else None
+        )
+        network_slots = {
+            name.lower(): context.BoundedSemaphore(limit)
+            for name, limit in self.network_limits.items()
+        }
+
+        processes = [
+            context.Process(
+                target=_run_shard,
+                args=(
+                    shard_id, self.module, accounts, self.accounts_per_shard,
+                    next_index, messages, account_slots, network_slots
+                ),
+                name=f'shard-{shard_id}'
+            )
+            for shard_id in range(1, self.shards + 1)
+        ]
+
+        ACCOUNTS_QUEUED.set(len(accounts))
+        metrics.add_collector(self._collect_shard_metrics)
+
+        for process in processes:
+            process.start()
+            self._in_flight[process.pid] = set()
+
+        console_logger.info(
+            f'Started {len(processes)} shards for {len(accounts)} accounts, '
+            f'{self.accounts_per_shard} accounts per shard'
+        )
+
+        await self._read_messages(messages, processes)
+
+        for process in processes:
+            process.join()
+
+        for store in STORES.values():
+            store.save()
+
+        console_logger.info(
+            f'Shards finished: {self.results["success"]} accounts succeeded, '
+            f'{self.results["fail"]} failed'
+        )
+
+        return self.results
+
+    async def _read_messages(self, messages: Queue, processes: list[BaseProcess]) -> None:
+        shard_ids = {process.pid: shard_id for shard_id, process in enumerate(processes, start=1)}
+        finished_pids = set()
+
+        while True:
+            message = await asyncio.to_thread(_get_message, messages, 0.5)
+            if message:
+                finished_pids.update(self._handle_message(message))
+                continue
+
+            alive = [process for process in processes if process.is_alive()]
+            exited = [
+                process for process in processes
+                if process not in alive and process.pid not in finished_pids
+            ]
+            if exited or not alive:
+                # a shard may put its last messages and exit after the get timed out,
+                # an exited shard writes nothing more, so the queue has all its messages
+                while message := _get_message_nowait(messages):
+                    finished_pids.update(self._handle_message(message))
+
+            for process in exited:
+                if process.pid not in finished_pids:
+                    finished_pids.add(process.pid)
+                    self._fail_in_flight(shard_ids[process.pid], process)
+
+            if not alive:
+                return
+
+    def _handle_message(self, message: tuple) -> list[int]:
+        kind, pid, *payload = message
+
+        if kind == 'started':
+            account_id, = payload
+            self._in_flight[pid].add(account_id)
+            ACCOUNTS_QUEUED.dec()
+            ACTIVE_ACCOUNTS.inc()
+
+        elif kind == 'finished':
+            account_id, is_result = payload
+            self._in_flight[pid].discard(account_id)
+            self._count_result(is_result)
+
+        elif kind == 'snapshot':
+            self._shard_metrics[pid], self._shard_rpc_stats[pid] = payload
+
+            # the parent makes no requests, its statistics are the sum of the shards
+            merged_rpc_stats = RpcStats()
+            for methods in self._shard_rpc_stats.values():
+                merged_rpc_stats.merge(methods)
+            rpc_stats.methods = merged_rpc_stats.methods
+
+        elif kind == 'stores':
+            changes, = payload
+            for name, store_changes in changes.items():
+                STORES[name].merge(store_changes)
+
+        elif kind == 'done':
+            return [pid]
+
+        return []
+
+    def _count_result(self, is_result: Any) -> None:
+        ACTIVE_ACCOUNTS.dec()
+        MODULE_RUNS.inc(
+            module=self.module.__name__, result='success' if is_result else 'fail'
+        )
+        self.results['success' if is_result else 'fail'] += 1
+
+    def _fail_in_flight(self, shard_id: int, process: BaseProcess) -> None:
+        in_flight = self._in_flight.get(process.pid) or set()
+
+        console_logger.error(
+            f'Shard {shard_id} exited with code {process.exitcode}, '
+            f'{len(in_flight)} of its accounts are failed: {sorted(map(str, in_flight))}'
+        )
+
+        for _ in in_flight:
+            self._count_result(False)
+        in_flight.clear()
+
+    def _collect_shard_metrics(self) -> None:
+        # runs after the collectors of the parent, so the sums replace their values
+        totals: dict[str, dict[tuple[str, ...], float]] = {}
+
+        for snapshot in self._shard_metrics.values():
+            for name, values in snapshot.items():
+                if name in PARENT_METRICS:
+                    continue
+
+                total = totals.setdefault(name, {})
+                for key, value in values.items():
+                    total[key] = total.get(key, 0) + value
+
+        for name, values in totals.items():
+            metrics.metrics[name].values = values
+
+
+def _get_message(messages: Queue, timeout: float) -> tuple | None:
+    try:
+        return messages.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+
+def _get_message_nowait(messages: Queue) -> tuple | None:
+    try:
+        return messages.get_nowait()
+    except queue.Empty:
+        return None
+
+
+def _run_shard(
+    shard_id: int,
+    module: Callable,
+    accounts: list[AccountInfo],
+    accounts_per_shard: int,
+    next_index: Synchronized,
+    messages: Queue,
+    account_slots: Semaphore | None,
+    network_slots: dict[str, Semaphore]
+) -> None:
+    shared_slots.configure(account_slots, network_slots)
+
+    # a shard has a stale copy of the files, the last shard to exit would drop the changes of the others
+    for store in STORES.values():
+        atexit.unregister(store.save)
+
+    asyncio.run(_shard_main(shard_id, module, accounts, accounts_per_shard, next_index, messages))
+
+
+async def _shard_main(
+    shard_id: int,
+    module: Callable,
+    accounts: list[AccountInfo],
+    accounts_per_shard: int,
+    next_index: Synchronized,
+    messages: Queue,
+) -> None:
+    pid = os.getpid()
+    start_time = time.perf_counter()
+
+    def take_account() -> AccountInfo | None:
+        with next_index.get_lock():
+            index = next_index.value
+            if index >= len(accounts):
+                return None
+            next_index.value = index + 1
+
+        return accounts[index]
+
+    async def process_accounts() -> None:
+        while True:
+            async with shared_slots.account():
+                account = take_account()
+                if not account:
+                    return
+
+                messages.put(('started', pid, account.account_id))
+                try:
+                    is_result = await module(account)
+                except Exception as e:
+                    console_logger.error(f'Shard {shard_id}: {account.account_id} failed: {e}')
+                    is_result = False
+                finally:
+                    # the account is done, its clients are not needed anymore
+                    account.session = None
+
+                messages.put(('finished', pid, account.account_id, bool(is_result)))
+
+            # the slot is free while the task sleeps
+            if IS_SLEEP and is_result and next_index.value < len(accounts):
+                await delay(
+                    random.randint(SLEEP_BETWEEN_ACCS_FROM, SLEEP_BETWEEN_ACCS_TO),
+                    'before next account'
+                )
+
+    def send_snapshot() -> None:
+        messages.put(('snapshot', pid, metrics.snapshot(), rpc_stats.methods))
+        messages.put(('stores', pid, {name: store.take_changes() for name, store in STORES.items()}))
+
+    async def send_snapshots() -> None:
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            send_snapshot()
+
+    reporter = asyncio.create_task(send_snapshots())
+    try:
+        await asyncio.gather(*(process_accounts() for _ in range(accounts_per_shard)))
+    finally:
+        reporter.cancel()
+
+        send_snapshot()
+
+        if CustomLogger.EVENTS:
+            CustomLogger.EVENTS.flush()
+
+        if tracer.enabled:
+            root, ext = os.path.splitext(TRACE_FILE)
+            tracer.export(f'{root}.shard-{shard_id}{ext}')
+
+        messages.put(('done', pid))
+
+    console_logger.info(f'Shard {shard_id} finished in {round(time.perf_counter() - start_time, 2)} secs')
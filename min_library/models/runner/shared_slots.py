@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
+from multiprocessing.synchronize import Semaphore
+from typing import AsyncIterator
+
+
+# how often (secs) a task checks a busy semaphore of another process
+SLOT_POLL_INTERVAL = 0.05
+
+
+class SharedSlots:
+    """
+    Concurrency limits shared by all processes of a sharded run.
+
+    The semaphores are created by the parent process and given to every shard,
+    so the limits hold for the sum of accounts of all shards. Without
+    semaphores (a run in one process) the slots are not limited.
+
+    Attributes:
+        accounts (Semaphore | None): the accounts processed at the same time.
+        networks (dict[str, Semaphore]): the accounts processed at the same time by network name.
+
+    """
+
+    def __init__(
+        self,
+        accounts: Semaphore | None = None,
+        networks: dict[str, Semaphore] | None = None
+    ) -> None:
+        self.accounts = accounts
+        self.networks = networks or {}
+
+    def configure(
+        self,
+        accounts: Semaphore | None,
+        networks: dict[str, Semaphore] | None
+    ) -> None:
+        self.accounts = accounts
+        self.networks = networks or {}
+
+    @asynccontextmanager
+    async def account(self) -> AsyncIterator[None]:
+        async with self._hold(self.accounts):
+            yield
+
+    @asynccontextmanager
+    async def network(self, name: str) -> AsyncIterator[None]:
+        async with self._hold(self.networks.get(name.lower())):
+            yield
+
+    @staticmethod
+    @asynccontextmanager
+    async def _hold(semaphore: Semaphore | None) -> AsyncIterator[None]:
+        if not semaphore:
+            yield
+            return
+
+        # a blocking acquire would stop the event loop with all other accounts
+        while not semaphore.acquire(block=False):
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+shared_slots = SharedSlots()
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import random
+import socket
+import time
+from typing import Any, Callable
+
+import aiohttp
+
+from min_library.models.account.account_manager import AccountInfo
+from min_library.models.logger.logger import CustomLogger, console_logger
+from min_library.models.runner.coordinator import TOKEN_HEADER
+from min_library.models.runner.job_lease import JobLease, current_lease
+from min_library.utils.helpers import delay
+from user_data.settings.settings import (
+    IS_SLEEP,
+    SLEEP_BETWEEN_ACCS_FROM,
+    SLEEP_BETWEEN_ACCS_TO
+)
+
+
+# how long (secs) a slot waits when all jobs are leased by other workers
+LEASE_POLL_INTERVAL = 2
+# how many failed requests in a row stop the worker (the coordinator is gone)
+MAX_REQUEST_ERRORS = 5
+# how long (secs) a heartbeat may take, a failed one is not retried, the next one renews the leases
+HEARTBEAT_TIMEOUT = 5
+
+
+class CoordinatorWorker:
+    """
+    A worker that leases jobs of a Coordinator and runs them with the accounts of this machine.
+
+    The jobs name accounts by id, the keys never leave the machines, so every
+    worker must have the same private keys and account names as the
+    coordinator. Every slot runs one job at a time, leases are renewed by one
+    heartbeat for all jobs of the worker. A job whose lease is lost is stopped
+    before its next transaction, since the coordinator gives it to another
+    worker.
+
+    Attributes:
+        url (str): the coordinator URL, like http://10.0.0.1:8600.
+        accounts (dict[str, AccountInfo]): the accounts of this machine by id.
+        modules (dict[str, Callable]): the modules that jobs may run by name.
+        capacity (int): how many jobs are run at the same time.
+        token (str | None): the shared secret of the coordinator.
+        heartbeat_interval (float): how often (secs) the leases are renewed.
+        worker_id (str): the id of the worker in the coordinator.
+
+    """
+
+    def __init__(
+        self,
+        url: str,
+        accounts: list[AccountInfo],
+        modules: dict[str, Callable],
+        capacity: int = 1,
+        token: str | None = None,
+        heartbeat_interval: float = 15,
+        worker_id: str | None = None
+    ) -> None:
+        self.url = url.rstrip('/')
+        self.accounts = {str(account.account_id): account for account in accounts}
+        self.modules = modules
+        self.capacity = capacity
+        self.token = token
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.results = {'success': 0, 'fail': 0}
+        # how long (secs) a lease lives without a heartbeat, told by the coordinator
+        self.lease_ttl: float | None = None
+
+        self._leases: dict[str, JobLease] = {}
+        self._session: aiohttp.ClientSession | None = None
+
+    async def run(self) -> dict[str, int]:
+        """
+        Run jobs until the coordinator says the run is finished.
+
+        Returns:
+            dict[str, int]: the number of succeeded and failed jobs of this worker.
+
+        """
+        headers = {TOKEN_HEADER: self.token} if self.token else None
+
+        async with aiohttp.ClientSession(
+            headers=headers, timeout=aiohttp.ClientTimeout(total=30)
+        ) as self._session:
+            console_logger.info(
+                f'Worker {self.worker_id} is connected to {self.url} with {self.capacity} slots'
+            )
+
+            heartbeat_task = asyncio.create_task(self._send_heartbeats())
+            try:
+                await asyncio.gather(*(self._run_slot() for _ in range(self.capacity)))
+            finally:
+                heartbeat_task.cancel()
+
+        if CustomLogger.EVENTS:
+            CustomLogger.EVENTS.flush()
+
+        console_logger.info(
+            f'Worker {self.worker_id} is finished: {self.results["success"]} jobs succeeded, '
+            f'{self.results["fail"]} failed'
+        )
+
+        return self.results
+
+    async def _run_slot(self) -> None:
+        while True:
+            response = await self._request('/lease', {'worker_id': self.worker_id})
+            if response is None or response['is_finished']:
+                return
+
+            self.lease_ttl = response.get('lease_ttl') or self.lease_ttl
+            job = response['job']
+            if not job:
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+                continue
+
+            lease = self._leases[job['job_id']] = JobLease(job['job_id'])
+            try:
+                is_success, error = await self._run_job(job, lease)
+            finally:
+                self._leases.pop(job['job_id'], None)
+
+            # the job is run by another worker, its result is reported there
+            if lease.is_lost and not is_success:
+                continue
+
+            self.results['success' if is_success else 'fail'] += 1
+            await self._request('/complete', {
+                'worker_id': self.worker_id,
+                'job_id': job['job_id'],
+                'is_success': is_success,
+                'error': error,
+            })
+
+            if IS_SLEEP and is_success:
+                await delay(
+                    random.randint(SLEEP_BETWEEN_ACCS_FROM, SLEEP_BETWEEN_ACCS_TO),
+                    'before next account'
+                )
+
+    async def _run_job(self, job: dict[str, Any], lease: JobLease) -> tuple[bool, str | None]:
+        account = self.accounts.get(str(job['account_id']))
+        module = self.modules.get(job['module'])
+        if not account or not module:
+            error = f'unknown account {job["account_id"]}' if not account else f'unknown module {job["module"]}'
+            console_logger.error(f'Job {job["job_id"]} can not be run: {error}')
+            return False, error
+
+        # the slot runs in its own task, the lease is seen by this job only
+        token = current_lease.set(lease)
+        try:
+            return bool(await module(account)), None
+        except Exception as e:
+            console_logger.error(f'Job {job["job_id"]} failed: {e}')
+            return False, f'{e.__class__.__name__}: {e}'
+        finally:
+            current_lease.reset(token)
+            # the account is done, its clients are not needed anymore
+            account.session = None
+
+    async def _send_heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+
+            if self._leases:
+                await self._send_heartbeat()
+
+    async def _send_heartbeat(self) -> None:
+        job_ids = list(self._leases)
+        sent_at = time.monotonic()
+
+        try:
+            async with self._session.post(
+                f'{self.url}/heartbeat',
+                json={'worker_id': self.worker_id, 'job_ids': job_ids},
+                timeout=aiohttp.ClientTimeout(total=HEARTBEAT_TIMEOUT)
+            ) as response:
+                response.raise_for_status()
+                lost = (await response.json()).get('lost') or []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            console_logger.warning(f'Heartbeat of {len(job_ids)} jobs failed: {e!r}')
+
+            # the coordinator can't be asked, but the leases not renewed for lease_ttl are expired there
+            lost = [
+                job_id for job_id, lease in self._leases.items()
+                if self.lease_ttl and sent_at - lease.renewed_at > self.lease_ttl
+            ]
+        else:
+            for job_id in job_ids:
+                if job_id in self._leases:
+                    self._leases[job_id].renewed_at = sent_at
+
+        for job_id in lost:
+            lease = self._leases.get(job_id)
+            if lease and not lease.is_lost:
+                # the job can't be stopped safely in the middle of a transaction
+                lease.is_lost = True
+                console_logger.warning(
+                    f'Lease of job {job_id} is lost, the job stops before its next transaction'
+                )
+
+    async def _request(self, path: str, data: dict[str, Any]) -> dict[str, Any] | None:
+        for attempt in range(1, MAX_REQUEST_ERRORS + 1):
+            try:
+                async with self._session.post(f'{self.url}{path}', json=data) as response:
+                    response.raise_for_status()
+                    return await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                console_logger.warning(
+                    f'Coordinator request {path} failed ({attempt}/{MAX_REQUEST_ERRORS}): {e!r}'
+                )
+                await asyncio.sleep(attempt)
+
+        console_logger.error(f'Coordinator {self.url} is not available, the worker stops')
+        return None
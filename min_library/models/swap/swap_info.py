@@ -5,6 +5,11 @@ from min_library.models.networks.networks import Networks
 
 
 class SwapInfo:
+    __slots__ = (
+        'from_token', 'to_token', 'from_network', 'to_network', 'amount', 'slippage',
+        'amount_by_percent', 'gas_price', 'gas_limit', 'multiplier_of_gas'
+    )
+
     def __init__(
         self,
         from_token: str,
@@ -13,6 +13,7 @@ class SwapQuery:
         min_to_amount (TokenAmount | None): The minimum amount of the 'to' token.
 
     """
+    __slots__ = ('from_token', 'to_token', 'amount_from', 'min_to_amount')
 
     def __init__(
         self,
@@ -0,0 +1,285 @@
+import asyncio
+import time
+
+from eth_abi import abi
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+
+from min_library.models.contracts.abi_encoder import get_function_encoder
+from min_library.models.contracts.multicall import try_block_and_aggregate
+from min_library.models.logger.logger import console_logger
+from min_library.models.others.token_amount import BPS_DENOMINATOR
+from min_library.utils.helpers import to_checksum_address
+from user_data.settings.settings import (
+    RESERVES_CACHE_TTL,
+    V2_QUOTE_VERIFY_EVERY,
+    V2_QUOTE_VERIFY_TTL
+)
+
+
+V2_FACTORY_ABI = [
+    {
+        'inputs': [
+            {'internalType': 'address', 'name': 'tokenA', 'type': 'address'},
+            {'internalType': 'address', 'name': 'tokenB', 'type': 'address'}
+        ],
+        'name': 'getPair',
+        'outputs': [{'internalType': 'address', 'name': 'pair', 'type': 'address'}],
+        'stateMutability': 'view',
+        'type': 'function'
+    }
+]
+
+V2_PAIR_ABI = [
+    {
+        'inputs': [],
+        'name': 'getReserves',
+        'outputs': [
+            {'internalType': 'uint112', 'name': '_reserve0', 'type': 'uint112'},
+            {'internalType': 'uint112', 'name': '_reserve1', 'type': 'uint112'},
+            {'internalType': 'uint32', 'name': '_blockTimestampLast', 'type': 'uint32'}
+        ],
+        'stateMutability': 'view',
+        'type': 'function'
+    }
+]
+
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int = 30) -> int:
+    """
+    Get the output amount of a Uniswap V2 pair (UniswapV2Library.getAmountOut).
+
+    Args:
+        amount_in (int): the input amount in Wei.
+        reserve_in (int): the reserve of the input token.
+        reserve_out (int): the reserve of the output token.
+        fee_bps (int): the pair fee in basis points. (30)
+
+    Returns:
+        int: the output amount in Wei.
+
+    """
+    amount_in_with_fee = amount_in * (BPS_DENOMINATOR - fee_bps)
+
+    return amount_in_with_fee * reserve_out // (reserve_in * BPS_DENOMINATOR + amount_in_with_fee)
+
+
+def sort_tokens(token_a: str, token_b: str) -> tuple[str, str]:
+    return (token_a, token_b) if int(token_a, 16) < int(token_b, 16) else (token_b, token_a)
+
+
+class V2Quoter:
+    """
+    Local quotes of a Uniswap V2 style router from pair reserves cached for about a block.
+
+    Reserves of all registered paths are fetched with one Multicall3 call, so the
+    wallets of a batch share it instead of calling getAmountsOut each. The local
+    quote of a path is checked against getAmountsOut until they match, the
+    router is called while they don't (another fee, a changed block). A matched
+    path is checked again after verify_every quotes or verify_ttl secs and
+    after `invalidate`, so a fee-on-transfer token or a changed fee is found.
+
+    Attributes:
+        fee_bps (int): the pair fee in basis points.
+        reserves_ttl (float): how long (secs) the reserves are used.
+        verify_every (int): how many local quotes of a matched path are made without the router.
+        verify_ttl (float): how long (secs) a matched path is trusted.
+        block_number (int | None): the block of the cached reserves.
+
+    """
+
+    def __init__(
+        self,
+        fee_bps: int = 30,
+        reserves_ttl: float = RESERVES_CACHE_TTL,
+        verify_every: int = V2_QUOTE_VERIFY_EVERY,
+        verify_ttl: float = V2_QUOTE_VERIFY_TTL
+    ) -> None:
+        self.fee_bps = fee_bps
+        self.reserves_ttl = reserves_ttl
+        self.verify_every = verify_every
+        self.verify_ttl = verify_ttl
+        self.block_number: int | None = None
+
+        self._paths: set[tuple[str, ...]] = set()
+        self._factory: str | None = None
+        # sorted token pair -> pair address (None if the pair does not exist)
+        self._pairs: dict[tuple[str, str], str | None] = {}
+        self._reserves: dict[str, tuple[int, int]] = {}
+        self._updated_at = 0.0
+        self._update: asyncio.Task | None = None
+        # path -> (when it matched the router, local quotes left before the router is asked again)
+        self._verified_paths: dict[tuple[str, ...], tuple[float, int]] = {}
+
+    def add_paths(self, paths: list[list[str]]) -> None:
+        """
+        Register swap paths, the reserves of their pairs are fetched together.
+
+        Args:
+            paths (list[list[str]]): the token addresses of every path.
+
+        """
+        for path in paths:
+            self._paths.add(tuple(to_checksum_address(address) for address in path))
+
+    async def get_amounts_out(
+        self,
+        router_contract: AsyncContract,
+        amount_in: int,
+        path: list[str]
+    ) -> list[int]:
+        """
+        Get amounts out like router getAmountsOut, locally if the reserves are known.
+
+        Args:
+            router_contract (AsyncContract): the router.
+            amount_in (int): the input amount in Wei.
+            path (list[str]): the token addresses.
+
+        Returns:
+            list[int]: the amounts of every token of the path.
+
+        """
+        path = tuple(to_checksum_address(address) for address in path)
+        self._paths.add(path)
+
+        amounts = None
+        try:
+            await self.update_reserves(router_contract)
+            amounts = self.quote(amount_in, path)
+        except Exception as e:
+            console_logger.warning(f'Can not quote locally, the router is used: {e}')
+
+        if amounts and self._take_verified_quote(path):
+            return amounts
+
+        router_amounts = await router_contract.functions.getAmountsOut(amount_in, list(path)).call()
+
+        if amounts == list(router_amounts):
+            self._verified_paths[path] = (time.monotonic(), self.verify_every)
+        else:
+            self._verified_paths.pop(path, None)
+
+        return router_amounts
+
+    def invalidate(self, path: list[str]) -> None:
+        """
+        Check the local quotes of the path against the router again, for example, after a swap reverted.
+
+        Args:
+            path (list[str]): the token addresses.
+
+        """
+        self._verified_paths.pop(tuple(to_checksum_address(address) for address in path), None)
+
+    def quote(self, amount_in: int, path: tuple[str, ...]) -> list[int] | None:
+        """
+        Get amounts out from the cached reserves.
+
+        Returns:
+            list[int] | None: the amounts or None if a pair of the path has no reserves.
+
+        """
+        amounts = [amount_in]
+
+        for token_in, token_out in zip(path, path[1:]):
+            pair = self._pairs.get(sort_tokens(token_in, token_out))
+            reserves = self._reserves.get(pair) if pair else None
+            if not reserves or not all(reserves):
+                return None
+
+            reserve_in, reserve_out = (
+                reserves if sort_tokens(token_in, token_out)[0] == token_in else reserves[::-1]
+            )
+            amounts.append(get_amount_out(amounts[-1], reserve_in, reserve_out, self.fee_bps))
+
+        return amounts
+
+    async def update_reserves(self, router_contract: AsyncContract) -> None:
+        """
+        Fetch the reserves of all paths if the cached ones are older than reserves_ttl.
+
+        Concurrent callers wait for the same update.
+
+        Args:
+            router_contract (AsyncContract): the router.
+
+        """
+        if time.monotonic() - self._updated_at < self.reserves_ttl:
+            return
+
+        loop = asyncio.get_running_loop()
+        if not self._update or self._update.done() or self._update.get_loop() is not loop:
+            self._update = loop.create_task(self._update_reserves(router_contract))
+
+        await asyncio.shield(self._update)
+
+    async def _update_reserves(self, router_contract: AsyncContract) -> None:
+        try:
+            await self._fetch_reserves(router_contract)
+        except Exception:
+            # don't use old reserves and don't retry on every quote
+            self._reserves.clear()
+            raise
+        finally:
+            self._updated_at = time.monotonic()
+
+    async def _fetch_reserves(self, router_contract: AsyncContract) -> None:
+        w3 = router_contract.w3
+
+        if not self._factory:
+            self._factory = await router_contract.functions.factory().call()
+
+        pairs = {
+            sort_tokens(token_in, token_out)
+            for path in self._paths
+            for token_in, token_out in zip(path, path[1:])
+        }
+        await self._update_pairs(w3, [pair for pair in pairs if pair not in self._pairs])
+
+        pair_addresses = sorted({self._pairs[pair] for pair in pairs if self._pairs[pair]})
+        if not pair_addresses:
+            return
+
+        get_reserves = get_function_encoder(V2_PAIR_ABI, 'getReserves', 0)
+        block_number, results = await try_block_and_aggregate(
+            w3, [(address, get_reserves.encode()) for address in pair_addresses]
+        )
+
+        for address, (success, return_data) in zip(pair_addresses, results):
+            if success and return_data:
+                reserve_0, reserve_1, _ = abi.decode(['uint112', 'uint112', 'uint32'], return_data)
+                self._reserves[address] = (reserve_0, reserve_1)
+            else:
+                self._reserves.pop(address, None)
+
+        self.block_number = block_number
+
+    async def _update_pairs(self, w3: AsyncWeb3, pairs: list[tuple[str, str]]) -> None:
+        if not pairs:
+            return
+
+        get_pair = get_function_encoder(V2_FACTORY_ABI, 'getPair', 2)
+        _, results = await try_block_and_aggregate(
+            w3, [(self._factory, get_pair.encode(pair)) for pair in pairs]
+        )
+
+        for pair, (success, return_data) in zip(pairs, results):
+            address = abi.decode(['address'], return_data)[0] if success and return_data else None
+            self._pairs[pair] = (
+                to_checksum_address(address) if address and address != ZERO_ADDRESS else None
+            )
+
+    def _take_verified_quote(self, path: tuple[str, ...]) -> bool:
+        if path not in self._verified_paths:
+            return False
+
+        verified_at, quotes_left = self._verified_paths[path]
+        if quotes_left <= 0 or time.monotonic() - verified_at > self.verify_ttl:
+            del self._verified_paths[path]
+            return False
+
+        self._verified_paths[path] = (verified_at, quotes_left - 1)
+        return True
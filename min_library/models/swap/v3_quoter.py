@@ -0,0 +1,283 @@
+import asyncio
+import time
+from decimal import Decimal, localcontext
+from functools import lru_cache
+
+from eth_abi import abi
+from eth_utils import keccak
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+
+from min_library.models.contracts.abi_encoder import get_function_encoder
+from min_library.models.contracts.multicall import try_block_and_aggregate
+from min_library.utils.helpers import to_checksum_address
+from user_data.settings.settings import RESERVES_CACHE_TTL
+
+
+V3_POOL_ABI = [
+    {
+        'inputs': [],
+        'name': 'slot0',
+        'outputs': [
+            {'internalType': 'uint160', 'name': 'sqrtPriceX96', 'type': 'uint160'},
+            {'internalType': 'int24', 'name': 'tick', 'type': 'int24'},
+            {'internalType': 'uint16', 'name': 'observationIndex', 'type': 'uint16'},
+            {'internalType': 'uint16', 'name': 'observationCardinality', 'type': 'uint16'},
+            {'internalType': 'uint16', 'name': 'observationCardinalityNext', 'type': 'uint16'},
+            {'internalType': 'uint32', 'name': 'feeProtocol', 'type': 'uint32'},
+            {'internalType': 'bool', 'name': 'unlocked', 'type': 'bool'}
+        ],
+        'stateMutability': 'view',
+        'type': 'function'
+    },
+    {
+        'inputs': [],
+        'name': 'liquidity',
+        'outputs': [{'internalType': 'uint128', 'name': '', 'type': 'uint128'}],
+        'stateMutability': 'view',
+        'type': 'function'
+    }
+]
+
+Q96 = 2 ** 96
+FEE_DENOMINATOR = 10 ** 6
+
+
+def sort_tokens(token_a: str, token_b: str) -> tuple[str, str]:
+    return (token_a, token_b) if int(token_a, 16) < int(token_b, 16) else (token_b, token_a)
+
+
+@lru_cache(maxsize=1024)
+def compute_pool_address(
+    deployer: str,
+    init_code_hash: str,
+    token_a: str,
+    token_b: str,
+    fee: int
+) -> str:
+    """
+    Get the address of a Uniswap V3 style pool with CREATE2, without calling the factory.
+
+    Args:
+        deployer (str): the pool deployer (the factory in Uniswap).
+        init_code_hash (str): the hash of the pool init code.
+        token_a (str): the address of one token.
+        token_b (str): the address of another token.
+        fee (int): the fee tier in hundredths of a bip (500 = 0.05%).
+
+    Returns:
+        str: the pool address.
+
+    """
+    token_0, token_1 = sort_tokens(token_a, token_b)
+    salt = keccak(abi.encode(['address', 'address', 'uint24'], [token_0, token_1, fee]))
+
+    return to_checksum_address(
+        keccak(b'\xff' + bytes.fromhex(deployer[2:]) + salt + bytes.fromhex(init_code_hash[2:]))[12:]
+    )
+
+
+@lru_cache(maxsize=4096)
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    with localcontext() as context:
+        context.prec = 60
+        return int((Decimal('1.0001') ** tick).sqrt() * Q96)
+
+
+class PoolState:
+    """
+    The slot0 and liquidity of a pool.
+
+    Attributes:
+        address (str): the pool address.
+        fee (int): the fee tier.
+        sqrt_price_x96 (int): the current sqrt price.
+        tick (int): the current tick.
+        liquidity (int): the liquidity in range.
+
+    """
+    __slots__ = ('address', 'fee', 'sqrt_price_x96', 'tick', 'liquidity')
+
+    def __init__(self, address: str, fee: int, sqrt_price_x96: int, tick: int, liquidity: int) -> None:
+        self.address = address
+        self.fee = fee
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.liquidity = liquidity
+
+
+class V3Quoter:
+    """
+    Pools of a Uniswap V3 style DEX derived with CREATE2 and quoted locally inside the current tick.
+
+    The slot0 and liquidity of all fee tiers of a token pair are fetched with one
+    Multicall3 call and reused for about a block by all wallets. A swap that
+    stays between the initialized ticks around the price is quoted locally, a
+    swap that may cross a tick is quoted by the on-chain quoter.
+
+    Attributes:
+        deployer (str): the pool deployer.
+        init_code_hash (str): the hash of the pool init code.
+        tick_spacings (dict[int, int]): the tick spacing of every fee tier.
+        state_ttl (float): how long (secs) the pool states are used.
+
+    """
+
+    def __init__(
+        self,
+        deployer: str,
+        init_code_hash: str,
+        tick_spacings: dict[int, int],
+        state_ttl: float = RESERVES_CACHE_TTL
+    ) -> None:
+        self.deployer = deployer
+        self.init_code_hash = init_code_hash
+        self.tick_spacings = tick_spacings
+        self.state_ttl = state_ttl
+
+        # (chain id, sorted token pair) -> (update time, the most liquid pool or None)
+        self._pools: dict[tuple[int, tuple[str, str]], tuple[float, PoolState | None]] = {}
+        self._updates: dict[tuple[int, tuple[str, str]], asyncio.Task] = {}
+
+    def get_pool_address(self, token_a: str, token_b: str, fee: int) -> str:
+        return compute_pool_address(self.deployer, self.init_code_hash, token_a, token_b, fee)
+
+    async def get_pool(self, w3: AsyncWeb3, chain_id: int, token_a: str, token_b: str) -> PoolState | None:
+        """
+        Get the state of the pool of the pair with the most liquidity among all fee tiers.
+
+        Args:
+            w3 (AsyncWeb3): the web3 of the network.
+            chain_id (int): the chain ID of the network, the same pair has other pools on other chains.
+            token_a (str): the address of one token.
+            token_b (str): the address of another token.
+
+        Returns:
+            PoolState | None: the pool or None if the pair has no pools.
+
+        """
+        key = (chain_id, sort_tokens(to_checksum_address(token_a), to_checksum_address(token_b)))
+
+        cached = self._pools.get(key)
+        if cached and time.monotonic() - cached[0] < self.state_ttl:
+            return cached[1]
+
+        loop = asyncio.get_running_loop()
+        update = self._updates.get(key)
+        if not update or update.done() or update.get_loop() is not loop:
+            update = self._updates[key] = loop.create_task(self._update_pool(w3, key))
+
+        await asyncio.shield(update)
+
+        return self._pools[key][1]
+
+    async def quote_exact_input_single(
+        self,
+        quoter_contract: AsyncContract,
+        token_in: str,
+        token_out: str,
+        amount_in: int,
+        pool: PoolState
+    ) -> int:
+        """
+        Get the output amount of a swap in the pool, locally if the swap stays inside the tick.
+
+        Args:
+            quoter_contract (AsyncContract): the on-chain quoter.
+            token_in (str): the input token.
+            token_out (str): the output token.
+            amount_in (int): the input amount in Wei.
+            pool (PoolState): the pool.
+
+        Returns:
+            int: the output amount in Wei.
+
+        """
+        amount_out = self.quote_in_tick(pool, token_in, token_out, amount_in)
+        if amount_out is not None:
+            return amount_out
+
+        quoter_data = await quoter_contract.functions.quoteExactInputSingle((
+            token_in,
+            token_out,
+            amount_in,
+            pool.fee,
+            0
+        )).call()
+
+        return quoter_data[0]
+
+    def quote_in_tick(
+        self,
+        pool: PoolState,
+        token_in: str,
+        token_out: str,
+        amount_in: int
+    ) -> int | None:
+        """
+        Get the output amount with the math of one swap step (SqrtPriceMath of Uniswap V3).
+
+        Returns:
+            int | None: the output amount or None if the swap may cross an initialized tick.
+
+        """
+        liquidity = pool.liquidity
+        sqrt_price = pool.sqrt_price_x96
+        if not liquidity or not sqrt_price:
+            return None
+
+        # initialized ticks are multiples of the spacing, the price between them
+        # moves on the constant liquidity
+        tick_spacing = self.tick_spacings[pool.fee]
+        tick_lower = pool.tick // tick_spacing * tick_spacing
+        amount = amount_in * (FEE_DENOMINATOR - pool.fee) // FEE_DENOMINATOR
+
+        if sort_tokens(token_in, token_out)[0] == to_checksum_address(token_in):
+            numerator = liquidity << 96
+            next_sqrt_price = -(-numerator * sqrt_price // (numerator + amount * sqrt_price))
+            if next_sqrt_price <= get_sqrt_ratio_at_tick(tick_lower):
+                return None
+
+            return liquidity * (sqrt_price - next_sqrt_price) >> 96
+
+        next_sqrt_price = sqrt_price + (amount << 96) // liquidity
+        if next_sqrt_price >= get_sqrt_ratio_at_tick(tick_lower + tick_spacing):
+            return None
+
+        return (liquidity << 96) * (next_sqrt_price - sqrt_price) // next_sqrt_price // sqrt_price
+
+    async def _update_pool(self, w3: AsyncWeb3, key: tuple[int, tuple[str, str]]) -> None:
+        pool = await self._fetch_pool(w3, key[1])
+        self._pools[key] = (time.monotonic(), pool)
+
+    async def _fetch_pool(self, w3: AsyncWeb3, pair: tuple[str, str]) -> PoolState | None:
+        slot0 = get_function_encoder(V3_POOL_ABI, 'slot0', 0).encode()
+        liquidity = get_function_encoder(V3_POOL_ABI, 'liquidity', 0).encode()
+
+        addresses = {fee: self.get_pool_address(*pair, fee) for fee in self.tick_spacings}
+        calls = []
+        for address in addresses.values():
+            calls += [(address, slot0), (address, liquidity)]
+
+        _, results = await try_block_and_aggregate(w3, calls)
+
+        pools = []
+        for index, (fee, address) in enumerate(addresses.items()):
+            (slot0_success, slot0_data), (liquidity_success, liquidity_data) = results[2 * index:2 * index + 2]
+            # there is no code at the address if the pool is not created
+            if not (slot0_success and slot0_data and liquidity_success and liquidity_data):
+                continue
+
+            sqrt_price_x96, tick, *_ = abi.decode(
+                ['uint160', 'int24', 'uint16', 'uint16', 'uint16', 'uint32', 'bool'], slot0_data
+            )
+            if sqrt_price_x96:
+                pools.append(PoolState(
+                    address=address,
+                    fee=fee,
+                    sqrt_price_x96=sqrt_price_x96,
+                    tick=tick,
+                    liquidity=abi.decode(['uint128'], liquidity_data)[0]
+                ))
+
+        return max(pools, key=lambda pool: pool.liquidity, default=None)
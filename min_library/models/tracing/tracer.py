@@ -0,0 +1,225 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable
+
+from user_data.settings.settings import IS_TRACING, TRACE_MAX_EVENTS
+
+
+_track: ContextVar[str] = ContextVar('trace_track', default='main')
+
+
+class _NoopSpan:
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def set(self, **args) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    A timed block of work, recorded as a Chrome trace "complete" event on exit.
+    """
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type:
+            self.args['error'] = exc_type.__name__
+
+        self.tracer.add_event(
+            self.name, self.category, self.start, time.perf_counter_ns(), self.args
+        )
+
+    def set(self, **args) -> None:
+        self.args.update(args)
+
+
+class Tracer:
+    """
+    Collect spans of the run per track (an account) and export them as Chrome
+    trace-event JSON, which can be opened in chrome://tracing or ui.perfetto.dev.
+
+    Attributes:
+        enabled (bool): whether spans are recorded.
+        max_events (int): the maximum number of kept events, the rest are dropped.
+
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = 1_000_000) -> None:
+        self.enabled = enabled
+        self.max_events = max_events
+        self.events: list[dict[str, Any]] = []
+        self.dropped = 0
+
+        self._origin = time.perf_counter_ns()
+        self._track_ids: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def set_track(track: str | int) -> None:
+        """
+        Put all following spans of the current task (and the tasks it creates) on the track.
+
+        Args:
+            track (str | int): the track name, usually the account id.
+
+        """
+        _track.set(str(track))
+
+    def span(self, name: str, category: str = 'function', **args) -> Span | _NoopSpan:
+        """
+        Create a span to be used as a context manager.
+
+        Args:
+            name (str): the span name.
+            category (str): the category: module, stage, rpc, sleep, ... ('function')
+            **args: the values to show in the span details.
+
+        Returns:
+            Span: the span.
+
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+
+        return Span(self, name, category, args)
+
+    def add_event(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int,
+        args: dict | None = None
+    ) -> None:
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+
+        track = _track.get()
+        with self._lock:
+            track_id = self._track_ids.setdefault(track, len(self._track_ids) + 1)
+
+            self.events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start_ns - self._origin) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': 1,
+                'tid': track_id,
+                'args': args or {}
+            })
+
+    def export(self, path: str) -> None:
+        """
+        Write all recorded spans to the file in the Chrome trace-event format.
+
+        Args:
+            path (str): the path of the JSON file.
+
+        """
+        metadata = [
+            {
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': 1,
+                'tid': track_id,
+                'args': {'name': f'account {track}' if track != 'main' else 'main'}
+            }
+            for track, track_id in self._track_ids.items()
+        ]
+
+        Path(os.path.dirname(path) or '.').mkdir(parents=True, exist_ok=True)
+
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'traceEvents': metadata + self.events,
+                    'displayTimeUnit': 'ms',
+                    'otherData': {'dropped_events': self.dropped}
+                },
+                file,
+                default=str
+            )
+
+
+def traced(name: str | None = None, category: str = 'stage') -> Callable:
+    """
+    Wrap an async function into a span.
+
+    Args:
+        name (str | None): the span name. (the function name with the class
+            name of the instance for methods, like Stargate.approve_interface)
+        category (str): the span category. ('stage')
+
+    Returns:
+        Callable: the decorator.
+
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+
+            span_name = name
+            if not span_name:
+                is_method = args and '.' in func.__qualname__
+                span_name = (
+                    f'{args[0].__class__.__name__}.{func.__name__}'
+                    if is_method else func.__qualname__
+                )
+
+            with tracer.span(span_name, category):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def build_tracing_middleware(network_name: str) -> Callable:
+    """
+    Build an async web3 middleware that records every JSON-RPC request as a span.
+
+    Args:
+        network_name (str): the network name.
+
+    Returns:
+        Callable: the middleware.
+
+    """
+    async def tracing_middleware(make_request: Callable, w3: Any) -> Callable:
+        async def middleware(method: str, params: Any) -> Any:
+            with tracer.span(method, 'rpc', network=network_name):
+                return await make_request(method, params)
+
+        return middleware
+
+    return tracing_middleware
+
+
+tracer = Tracer(enabled=IS_TRACING, max_events=TRACE_MAX_EVENTS)
@@ -0,0 +1,191 @@
+import atexit
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+from min_library.models.logger.logger import console_logger
+from user_data.settings.settings import (
+    GAS_MODEL_FILE,
+    GAS_MODEL_HEADROOM,
+    GAS_MODEL_MAX_SAMPLES,
+    GAS_MODEL_MIN_SAMPLES,
+    GAS_MODEL_PERCENTILE,
+    IS_GAS_MODEL
+)
+
+
+class GasModel:
+    """
+    Gas limits learned from the gasUsed of receipts by (chain id, to address, selector).
+
+    A call shape with enough samples gets the percentile of its gasUsed plus the
+    headroom as the gas limit without eth_estimateGas, unseen shapes are estimated.
+    Note that eth_estimateGas also fails on a transaction that would revert, a
+    transaction with a learned gas limit is sent and reverts on chain instead.
+
+    Attributes:
+        path (str | None): the JSON file with the samples.
+        min_samples (int): how many samples are needed to skip the estimation.
+        percentile (float): the percentile of gasUsed.
+        headroom (float): the share added to the percentile.
+        max_samples (int): how many latest samples are kept by call shape.
+        is_enabled (bool): if False, the gas limits are never given.
+
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        min_samples: int = 5,
+        percentile: float = 95,
+        headroom: float = 0.2,
+        max_samples: int = 200,
+        is_enabled: bool = True
+    ) -> None:
+        self.path = path
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.headroom = headroom
+        self.max_samples = max_samples
+        self.is_enabled = is_enabled
+
+        self._samples: dict[str, deque[int]] | None = None
+        self._limits: dict[str, int] = {}
+        self._is_changed = False
+        # the samples added since take_changes
+        self._new_samples: dict[str, list[int]] = {}
+
+        atexit.register(self.save)
+
+    @staticmethod
+    def get_key(chain_id: int, to: str | None, data: str | bytes | None) -> str:
+        if isinstance(data, bytes):
+            data = '0x' + data.hex()
+
+        selector = data[:10].lower() if data and len(data) >= 10 else '0x'
+
+        return f'{chain_id}:{(to or "").lower()}:{selector}'
+
+    def get_gas_limit(self, tx_params: dict) -> int | None:
+        """
+        Get the learned gas limit of the transaction.
+
+        Args:
+            tx_params (dict): the transaction parameters with chainId, to and data.
+
+        Returns:
+            int | None: the gas limit or None if the call shape has too few samples.
+
+        """
+        if not self.is_enabled:
+            return None
+
+        key = self.get_key(tx_params.get('chainId'), tx_params.get('to'), tx_params.get('data'))
+
+        if key not in self._limits:
+            samples = self._get_samples().get(key)
+            if not samples or len(samples) < self.min_samples:
+                return None
+
+            self._limits[key] = int(self._get_percentile(samples) * (1 + self.headroom))
+
+        return self._limits[key]
+
+    def observe(self, tx_params: dict | None, receipt: dict | None) -> None:
+        """
+        Add gasUsed of a successful transaction to the samples of its call shape.
+
+        Args:
+            tx_params (dict | None): the transaction parameters.
+            receipt (dict | None): the receipt.
+
+        """
+        # a reverted transaction may use all the gas or stop early
+        if not tx_params or not receipt or not receipt.get('status') or not receipt.get('gasUsed'):
+            return
+
+        key = self.get_key(tx_params.get('chainId'), tx_params.get('to'), tx_params.get('data'))
+        samples = self._get_samples().setdefault(key, deque(maxlen=self.max_samples))
+
+        samples.append(int(receipt['gasUsed']))
+        self._new_samples.setdefault(key, []).append(int(receipt['gasUsed']))
+        self._limits.pop(key, None)
+        self._is_changed = True
+
+    def take_changes(self) -> dict[str, list[int]]:
+        """
+        Get the samples added since the last call.
+
+        Returns:
+            dict[str, list[int]]: the samples by call shape.
+
+        """
+        changes, self._new_samples = self._new_samples, {}
+
+        return changes
+
+    def merge(self, changes: dict[str, list[int]]) -> None:
+        """
+        Add the samples of another process.
+
+        Args:
+            changes (dict[str, list[int]]): the result of `take_changes` of the process.
+
+        """
+        all_samples = self._get_samples()
+
+        for key, values in changes.items():
+            all_samples.setdefault(key, deque(maxlen=self.max_samples)).extend(values)
+            self._limits.pop(key, None)
+
+        self._is_changed = self._is_changed or bool(changes)
+
+    def save(self) -> None:
+        if not self._is_changed or not self.path:
+            return
+
+        Path(os.path.dirname(self.path) or '.').mkdir(parents=True, exist_ok=True)
+
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({key: list(samples) for key, samples in self._samples.items()}, file)
+        os.replace(temp_path, self.path)
+
+        self._is_changed = False
+
+    def _get_percentile(self, samples: deque[int]) -> int:
+        values = sorted(samples)
+        index = min(int(round(self.percentile / 100 * (len(values) - 1))), len(values) - 1)
+
+        return values[index]
+
+    def _get_samples(self) -> dict[str, deque[int]]:
+        if self._samples is not None:
+            return self._samples
+
+        self._samples = {}
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    rows = json.load(file)
+            except (OSError, ValueError) as e:
+                console_logger.warning(f'Can not load gas samples from {self.path}: {e}')
+                rows = {}
+
+            self._samples = {
+                key: deque(values, maxlen=self.max_samples)
+                for key, values in rows.items()
+            }
+
+        return self._samples
+
+
+gas_model = GasModel(
+    path=GAS_MODEL_FILE,
+    min_samples=GAS_MODEL_MIN_SAMPLES,
+    percentile=GAS_MODEL_PERCENTILE,
+    headroom=GAS_MODEL_HEADROOM,
+    max_samples=GAS_MODEL_MAX_SAMPLES,
+    is_enabled=IS_GAS_MODEL
+)
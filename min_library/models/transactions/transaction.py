@@ -1,14 +1,25 @@
+import asyncio
+
 from web3 import Web3
 from web3.types import (
     TxParams
 )
+from web3.exceptions import TransactionNotFound
 from eth_typing import ChecksumAddress
+from hexbytes import HexBytes
 from eth_account.datastructures import (
     SignedTransaction
 )
 
 from min_library.models.account.account_manager import AccountManager
+from min_library.models.metrics.metrics import observe_tx_sent
 from min_library.models.others.token_amount import TokenAmount
+from min_library.models.retry.retry_policy import (
+    ErrorClass, classify_error, get_endpoint_key, retry_policy
+)
+from min_library.models.runner.job_lease import check_lease
+from user_data.settings.settings import UNDERPRICED_GAS_BUMP
+from .gas_model import gas_model
 from .tx import Tx
 
 
@@ -174,8 +185,14 @@ class Transaction:
         multiplier_of_gas = tx_params.pop('multiplier', 1)
 
         if not tx_params.get('gas') or not int(tx_params['gas']):
-            gas = await self.get_estimate_gas(tx_params=tx_params)
-            tx_params['gas'] = int(gas.Wei * multiplier_of_gas)
+            # the learned limit already has the headroom of the gas model
+            gas_limit = gas_model.get_gas_limit(tx_params)
+
+            if gas_limit:
+                tx_params['gas'] = gas_limit
+            else:
+                gas = await self.get_estimate_gas(tx_params=tx_params)
+                tx_params['gas'] = int(gas.Wei * multiplier_of_gas)
 
         return tx_params
 
@@ -203,6 +220,11 @@ class Transaction:
         Sign and send a transaction. Additionally, add 'chainId', 'nonce', 'from', 'gasPrice' or
             'maxFeePerGas' + 'maxPriorityFeePerGas' and 'gas' parameters to transaction parameters if they are missing.
 
+        Failed sends are retried by the retry policy. Before the transaction is
+        signed again with a new nonce or gas price, the node is asked for the
+        versions sent before, and nothing is signed again after a send without
+        an answer, so one call never sends two transactions.
+
         Args:
             tx_params (TxParams): parameters of the transaction.
 
@@ -212,6 +234,92 @@ class Transaction:
         """
         tx_params = await self.auto_add_params(tx_params)
         signed_tx = await self.sign_transaction(tx_params)
-        tx_hash = await self.account_manager.w3.eth.send_raw_transaction(transaction=signed_tx.rawTransaction)
+        w3 = self.account_manager.w3
+        endpoint = get_endpoint_key(self.account_manager.network.name, w3.provider.endpoint_uri)
+        # every signed version of the transaction, any of them may be in the mempool
+        signed_txs = {signed_tx.hash: dict(tx_params)}
+        # an attempt failed without an answer of the node, it may have been accepted
+        is_ambiguous = False
+        attempt = 0
+
+        # a job of a worker that lost its lease is run by another worker now
+        check_lease()
+
+        while True:
+            attempt += 1
+            try:
+                tx_hash = await w3.eth.send_raw_transaction(transaction=signed_tx.rawTransaction)
+                break
+            except Exception as e:
+                error_class = classify_error(e)
+
+                # the node has the transaction already, a previous attempt reached it
+                if error_class == ErrorClass.KNOWN:
+                    tx_hash = signed_tx.hash
+                    break
+
+                if error_class in (ErrorClass.NONCE, ErrorClass.UNDERPRICED):
+                    # the nonce may be taken by our own transaction, a new signature would send it twice
+                    sent_tx = await self._find_sent_tx(signed_txs)
+                    if sent_tx:
+                        tx_hash, tx_params = sent_tx
+                        break
+
+                    # the transaction is not found, but it is not proved that it was never accepted
+                    if sent_tx is None or is_ambiguous:
+                        raise
+
+                elif error_class == ErrorClass.TRANSIENT:
+                    is_ambiguous = True
+
+                retry_delay = retry_policy.get_retry_delay(error_class, attempt, endpoint)
+                if retry_delay is None:
+                    raise
+
+                await asyncio.sleep(retry_delay)
+
+                if error_class == ErrorClass.NONCE:
+                    tx_params['nonce'] = await w3.eth.get_transaction_count(tx_params['from'], 'pending')
+                    signed_tx = await self.sign_transaction(tx_params)
+                elif error_class == ErrorClass.UNDERPRICED:
+                    self._bump_gas_price(tx_params)
+                    signed_tx = await self.sign_transaction(tx_params)
+
+                signed_txs[signed_tx.hash] = dict(tx_params)
+
+        observe_tx_sent(self.account_manager.network.name, tx_hash)
+
+        return Tx(tx_hash=tx_hash, params=tx_params, network=self.account_manager.network)
 
-        return Tx(tx_hash=tx_hash, params=tx_params)
+    async def _find_sent_tx(
+        self,
+        signed_txs: dict[HexBytes, TxParams]
+    ) -> tuple[HexBytes, TxParams] | bool | None:
+        """
+        Find a signed version of the transaction that the node knows.
+
+        Args:
+            signed_txs (dict[HexBytes, TxParams]): the parameters by the hash of every signed version.
+
+        Returns:
+            tuple[HexBytes, TxParams] | bool | None: the hash and the parameters of the found version,
+                False if no version is known, None if the node could not be asked.
+
+        """
+        for tx_hash, tx_params in signed_txs.items():
+            try:
+                await self.account_manager.w3.eth.get_transaction(tx_hash)
+            except TransactionNotFound:
+                continue
+            except Exception:
+                return None
+
+            return tx_hash, tx_params
+
+        return False
+
+    @staticmethod
+    def _bump_gas_price(tx_params: TxParams) -> None:
+        for key in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas'):
+            if tx_params.get(key):
+                tx_params[key] = int(tx_params[key] * (1 + UNDERPRICED_GAS_BUMP))
@@ -8,7 +8,11 @@ from web3.types import (
 )
 
 from min_library.models.account.account_manager import AccountManager
+from min_library.models.contracts.allowance_ledger import allowance_ledger
+from min_library.models.metrics.metrics import observe_tx_receipt
+from min_library.models.networks.network import Network
 from min_library.models.others.common import AutoRepr
+from min_library.models.transactions.gas_model import gas_model
 
 import min_library.models.others.exceptions as exceptions
 
@@ -23,18 +27,25 @@ class Tx(AutoRepr):
         receipt (Optional[TxReceipt]): a transaction receipt.
         function_identifier (Optional[str]): a function identifier.
         input_data (Optional[Dict[str, Any]]): an input data.
+        network (Optional[Network]): the network the transaction was sent to.
 
     """
+    __slots__ = (
+        'hash', 'params', 'receipt', 'function_identifier', 'input_data', 'network'
+    )
+
     hash: _Hash32 | None
     params: dict | None
     receipt: TxReceipt | None
     function_identifier: str | None
     input_data: dict[str, Any] | None
+    network: Network | None
 
     def __init__(
         self,
         tx_hash: str | _Hash32 | None = None,
-        params: dict | None = None
+        params: dict | None = None,
+        network: Network | None = None
     ) -> None:
         """
         Initialize the class.
@@ -42,6 +53,7 @@ class Tx(AutoRepr):
         Args:
             tx_hash (Optional[Union[str, _Hash32]]): the transaction hash. (None)
             params (Optional[dict]): a dictionary with transaction parameters. (None)
+            network (Optional[Network]): the network the transaction was sent to. (None)
 
         """
         if not tx_hash and not params:
@@ -56,6 +68,7 @@ class Tx(AutoRepr):
         self.receipt = None
         self.function_identifier = None
         self.input_data = None
+        self.network = network
 
     async def parse_params(self, account_manager: AccountManager) -> dict[str, Any]:
         """
@@ -100,9 +113,25 @@ class Tx(AutoRepr):
             Dict[str, Any]: the transaction receipt.
 
         """
-        self.receipt = dict(await web3.eth.wait_for_transaction_receipt(
-            transaction_hash=self.hash, timeout=timeout, poll_latency=poll_latency
-        ))
+        try:
+            self.receipt = dict(await web3.eth.wait_for_transaction_receipt(
+                transaction_hash=self.hash, timeout=timeout, poll_latency=poll_latency
+            ))
+        finally:
+            gas_model.observe(self.params, self.receipt)
+            allowance_ledger.observe(
+                chain_id=(self.params or {}).get('chainId'),
+                tx_params=self.params,
+                receipt=self.receipt
+            )
+
+            if self.network:
+                observe_tx_receipt(
+                    network=self.network.name,
+                    tx_hash=self.hash,
+                    receipt=self.receipt,
+                    decimals=self.network.decimals or 18
+                )
 
         return self.receipt
 
@@ -7,6 +7,7 @@ class TxArgs(AutoRepr):
     """
     An instance for named transaction arguments.
     """
+    __slots__ = ('_names', '_values')
 
     def __init__(self, **kwargs) -> None:
         """
@@ -16,7 +17,33 @@ class TxArgs(AutoRepr):
             **kwargs: named arguments of a contract transaction.
 
         """
-        self.__dict__.update(kwargs)
+        object.__setattr__(self, '_names', tuple(kwargs))
+        object.__setattr__(self, '_values', tuple(kwargs.values()))
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        try:
+            return self._values[self._names.index(name)]
+        except ValueError:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            ) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self.__slots__:
+            object.__setattr__(self, name, value)
+        elif name in self._names:
+            values = list(self._values)
+            values[self._names.index(name)] = value
+            object.__setattr__(self, '_values', tuple(values))
+        else:
+            object.__setattr__(self, '_names', self._names + (name,))
+            object.__setattr__(self, '_values', self._values + (value,))
+
+    def _get_variables(self) -> dict:
+        return dict(zip(self._names, self._values))
 
     def get_list(self) -> list[Any]:
         """
@@ -26,7 +53,7 @@ class TxArgs(AutoRepr):
             List[Any]: list of transaction arguments.
 
         """
-        return list(self.__dict__.values())
+        return list(self._values)
 
     def get_tuple(self) -> tuple[str, Any]:
         """
@@ -36,4 +63,4 @@ class TxArgs(AutoRepr):
             Tuple[Any]: tuple of transaction arguments.
 
         """
-        return tuple(self.__dict__.values())
+        return self._values
@@ -0,0 +1,160 @@
+"""
+Aggregate the JSONL events written by CustomLogger.
+
+Usage:
+    python -m min_library.utils.events_report user_data/logs/events.jsonl
+    python -m min_library.utils.events_report events.jsonl --by module network status
+    python -m min_library.utils.events_report events.jsonl --json
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Iterable, List
+
+SUCCESS_STATUSES = ('BRIDGED', 'SWAPPED', 'SUCCESS', 'MINTED')
+OPERATION_STATUSES = SUCCESS_STATUSES + ('FAILED',)
+
+
+def read_events(path: str) -> Iterable[dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in file:
+            row = row.strip()
+            if not row:
+                continue
+            try:
+                yield json.loads(row)
+            except json.JSONDecodeError:
+                continue
+
+
+def percentile(values: List[float], percent: float) -> float | None:
+    if not values:
+        return None
+
+    values = sorted(values)
+    index = min(int(round(percent / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def aggregate(
+    events: Iterable[dict[str, Any]],
+    group_by: List[str]
+) -> list[dict[str, Any]]:
+    """
+    Aggregate events per group.
+
+    Args:
+        events (Iterable[dict[str, Any]]): the events.
+        group_by (List[str]): the event keys to group by.
+
+    Returns:
+        list[dict[str, Any]]: a row per group with counters, success rate,
+            duration percentiles and gas totals.
+
+    """
+    groups: dict[tuple, dict[str, Any]] = defaultdict(
+        lambda: {
+            'events': 0,
+            'approved': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'durations': [],
+            'gas_used': 0,
+            'gas_fee_wei': 0,
+            'accounts': set()
+        }
+    )
+
+    for event in events:
+        key = tuple(event.get(field) for field in group_by)
+        group = groups[key]
+        status = event.get('status')
+
+        group['events'] += 1
+        group['accounts'].add(event.get('account_id'))
+
+        if status == 'APPROVED':
+            group['approved'] += 1
+        elif status in SUCCESS_STATUSES:
+            group['succeeded'] += 1
+        elif status == 'FAILED':
+            group['failed'] += 1
+
+        if status in OPERATION_STATUSES and event.get('duration') is not None:
+            group['durations'].append(float(event['duration']))
+
+        if event.get('gas_used'):
+            group['gas_used'] += int(event['gas_used'])
+            group['gas_fee_wei'] += int(event['gas_used']) * int(event.get('gas_price') or 0)
+
+    rows = []
+    for key, group in sorted(groups.items(), key=lambda item: str(item[0])):
+        operations = group['succeeded'] + group['failed']
+        durations = group['durations']
+        rows.append({
+            **dict(zip(group_by, key)),
+            'events': group['events'],
+            'accounts': len(group['accounts']),
+            'approved': group['approved'],
+            'succeeded': group['succeeded'],
+            'failed': group['failed'],
+            'success_rate': (
+                round(group['succeeded'] / operations * 100, 2)
+                if operations else None
+            ),
+            'duration_avg': (
+                round(sum(durations) / len(durations), 3) if durations else None
+            ),
+            'duration_p50': percentile(durations, 50),
+            'duration_p95': percentile(durations, 95),
+            'gas_used': group['gas_used'],
+            'gas_fee_wei': group['gas_fee_wei'],
+        })
+
+    return rows
+
+
+def print_table(rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        print('No events found')
+        return
+
+    columns = list(rows[0].keys())
+    widths = {
+        column: max(len(column), *(len(str(row[column])) for row in rows))
+        for column in columns
+    }
+
+    print(' | '.join(f'{column:<{widths[column]}}' for column in columns))
+    print('-+-'.join('-' * widths[column] for column in columns))
+    for row in rows:
+        print(' | '.join(f'{str(row[column]):<{widths[column]}}' for column in columns))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Aggregate JSONL events per module/network'
+    )
+    parser.add_argument('path', help='path to the events JSONL file')
+    parser.add_argument(
+        '--by', nargs='+', default=['module', 'network'],
+        help='event keys to group by (default: module network)'
+    )
+    parser.add_argument(
+        '--json', action='store_true', help='print rows as JSON'
+    )
+    args = parser.parse_args(argv)
+
+    rows = aggregate(read_events(args.path), group_by=args.by)
+
+    if args.json:
+        print(json.dumps(rows, indent=2, default=str))
+    else:
+        print_table(rows)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,31 +2,32 @@ import asyncio
 import json
 import os
 import random
+import sys
+from functools import lru_cache, wraps
 from typing import List
 
 from aiohttp import (
     ClientSession
 )
+from eth_typing import ChecksumAddress
+from web3 import Web3
 
 from min_library.models.logger.logger import console_logger
-from user_data.settings.settings import (
-    RETRY_COUNT
-)
+from min_library.models.retry.retry_policy import retry_policy
+from min_library.models.tracing.tracer import tracer
 import min_library.models.others.exceptions as exceptions
 
 
 def retry(func):
-    async def _wrapper(*args, **kwargs):
-        retries = 1
+    """
+    Retry an async function on retryable errors (timeouts, rate limits, ...) by the rules of RETRY_RULES.
 
-        while retries <= RETRY_COUNT:
-            try:
-                result = await func(*args, **kwargs)
+    Other errors and the errors left after the last attempt are raised.
 
-                return result
-            except Exception as e:
-                await delay(60, f"One more retry: {retries}/{RETRY_COUNT}")
-                retries += 1
+    """
+    @wraps(func)
+    async def _wrapper(*args, **kwargs):
+        return await retry_policy.call(func, *args, **kwargs)
 
     return _wrapper
 
@@ -37,7 +38,23 @@ async def delay(
 ) -> None:
     console_logger.info(f"Sleeping for {sleep_time} seconds {message}")
 
-    await asyncio.sleep(sleep_time)
+    with tracer.span('delay', 'sleep', secs=sleep_time, message=message):
+        await asyncio.sleep(sleep_time)
+
+
+@lru_cache(maxsize=4096)
+def to_checksum_address(address: str | bytes) -> ChecksumAddress:
+    """
+    Get the checksum address, computed once per address (Web3.to_checksum_address hashes it with keccak).
+
+    Args:
+        address (str | bytes): the address.
+
+    Returns:
+        ChecksumAddress: the interned checksum address.
+
+    """
+    return sys.intern(Web3.to_checksum_address(address))
 
 
 def format_output(message: str):
@@ -63,7 +80,9 @@ def read_json(path: str | tuple | list, encoding: str | None = None) -> list | d
 
 async def sleep(sleep_from: int, sleep_to: int):
     random_value = random.randint(sleep_from, sleep_to)
-    await asyncio.sleep(random_value)
+
+    with tracer.span('sleep', 'sleep', secs=random_value):
+        await asyncio.sleep(random_value)
 
 
 async def make_request(
@@ -5,10 +5,12 @@ from web3.eth import AsyncEth
 from web3.types import TxParams
 
 from min_library.models.bridges.bridge_data import TokenBridgeInfo
+from min_library.models.contracts.abi_encoder import encode_abi
 from min_library.models.contracts.contracts import TokenContractData
 from min_library.models.networks.networks import Networks
 from min_library.models.others.constants import LogStatus
-from min_library.models.others.token_amount import TokenAmount
+from min_library.models.others.token_amount import TokenAmount, percent_to_bps
+from min_library.models.retry.retry_policy import ErrorClass, classify_error
 from min_library.models.swap.swap_info import SwapInfo
 from min_library.models.swap.swap_query import SwapQuery
 from min_library.models.transactions.tx_args import TxArgs
@@ -53,10 +55,8 @@ class CoreDaoBridge(SwapTask):
             swap_query = await self.compute_source_token_amount(
                 swap_info=swap_info
             )
-            swap_query.min_to_amount = TokenAmount(
-                amount=swap_query.amount_from.Wei * (1 - swap_info.slippage / 100),
-                decimals=swap_query.from_token.decimals,
-                wei=True
+            swap_query.min_to_amount = swap_query.amount_from.apply_slippage(
+                percent_to_bps(swap_info.slippage)
             ) # check here
 
             prepared_tx_params = await self._prepare_params(
@@ -126,7 +126,7 @@ class CoreDaoBridge(SwapTask):
             return wait_time if receipt_status else False
         except Exception as e:
             error = str(e)
-            if 'insufficient funds for gas + value' in error:
+            if classify_error(e) == ErrorClass.INSUFFICIENT_FUNDS:
                 self.client.account_manager.custom_logger.log_message(
                     status=LogStatus.ERROR, message='Insufficient funds for gas + value'
                 )
@@ -247,11 +247,14 @@ class CoreDaoBridge(SwapTask):
             fee = TokenAmount(amount=result[0], wei=True)
             multiplier = 1.01
 
-        fee.Wei = int(fee.Wei * multiplier)
+        fee = TokenAmount(
+            amount=int(fee.Wei * multiplier), decimals=fee.decimals, wei=True
+        )
 
         tx_params = TxParams(
             to=contract.address,
-            data=contract.encodeABI(
+            data=encode_abi(
+                contract,
                 'bridge',
                 args=args.get_tuple()
             ),
@@ -2,11 +2,14 @@ import time
 
 from web3.types import TxParams
 
-from min_library.models.contracts.contracts import ContractsFactory, TokenContractData
+from min_library.models.contracts.abi_encoder import encode_abi
+from min_library.models.contracts.contracts import ContractsFactory
 from min_library.models.contracts.raw_contract import RawContract
 from min_library.models.others.constants import LogStatus
+from min_library.models.retry.retry_policy import ErrorClass, classify_error
 from min_library.models.swap.swap_info import SwapInfo
 from min_library.models.swap.swap_query import SwapQuery
+from min_library.models.swap.v3_quoter import PoolState, V3Quoter
 from min_library.utils.helpers import read_json, sleep
 from tasks.swap_task import SwapTask
 
@@ -16,7 +19,7 @@ class PancakeSwap(SwapTask):
         title='PancakeSwap: Smart Router V3',
         address='0x13f4EA83D0bd40E75C8222255bc855a974568Dd4',
         abi=read_json(
-            path=('data', 'abis', 'pancake_swap', 'router_abi.json')
+            path=('data', 'abis', 'pancake_swap', 'smart_router_abi.json')
         )
     )
     FACTORY = RawContract(
@@ -37,36 +40,30 @@ class PancakeSwap(SwapTask):
     async def get_pool(
         self,
         swap_query: SwapQuery
-    ) -> str:
-        factory = await self.client.contract.get(
-            contract=self.FACTORY
+    ) -> PoolState | None:
+        return await pancake_v3_quoter.get_pool(
+            w3=self.client.account_manager.w3,
+            chain_id=self.client.account_manager.network.chain_id,
+            token_a=swap_query.from_token.address,
+            token_b=swap_query.to_token.address
         )
 
-        pool = await factory.functions.getPool(
-            swap_query.from_token.address,
-            swap_query.to_token.address,
-            500
-        ).call()
-
-        return pool
-
     async def get_quote(
         self,
-        swap_query: SwapQuery
+        swap_query: SwapQuery,
+        pool: PoolState
     ) -> int:
         quoter = await self.client.contract.get(
             contract=self.QUOTER
         )
 
-        quoter_data = await quoter.functions.quoteExactInputSingle((
-            swap_query.from_token.address,
-            swap_query.to_token.address,
-            swap_query.amount_from.Wei,
-            500,
-            0
-        )).call()
-
-        return quoter_data[0]
+        return await pancake_v3_quoter.quote_exact_input_single(
+            quoter_contract=quoter,
+            token_in=swap_query.from_token.address,
+            token_out=swap_query.to_token.address,
+            amount_in=swap_query.amount_from.Wei,
+            pool=pool
+        )
 
     async def swap(
         self,
@@ -92,11 +89,10 @@ class PancakeSwap(SwapTask):
             token_symbol=swap_info.to_token
         )
 
-        # pool = await self.get_pool(swap_query=swap_query)
-        pool = '0x589a5062e47202bB994cD354913733a14b54e8Dc'
+        pool = await self.get_pool(swap_query=swap_query)
         deadline = int(time.time() + 20 * 60)
 
-        if pool == TokenContractData.ZERO_ADDRESS:
+        if not pool:
             self.client.account_manager.custom_logger.log_message(
                 status=LogStatus.ERROR,
                 message=(
@@ -112,15 +108,23 @@ class PancakeSwap(SwapTask):
         )
 
         quote = await self.get_quote(
-            swap_query=swap_query
+            swap_query=swap_query,
+            pool=pool
+        )
+        swap_query = await self.compute_min_destination_amount(
+            swap_query=swap_query,
+            min_to_amount=quote,
+            swap_info=swap_info,
+            is_to_token_price_wei=True
         )
 
-        tx_data = swap_contract.encodeABI(
+        tx_data = encode_abi(
+            swap_contract,
             fn_name='exactInputSingle',
             args=[(
                 swap_query.from_token.address,
                 swap_query.to_token.address,
-                300,
+                pool.fee,
                 self.client.account_manager.account.address,
                 swap_query.amount_from.Wei,
                 swap_query.min_to_amount.Wei,
@@ -128,10 +132,12 @@ class PancakeSwap(SwapTask):
             )]
         )
 
-        contract_data = await swap_contract.functions.multicall(
-            deadline, [tx_data]
+        contract_data = encode_abi(
+            swap_contract,
+            fn_name='multicall',
+            args=[deadline, [tx_data]]
         )
-        
+
         tx_params = TxParams(
             to=swap_contract.address,
             data=contract_data
@@ -143,13 +149,16 @@ class PancakeSwap(SwapTask):
         )
         
         if not swap_query.from_token.is_native_token:
-            await self.approve_interface(
+            hexed_tx_hash = await self.approve_interface(
                 token_contract=swap_query.from_token,
                 spender_address=swap_contract.address,
                 amount=swap_query.amount_from,
+                swap_info=swap_info,
                 tx_params=tx_params
             )
-            await sleep(30, 50)
+
+            if hexed_tx_hash:
+                await sleep(30, 50)
         else:
             tx_params['value'] = swap_query.amount_from.Wei
 
@@ -165,7 +174,7 @@ class PancakeSwap(SwapTask):
             return receipt_status
         except Exception as e:
             error = str(e)
-            if 'insufficient funds for gas + value' in error:
+            if classify_error(e) == ErrorClass.INSUFFICIENT_FUNDS:
                 self.client.account_manager.custom_logger.log_message(
                     status=LogStatus.ERROR, message='Insufficient funds for gas + value'
                 )
@@ -174,5 +183,11 @@ class PancakeSwap(SwapTask):
                     status=LogStatus.ERROR, message=error
                 )
         return False
-        
-        
+
+
+# pools are created by the PancakeSwap V3 pool deployer, not by the factory
+pancake_v3_quoter = V3Quoter(
+    deployer='0x41ff9AA7e16B8B1a8a8dc4f0eFacd93D02d071c9',
+    init_code_hash='0x6ce8eb472fa82df5469c6ab6d485f17c3ad13c8cd7af59b3d4a8026c5ce0f7e2',
+    tick_spacings={100: 1, 500: 10, 2500: 50, 10000: 200}
+)
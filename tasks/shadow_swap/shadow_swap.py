@@ -6,6 +6,7 @@ from typing import List
 from web3.types import TxParams
 import web3.exceptions as web3_exceptions
 
+from min_library.models.contracts.abi_encoder import encode_abi
 from min_library.models.contracts.contracts import CoreTokenContracts
 from min_library.models.contracts.raw_contract import RawContract
 from min_library.models.networks.network import Network
@@ -13,10 +14,12 @@ from min_library.models.networks.networks import Networks
 from min_library.models.others.constants import LogStatus, TokenSymbol
 from min_library.models.others.params_types import ParamsTypes
 from min_library.models.others.token_amount import TokenAmount
+from min_library.models.retry.retry_policy import ErrorClass, classify_error
 from min_library.models.swap.swap_info import SwapInfo
 from min_library.models.swap.swap_query import SwapQuery
 from min_library.models.swap.tx_payload_details import TxPayloadDetails
 from min_library.models.swap.tx_payload_details_fetcher import TxPayloadDetailsFetcher
+from min_library.models.swap.v2_quoter import V2Quoter
 from min_library.models.transactions.tx_args import TxArgs
 from min_library.utils.helpers import read_json, sleep
 from tasks.coredao.coredao_data import CoredaoData
@@ -95,7 +98,8 @@ class ShadowSwap(SwapTask):
 
             tx_params = TxParams(
                 to=contract.address,
-                data=contract.encodeABI(
+                data=encode_abi(
+                    contract,
                     tx_payload_details.method_name,
                     args=tuple(list_params)
                 )
@@ -121,6 +125,9 @@ class ShadowSwap(SwapTask):
             receipt_status, status, message = await self.perform_swap(
                 swap_info, swap_query, tx_params
             )
+            if not receipt_status:
+                # the amountOutMin may come from a wrong local quote
+                shadow_swap_quoter.invalidate(tx_payload_details.swap_path)
             self.client.account_manager.custom_logger.log_message(
                 status=status, message=message
             )
@@ -133,7 +140,7 @@ class ShadowSwap(SwapTask):
             )
         except Exception as e:
             error = str(e)
-            if 'insufficient funds for gas + value' in error:
+            if classify_error(e) == ErrorClass.INSUFFICIENT_FUNDS:
                 self.client.account_manager.custom_logger.log_message(
                     status=LogStatus.ERROR, message='Insufficient funds for gas + value'
                 )
@@ -192,10 +199,11 @@ class ShadowSwap(SwapTask):
         try:
             swap_query = await self.compute_source_token_amount(swap_info=swap_info)
 
-            amounts_out = await contract.functions.getAmountsOut(
-                swap_query.amount_from.Wei,
-                swap_path
-            ).call()
+            amounts_out = await shadow_swap_quoter.get_amounts_out(
+                router_contract=contract,
+                amount_in=swap_query.amount_from.Wei,
+                path=swap_path
+            )
 
             return await self.compute_min_destination_amount(
                 swap_query=swap_query,
@@ -269,3 +277,12 @@ class ShadowSwapRoutes(TxPayloadDetailsFetcher):
             ),
         },
     }
+
+
+# ShadowSwap pairs are Uniswap V2 pairs with the 0.3% fee
+shadow_swap_quoter = V2Quoter(fee_bps=30)
+shadow_swap_quoter.add_paths([
+    tx_payload_details.swap_path
+    for routes in ShadowSwapRoutes.PATHS.values()
+    for tx_payload_details in routes.values()
+])
@@ -6,11 +6,14 @@ from eth_typing import HexStr
 from web3.types import TxParams
 
 from min_library.models.bridges.bridge_data import TokenBridgeInfo
+from min_library.models.contracts.abi_encoder import encode_abi
 from min_library.models.contracts.contracts import TokenContractData
 from min_library.models.networks.networks import Networks
 from min_library.models.others.constants import LogStatus, TokenSymbol
 from min_library.models.others.params_types import ParamsTypes
 from min_library.models.others.token_amount import TokenAmount
+from min_library.models.prices.price_oracle import price_oracle
+from min_library.models.retry.retry_policy import ErrorClass, classify_error
 from min_library.models.swap.swap_info import SwapInfo
 from min_library.models.swap.swap_query import SwapQuery
 from min_library.models.transactions.tx_args import TxArgs
@@ -103,16 +106,21 @@ class Stargate(SwapTask):
 
             return False
 
-        token_price = await self.get_binance_ticker_price(
-            first_token=self.client.account_manager.network.coin_symbol
+        src_coin_symbol = self.client.account_manager.network.coin_symbol
+        dst_coin_symbol = swap_info.to_network.coin_symbol
+        # the destination coin may have no Binance pair, its price is only needed for dst_fee
+        prices = await price_oracle.get_prices(
+            [src_coin_symbol, dst_coin_symbol] if dst_fee else [src_coin_symbol]
         )
+
+        token_price = prices[price_oracle.normalize_symbol(src_coin_symbol)]
         network_fee = float(value.Ether) * token_price
 
         dst_native_amount_price = 0
         if dst_fee:
-            dst_token_price = await self.get_binance_ticker_price(
-                first_token=dst_network.coin_symbol
-            )
+            dst_token_price = prices[
+                price_oracle.normalize_symbol(dst_coin_symbol)
+            ]
             dst_native_amount_price = float(dst_fee.Ether) * dst_token_price
 
         if network_fee - dst_native_amount_price > max_fee:
@@ -154,7 +162,7 @@ class Stargate(SwapTask):
             )
         except Exception as e:
             error = str(e)
-            if 'insufficient funds for gas + value' in error:
+            if classify_error(e) == ErrorClass.INSUFFICIENT_FUNDS:
                 self.client.account_manager.custom_logger.log_message(
                     status=LogStatus.ERROR, message='Insufficient funds for gas + value'
                 )
@@ -277,7 +285,8 @@ class Stargate(SwapTask):
                 _minAmountLd=swap_query.min_to_amount.Wei,
             )
 
-            tx_params['data'] = router_contract.encodeABI(
+            tx_params['data'] = encode_abi(
+                router_contract,
                 'swapETH', args=tx_args.get_tuple()
             )
 
@@ -332,7 +341,8 @@ class Stargate(SwapTask):
                 _composeMsg='0x'
             )
 
-            tx_params['data'] = router_contract.encodeABI(
+            tx_params['data'] = encode_abi(
+                router_contract,
                 'send', args=tx_args.get_tuple()
             )
 
@@ -384,7 +394,8 @@ class Stargate(SwapTask):
                 _composeMsg='0x'
             )
 
-            data = router_contract.encodeABI(
+            data = encode_abi(
+                router_contract,
                 'swapRecolorSend', args=tx_args.get_tuple()
             )
 
@@ -415,7 +426,8 @@ class Stargate(SwapTask):
                 adapterParam=adapter_params
             )
 
-            tx_params['data'] = router_contract.encodeABI(
+            tx_params['data'] = encode_abi(
+                router_contract,
                 'sendTokens', args=tx_args.get_tuple()
             )
 
@@ -449,7 +461,8 @@ class Stargate(SwapTask):
                 _payload='0x'
             )
 
-            tx_params['data'] = router_contract.encodeABI(
+            tx_params['data'] = encode_abi(
+                router_contract,
                 'swap', args=tx_args.get_tuple()
             )
 
@@ -1,5 +1,4 @@
-import asyncio
-import aiohttp
+import time
 
 from web3 import Web3
 from web3.types import (
@@ -9,17 +8,25 @@ from web3.types import (
 )
 
 from min_library.models.client import Client
+from min_library.models.contracts.allowance_ledger import allowance_ledger
 from min_library.models.contracts.contracts import ContractsFactory
 from min_library.models.others.constants import LogStatus, TokenSymbol
 from min_library.models.others.params_types import ParamsTypes
-from min_library.models.others.token_amount import TokenAmount
+from min_library.models.others.token_amount import (
+    BPS_DENOMINATOR, TokenAmount, percent_to_bps
+)
+from min_library.models.prices.price_oracle import price_oracle
 from min_library.models.swap.swap_info import SwapInfo
 from min_library.models.swap.swap_query import SwapQuery
+from min_library.models.tracing.tracer import traced, tracer
 
 
 class SwapTask:
     def __init__(self, client: Client):
         self.client = client
+        self.client.account_manager.custom_logger.module_name = (
+            self.__class__.__name__
+        )
 
     @staticmethod
     def parse_params(
@@ -108,6 +115,7 @@ class SwapTask:
         if first_arg.upper() == second_arg.upper():
             return f'The {param_type} for {function}() are equal: {first_arg} == {second_arg}'
 
+    @traced()
     async def approve_interface(
         self,
         swap_info: SwapInfo,
@@ -129,8 +137,20 @@ class SwapTask:
             is_approve_infinity (bool, optional): Whether to approve an infinite amount. Defaults to None.
 
         Returns:
-            Union[str, bool]: If successful, returns the transaction hash. If not, returns False.
+            Union[str, bool]: The transaction hash if an approve transaction was sent,
+                otherwise False (nothing to approve, already approved or failed).
         """
+        ledger_key = dict(
+            chain_id=self.client.account_manager.network.chain_id,
+            owner=self.client.account_manager.account.address,
+            token=token_contract.address,
+            spender=spender_address
+        )
+
+        # the allowance is read on chain only if the known one is not enough
+        if allowance_ledger.spend(**ledger_key, amount=amount.Wei):
+            return False
+
         balance = await self.client.contract.get_balance(
             token_contract=token_contract
         )
@@ -142,10 +162,12 @@ class SwapTask:
             spender_address=spender_address,
             owner=self.client.account_manager.account.address
         )
+        allowance_ledger.set(**ledger_key, amount=approved.Wei)
 
         if amount.Wei <= approved.Wei:
-            return True
-        
+            allowance_ledger.spend(**ledger_key, amount=amount.Wei)
+            return False
+
         tx_params = self.set_all_gas_params(
             swap_info=swap_info,
             tx_params=tx_params
@@ -158,8 +180,19 @@ class SwapTask:
             is_approve_infinity=is_approve_infinity
         )
 
+        if tx_hash:
+            # the allowance is set from the Approval log of the receipt
+            allowance_ledger.spend(**ledger_key, amount=amount.Wei)
+            self.client.account_manager.custom_logger.log_event(
+                status=LogStatus.APPROVED,
+                tx_hash=tx_hash,
+                from_token=token_contract.title,
+                amount_from=amount.Ether
+            )
+
         return tx_hash
 
+    @traced()
     async def compute_source_token_amount(
         self,
         swap_info: SwapInfo
@@ -193,30 +226,26 @@ class SwapTask:
             balance = await self.client.contract.get_balance(from_token)
             decimals = balance.decimals
 
-        if not swap_info.amount:
-            token_amount = balance
+        if swap_info.amount_by_percent:
+            token_amount = balance.mul_div(
+                percent_to_bps(swap_info.amount_by_percent * 100), BPS_DENOMINATOR
+            )
 
         elif swap_info.amount:
-            token_amount = TokenAmount(
-                amount=swap_info.amount,
-                decimals=decimals
+            token_amount = min(
+                TokenAmount(amount=swap_info.amount, decimals=decimals),
+                balance
             )
 
-            if token_amount.Wei > balance.Wei:
-                token_amount = balance
-
-        elif swap_info.amount_by_percent:
-            token_amount = TokenAmount(
-                amount=balance.Wei * swap_info.amount_by_percent,
-                decimals=decimals,
-                wei=True
-            )
+        else:
+            token_amount = balance
 
         return SwapQuery(
             from_token=from_token,
             amount_from=token_amount
         )
 
+    @traced()
     async def compute_min_destination_amount(
         self,
         swap_query: SwapQuery,
@@ -262,10 +291,17 @@ class SwapTask:
         #     )
         # )
 
-        min_amount_out = TokenAmount(
-            amount=min_to_amount * (1 - swap_info.slippage / 100),
-            decimals=decimals,
-            wei=is_to_token_price_wei
+        if is_to_token_price_wei and isinstance(min_to_amount, int):
+            min_amount_out = TokenAmount.from_wei(min_to_amount, decimals)
+        else:
+            min_amount_out = TokenAmount(
+                amount=min_to_amount,
+                decimals=decimals,
+                wei=is_to_token_price_wei
+            )
+
+        min_amount_out = min_amount_out.apply_slippage(
+            percent_to_bps(swap_info.slippage)
         )
 
         return SwapQuery(
@@ -279,29 +315,11 @@ class SwapTask:
         self,
         first_token: str = TokenSymbol.ETH,
         second_token: str = TokenSymbol.USDT
-    ) -> float | None:
-        stables_pool = [
-            TokenSymbol.USDT,
-            TokenSymbol.USDC,
-            TokenSymbol.USDC_E,
-            TokenSymbol.USDV
-        ]
-        
-        if first_token.startswith('W'):
-            first_token = first_token[1:]
-
-        if second_token.startswith('W'):
-            second_token = second_token[1:]
-
-        if first_token in stables_pool:
-            return 1
-
-        async with aiohttp.ClientSession() as session:
-            price = await self._get_price_from_binance(session, first_token, second_token)
-            if price:
-                return price
-            else:
-                return await self._get_price_from_binance(session, second_token, first_token)
+    ) -> float:
+        return await price_oracle.get_price(
+            first_token=first_token,
+            second_token=second_token
+        )
 
     async def get_token_info(self, token_address):
         contract = await self.client.contract.get_token_contract(token=token_address)
@@ -309,6 +327,7 @@ class SwapTask:
         print('symbol:', await contract.functions.symbol().call())
         print('decimals:', await contract.functions.decimals().call())
 
+    @traced()
     async def perform_swap(
         self,
         swap_info: SwapInfo,
@@ -332,7 +351,9 @@ class SwapTask:
             tx_params=tx_params
         )
 
+        start_time = time.time()
         tx_hash, receipt = await self.perform_tx(tx_params)
+        duration = time.time() - start_time
 
         account_network = self.client.account_manager.network
         full_path = account_network.explorer + account_network.TxPath
@@ -344,9 +365,18 @@ class SwapTask:
             message = f'{rounded_amount_from} {swap_info.from_token}'
 
         else:
-            log_status = LogStatus.ERROR
+            log_status = LogStatus.FAILED
             message = f'Failed swap {rounded_amount_from} {swap_info.from_token}'
 
+        self._log_tx_event(
+            status=log_status,
+            tx_hash=tx_hash,
+            receipt=receipt,
+            swap_info=swap_info,
+            swap_query=swap_query,
+            duration=duration
+        )
+
         message += (
             f' -> {rounded_amount_to} {swap_info.to_token}: '
             f'{full_path + tx_hash.hex()}'
@@ -354,6 +384,7 @@ class SwapTask:
 
         return receipt['status'], log_status, message
 
+    @traced()
     async def perform_bridge(
         self,
         swap_info: SwapInfo,
@@ -381,7 +412,9 @@ class SwapTask:
             tx_params=tx_params
         )
 
+        start_time = time.time()
         tx_hash, receipt = await self.perform_tx(tx_params)
+        duration = time.time() - start_time
 
         account_network = self.client.account_manager.network
 
@@ -397,9 +430,18 @@ class SwapTask:
             log_status = LogStatus.BRIDGED
             message = f'{rounded_amount_from} {swap_info.from_token}'
         else:
-            log_status = LogStatus.ERROR
+            log_status = LogStatus.FAILED
             message = f'Failed bridge {rounded_amount_from} {swap_info.from_token}'
 
+        self._log_tx_event(
+            status=log_status,
+            tx_hash=tx_hash,
+            receipt=receipt,
+            swap_info=swap_info,
+            swap_query=swap_query,
+            duration=duration
+        )
+
         message += (
             f' from {account_network.name.upper()} -> '
             f'{rounded_amount_to} {swap_info.to_token}'
@@ -409,6 +451,7 @@ class SwapTask:
 
         return receipt['status'], log_status, message
 
+    @traced()
     async def transfer(
         self,
         swap_info: SwapInfo,
@@ -418,6 +461,7 @@ class SwapTask:
             query = await self.compute_source_token_amount(swap_info)
             tx_params = self.set_all_gas_params(swap_info)
 
+            start_time = time.time()
             receipt_status, tx_hash = await self.client.contract.transfer(
                 recipient_address=recipient_address,
                 token_amount=query.amount_from,
@@ -439,10 +483,18 @@ class SwapTask:
             message += (
                 f': {account_network.explorer + account_network.TxPath + tx_hash.hex()}'
             )
+
+            self.client.account_manager.custom_logger.log_event(
+                status=log_status,
+                tx_hash=tx_hash.hex(),
+                from_token=swap_info.from_token,
+                amount_from=query.amount_from.Ether,
+                duration=time.time() - start_time
+            )
         except Exception as e:
             exception = str(e)
 
-            log_status = LogStatus.ERROR,
+            log_status = LogStatus.ERROR
             message = (
                 f'Error while sending {query.amount_from.Ether} '
                 f'{swap_info.from_token}: {exception}'
@@ -457,27 +509,31 @@ class SwapTask:
 
         return wait_time
 
-    async def _get_price_from_binance(
+    def _log_tx_event(
         self,
-        session: aiohttp.ClientSession,
-        first_token: str,
-        second_token: str
-    ) -> float | None:
-        first_token, second_token = first_token.upper(), second_token.upper()
-        for _ in range(5):
-            try:
-                response = await session.get(
-                    f'https://api.binance.com/api/v3/ticker/price?symbol={first_token}{second_token}')
-                if response.status != 200:
-                    return None
-                result_dict = await response.json()
-                if 'price' in result_dict:
-                    return float(result_dict['price'])
-            except Exception as e:
-                await asyncio.sleep(3)
-        raise ValueError(
-            f'Can not get {first_token}{second_token} price from Binance')
+        status: str,
+        tx_hash: _Hash32,
+        receipt: TxReceipt,
+        swap_info: SwapInfo,
+        swap_query: SwapQuery,
+        duration: float
+    ) -> None:
+        self.client.account_manager.custom_logger.log_event(
+            status=status,
+            tx_hash=tx_hash.hex(),
+            gas_used=receipt.get('gasUsed'),
+            gas_price=receipt.get('effectiveGasPrice'),
+            from_token=swap_info.from_token,
+            amount_from=swap_query.amount_from.Ether,
+            to_token=swap_info.to_token,
+            amount_to=swap_query.min_to_amount.Ether,
+            to_network=(
+                swap_info.to_network.name if swap_info.to_network else None
+            ),
+            duration=duration
+        )
 
+    @traced()
     async def perform_tx(
         self,
         tx_params: TxParams | dict
@@ -495,11 +551,14 @@ class SwapTask:
                 - The hash of the transaction.
                 - The receipt of the transaction.
         """
-        tx = await self.client.contract.transaction.sign_and_send(
-            tx_params=tx_params
-        )
-        receipt = await tx.wait_for_tx_receipt(
-            web3=self.client.account_manager.w3
-        )
+        with tracer.span('Transaction.sign_and_send'):
+            tx = await self.client.contract.transaction.sign_and_send(
+                tx_params=tx_params
+            )
+
+        with tracer.span('Tx.wait_for_tx_receipt'):
+            receipt = await tx.wait_for_tx_receipt(
+                web3=self.client.account_manager.w3
+            )
 
         return tx.hash, receipt
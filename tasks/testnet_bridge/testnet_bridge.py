@@ -1,9 +1,10 @@
 from web3.types import TxParams
 
+from min_library.models.contracts.abi_encoder import encode_abi
 from min_library.models.contracts.contracts import TokenContractData
 from min_library.models.others.constants import LogStatus
 from min_library.models.others.params_types import ParamsTypes
-from min_library.models.others.token_amount import TokenAmount
+from min_library.models.others.token_amount import TokenAmount, percent_to_bps
 from min_library.models.swap.swap_info import SwapInfo
 from min_library.models.swap.swap_query import SwapQuery
 from min_library.models.transactions.tx_args import TxArgs
@@ -44,10 +45,8 @@ class TestnetBridge(SwapTask):
         swap_query = await self.compute_source_token_amount(
             swap_info=swap_info
         )
-        swap_query.min_to_amount = TokenAmount(
-            amount=swap_query.amount_from.Wei * (1 - swap_info.slippage / 100),
-            decimals=swap_query.from_token.decimals,
-            wei=True
+        swap_query.min_to_amount = swap_query.amount_from.apply_slippage(
+            percent_to_bps(swap_info.slippage)
         )
 
         args = TxArgs(
@@ -68,7 +67,7 @@ class TestnetBridge(SwapTask):
 
         tx_params = TxParams(
             to=contract.address,
-            data=contract.encodeABI('sendFrom', args=args.get_tuple()),
+            data=encode_abi(contract, 'sendFrom', args=args.get_tuple()),
             value=value.Wei
         )
         if not swap_query.from_token.is_native_token:
@@ -1,5 +1,6 @@
 from web3.types import TxParams
 
+from min_library.models.contracts.abi_encoder import encode_abi
 from min_library.models.contracts.contracts import ContractsFactory
 from min_library.models.others.constants import LogStatus
 from min_library.models.others.params_types import ParamsTypes
@@ -47,7 +48,7 @@ class WooFi(SwapTask):
 
         tx_params = TxParams(
             to=contract.address,
-            data=contract.encodeABI('swap', args=args.get_tuple()),
+            data=encode_abi(contract, 'swap', args=args.get_tuple()),
         )
 
         tx_params = self.set_all_gas_params(
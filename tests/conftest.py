@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from min_library.models.account.user_agents import user_agent_pool
+from min_library.models.contracts.allowance_ledger import allowance_ledger
+from min_library.models.logger.logger import CustomLogger
+from min_library.models.transactions.gas_model import gas_model
+
+
+# tests must not read or overwrite the stores of real runs
+user_agent_pool.assignments_path = None
+gas_model.path = None
+allowance_ledger.path = None
+CustomLogger.EVENTS = None
+CustomLogger.MAIN_LOG_FILE = None
+
+
+@pytest.fixture
+def no_sleep(monkeypatch) -> list[float]:
+    """
+    Make asyncio.sleep return at once.
+
+    Returns:
+        list[float]: the delays that were requested.
+
+    """
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay: float, *args, **kwargs) -> None:
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, 'sleep', sleep)
+
+    return delays
@@ -0,0 +1,145 @@
+from hexbytes import HexBytes
+
+from min_library.models.contracts.allowance_ledger import APPROVAL_TOPIC, INFINITE_ALLOWANCE, AllowanceLedger
+
+
+OWNER = '0x' + '11' * 20
+TOKEN = '0x' + '22' * 20
+SPENDER = '0x' + '33' * 20
+OTHER_SPENDER = '0x' + '55' * 20
+
+
+def approval_log(token: str, owner: str, spender: str, amount: int) -> dict:
+    return {
+        'address': token,
+        'topics': [
+            HexBytes(APPROVAL_TOPIC),
+            HexBytes(bytes(12) + bytes.fromhex(owner[2:])),
+            '0x' + '00' * 12 + spender[2:],
+        ],
+        'data': HexBytes(amount.to_bytes(32, 'big')),
+    }
+
+
+def test_spend_takes_the_amount_only_from_a_known_and_enough_allowance():
+    ledger = AllowanceLedger()
+
+    assert not ledger.spend(56, OWNER, TOKEN, SPENDER, 1)
+
+    ledger.set(56, OWNER, TOKEN, SPENDER, 100)
+    assert not ledger.spend(56, OWNER, TOKEN, SPENDER, 101)
+    assert ledger.spend(56, OWNER.upper().replace('0X', '0x'), TOKEN, SPENDER, 60)
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) == 40
+    assert not ledger.spend(56, OWNER, TOKEN, SPENDER, 41)
+    assert ledger.spend(56, OWNER, TOKEN, SPENDER, 40)
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) == 0
+
+    # other chains have their own allowances
+    assert not ledger.spend(1, OWNER, TOKEN, SPENDER, 0)
+
+
+def test_spend_does_not_decrease_an_infinite_allowance():
+    ledger = AllowanceLedger()
+    ledger.set(56, OWNER, TOKEN, SPENDER, 2 ** 256 - 1)
+
+    assert ledger.spend(56, OWNER, TOKEN, SPENDER, 10 ** 30)
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) == 2 ** 256 - 1
+
+
+def test_disabled_ledger_is_never_enough():
+    ledger = AllowanceLedger(is_enabled=False)
+    ledger.set(56, OWNER, TOKEN, SPENDER, INFINITE_ALLOWANCE)
+
+    assert not ledger.spend(56, OWNER, TOKEN, SPENDER, 1)
+
+
+def test_observe_records_approval_logs_of_a_successful_receipt():
+    ledger = AllowanceLedger()
+    ledger.set(56, OWNER, TOKEN, SPENDER, 5)
+
+    ledger.observe(56, {'from': OWNER, 'to': TOKEN}, {
+        'status': 1,
+        'logs': [
+            approval_log(TOKEN, OWNER, SPENDER, 1000),
+            # a Transfer has the same number of topics
+            {'address': TOKEN, 'topics': [HexBytes(bytes(32))] * 3, 'data': HexBytes(bytes(32))},
+        ],
+    })
+
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) == 1000
+    assert ledger.take_changes() == {AllowanceLedger.get_key(56, OWNER, TOKEN, SPENDER): 1000}
+
+
+def test_observe_drops_allowances_of_the_sender_for_the_spender_of_a_reverted_transaction():
+    other_token = '0x' + '66' * 20
+    ledger = AllowanceLedger()
+    ledger.set(56, OWNER, TOKEN, SPENDER, 100)
+    ledger.set(56, OWNER, other_token, SPENDER, 100)
+    ledger.set(56, OWNER, TOKEN, OTHER_SPENDER, 100)
+    ledger.set(1, OWNER, TOKEN, SPENDER, 100)
+
+    ledger.observe(56, {'from': OWNER, 'to': SPENDER}, {'status': 0, 'logs': []})
+
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) is None
+    assert ledger.get(56, OWNER, other_token, SPENDER) is None
+    assert ledger.get(56, OWNER, TOKEN, OTHER_SPENDER) == 100
+    assert ledger.get(1, OWNER, TOKEN, SPENDER) == 100
+
+
+def test_observe_ignores_missing_receipts():
+    ledger = AllowanceLedger()
+    ledger.set(56, OWNER, TOKEN, SPENDER, 100)
+    ledger.take_changes()
+
+    ledger.observe(56, {'from': OWNER, 'to': SPENDER}, None)
+    ledger.observe(None, {'from': OWNER, 'to': SPENDER}, {'status': 0})
+
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) == 100
+    assert ledger.take_changes() == {}
+
+
+def test_save_keeps_allowances_larger_than_json_numbers(tmp_path):
+    path = str(tmp_path / 'allowances.json')
+    ledger = AllowanceLedger(path=path)
+    ledger.set(56, OWNER, TOKEN, SPENDER, 2 ** 256 - 1)
+    ledger.save()
+
+    assert AllowanceLedger(path=path).get(56, OWNER, TOKEN, SPENDER) == 2 ** 256 - 1
+
+
+def test_merge_applies_only_the_changes_of_a_shard(tmp_path):
+    path = str(tmp_path / 'allowances.json')
+    other_owner = '0x' + '44' * 20
+
+    parent = AllowanceLedger(path=path)
+    parent.set(56, OWNER, TOKEN, SPENDER, 100)
+    parent.set(56, other_owner, TOKEN, SPENDER, 100)
+    parent.save()
+
+    # both shards load the file, each spends the allowance of its own account
+    first_shard = AllowanceLedger(path=path)
+    second_shard = AllowanceLedger(path=path)
+    assert first_shard.spend(56, OWNER, TOKEN, SPENDER, 30)
+    assert second_shard.spend(56, other_owner, TOKEN, SPENDER, 60)
+
+    parent.merge(first_shard.take_changes())
+    parent.merge(second_shard.take_changes())
+    parent.save()
+
+    ledger = AllowanceLedger(path=path)
+    assert ledger.get(56, OWNER, TOKEN, SPENDER) == 70
+    assert ledger.get(56, other_owner, TOKEN, SPENDER) == 40
+    assert first_shard.take_changes() == {}
+
+
+def test_merge_drops_allowances_dropped_by_a_shard():
+    parent = AllowanceLedger()
+    parent.set(56, OWNER, TOKEN, SPENDER, 100)
+
+    shard = AllowanceLedger()
+    shard.set(56, OWNER, TOKEN, SPENDER, 100)
+    shard.observe(56, {'from': OWNER, 'to': SPENDER}, {'status': 0})
+
+    parent.merge(shard.take_changes())
+
+    assert parent.get(56, OWNER, TOKEN, SPENDER) is None
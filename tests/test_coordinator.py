@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+
+import min_library.models.runner.coordinator as coordinator_module
+from min_library.models.runner.coordinator import Coordinator
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(coordinator_module.time, 'monotonic', lambda: now[0])
+
+    return now
+
+
+def create_coordinator(account_ids: list[int], **kwargs) -> Coordinator:
+    coordinator = Coordinator('module', lease_ttl=60, **kwargs)
+    coordinator.run_id = 'run'
+    for account_id in account_ids:
+        coordinator._pending.append(coordinator_module.Job(account_id, 'module'))
+
+    return coordinator
+
+
+def expire_leases(coordinator: Coordinator) -> None:
+    async def run():
+        task = asyncio.create_task(coordinator._expire_leases())
+        # one check of the leases per sleep of the task
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def read_journal(path: str) -> list[tuple[str, str, str]]:
+    rows = []
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.endswith('}\n'):
+                row = json.loads(line)
+                rows.append((row['event'], row['job_id'], row['worker_id']))
+
+    return rows
+
+
+def test_expired_lease_is_given_to_another_worker_first(clock, no_sleep):
+    coordinator = create_coordinator([1, 2])
+    job = coordinator.lease('a')
+
+    clock[0] += 59
+    expire_leases(coordinator)
+    assert coordinator.get_status()['leased'] == 1
+
+    clock[0] += 2
+    expire_leases(coordinator)
+    assert coordinator.get_status()['pending'] == 2
+
+    # the worker that lost the lease learns it from its heartbeat
+    assert coordinator.heartbeat('a', [job.job_id]) == [job.job_id]
+
+    job = coordinator.lease('b')
+    assert (job.job_id, job.attempts) == ('1:module', 2)
+
+
+def test_heartbeat_renews_the_lease(clock, no_sleep):
+    coordinator = create_coordinator([1])
+    job = coordinator.lease('a')
+
+    for _ in range(3):
+        clock[0] += 50
+        assert coordinator.heartbeat('a', [job.job_id]) == []
+        expire_leases(coordinator)
+
+    assert coordinator.get_status()['leased'] == 1
+    assert coordinator.heartbeat('b', [job.job_id]) == [job.job_id]
+
+
+def test_job_is_failed_after_max_attempts(clock, no_sleep):
+    coordinator = create_coordinator([1], max_attempts=2)
+
+    for worker_id in ('a', 'b'):
+        coordinator.lease(worker_id)
+        clock[0] += 61
+        expire_leases(coordinator)
+
+    assert coordinator.results == {'success': 0, 'fail': 1}
+    assert coordinator.lease('c') is None
+    assert coordinator._is_finished.is_set()
+
+
+def test_only_the_lease_holder_reports_a_failure(clock, no_sleep):
+    coordinator = create_coordinator([1])
+    coordinator.lease('a')
+    clock[0] += 61
+    expire_leases(coordinator)
+    job = coordinator.lease('b')
+
+    coordinator.complete('a', job.job_id, False, 'lease lost')
+    assert coordinator.get_status()['leased'] == 1
+
+    # the job is done on chain, whoever did it
+    coordinator.complete('a', job.job_id, True)
+    coordinator.complete('b', job.job_id, False, 'nonce too low')
+    assert coordinator.results == {'success': 1, 'fail': 0}
+
+
+def test_late_success_of_an_expired_lease_finishes_the_queued_job(clock, no_sleep):
+    coordinator = create_coordinator([1, 2])
+    job = coordinator.lease('a')
+    clock[0] += 61
+    expire_leases(coordinator)
+
+    coordinator.complete('a', job.job_id, True)
+
+    assert coordinator.results == {'success': 1, 'fail': 0}
+    assert coordinator.lease('b').job_id == '2:module'
+
+
+def test_resume_skips_jobs_that_succeeded_in_the_last_run(tmp_path, no_sleep):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    coordinator = create_coordinator([1, 2, 3], journal_path=journal_path)
+    for is_success in (True, False):
+        job = coordinator.lease('a')
+        coordinator.complete('a', job.job_id, is_success)
+    coordinator.lease('a')
+    # the coordinator crashed in the middle of a line
+    with open(journal_path, 'a', encoding='utf-8') as file:
+        file.write('{"time": 1, "run_id": "run", "ev')
+
+    resumed = Coordinator('module', port=0, journal_path=journal_path)
+
+    async def run():
+        task = asyncio.create_task(resumed.run([1, 2, 3], resume=True))
+        while not resumed._runner:
+            await asyncio.sleep(0)
+
+        leased = []
+        while job := resumed.lease('b'):
+            leased.append(job.job_id)
+            resumed.complete('b', job.job_id, True)
+
+        return leased, await task
+
+    leased, results = asyncio.run(run())
+
+    assert leased == ['2:module', '3:module']
+    assert results == {'success': 2, 'fail': 0}
+    assert resumed.run_id == 'run'
+    assert read_journal(journal_path)[-4:] == [
+        ('leased', '2:module', 'b'),
+        ('succeeded', '2:module', 'b'),
+        ('leased', '3:module', 'b'),
+        ('succeeded', '3:module', 'b'),
+    ]
+
+
+def test_resume_of_a_finished_run_serves_nothing(tmp_path):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    coordinator = create_coordinator([1], journal_path=journal_path)
+    coordinator.complete('a', coordinator.lease('a').job_id, True)
+
+    resumed = Coordinator('module', journal_path=journal_path)
+
+    assert asyncio.run(resumed.run([1], resume=True)) == {'success': 0, 'fail': 0}
+    assert resumed._runner is None
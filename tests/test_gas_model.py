@@ -0,0 +1,82 @@
+from min_library.models.transactions.gas_model import GasModel
+
+
+TX_PARAMS = {'chainId': 56, 'to': '0x' + '22' * 20, 'data': '0xa9059cbb' + '00' * 64}
+
+
+def observe_all(gas_model: GasModel, values: list[int], tx_params: dict = TX_PARAMS) -> None:
+    for value in values:
+        gas_model.observe(tx_params, {'status': 1, 'gasUsed': value})
+
+
+def test_merge_adds_the_samples_of_every_shard(tmp_path):
+    path = str(tmp_path / 'gas_model.json')
+    parent = GasModel(path=path, min_samples=4, percentile=100, headroom=0)
+
+    for gas_used in ((50_000, 51_000), (52_000, 60_000)):
+        shard = GasModel(path=path, min_samples=4, percentile=100, headroom=0)
+        for value in gas_used:
+            shard.observe(TX_PARAMS, {'status': 1, 'gasUsed': value})
+        parent.merge(shard.take_changes())
+
+    parent.save()
+
+    assert GasModel(path=path, min_samples=4, percentile=100, headroom=0).get_gas_limit(TX_PARAMS) == 60_000
+
+
+def test_gas_limit_is_given_only_with_enough_samples():
+    gas_model = GasModel(min_samples=5, percentile=100, headroom=0)
+
+    observe_all(gas_model, [21_000] * 4)
+    assert gas_model.get_gas_limit(TX_PARAMS) is None
+
+    observe_all(gas_model, [21_000])
+    assert gas_model.get_gas_limit(TX_PARAMS) == 21_000
+
+
+def test_gas_limit_is_the_percentile_with_headroom():
+    gas_model = GasModel(min_samples=5, percentile=95, headroom=0.2)
+    # 100_000 ... 120_000, the 95th percentile of 21 values is the 20th
+    observe_all(gas_model, [100_000 + 1_000 * index for index in range(20, -1, -1)])
+
+    assert gas_model.get_gas_limit(TX_PARAMS) == int(119_000 * 1.2)
+
+    # an outlier above the percentile does not raise the limit
+    observe_all(gas_model, [1_000_000])
+    assert gas_model.get_gas_limit(TX_PARAMS) == int(120_000 * 1.2)
+
+
+def test_reverted_and_unfinished_transactions_are_not_samples():
+    gas_model = GasModel(min_samples=1, percentile=100, headroom=0)
+
+    gas_model.observe(TX_PARAMS, {'status': 0, 'gasUsed': 30_000_000})
+    gas_model.observe(TX_PARAMS, None)
+    gas_model.observe(None, {'status': 1, 'gasUsed': 50_000})
+
+    assert gas_model.get_gas_limit(TX_PARAMS) is None
+
+
+def test_call_shapes_are_by_chain_contract_and_selector():
+    gas_model = GasModel(min_samples=1, percentile=100, headroom=0)
+    observe_all(gas_model, [50_000])
+
+    # other arguments of the same function
+    assert gas_model.get_gas_limit({**TX_PARAMS, 'data': '0xA9059CBB' + '11' * 64}) == 50_000
+    assert gas_model.get_gas_limit({**TX_PARAMS, 'chainId': 1}) is None
+    assert gas_model.get_gas_limit({**TX_PARAMS, 'to': '0x' + '33' * 20}) is None
+    assert gas_model.get_gas_limit({**TX_PARAMS, 'data': '0x095ea7b3' + '00' * 64}) is None
+    assert gas_model.get_gas_limit({**TX_PARAMS, 'data': bytes.fromhex(TX_PARAMS['data'][2:])}) == 50_000
+
+
+def test_only_the_latest_samples_are_kept():
+    gas_model = GasModel(min_samples=1, percentile=100, headroom=0, max_samples=3)
+    observe_all(gas_model, [90_000, 50_000, 50_000, 50_000])
+
+    assert gas_model.get_gas_limit(TX_PARAMS) == 50_000
+
+
+def test_disabled_model_gives_no_gas_limits():
+    gas_model = GasModel(min_samples=1, is_enabled=False)
+    observe_all(gas_model, [50_000])
+
+    assert gas_model.get_gas_limit(TX_PARAMS) is None
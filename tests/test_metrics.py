@@ -0,0 +1,50 @@
+import pytest
+
+import min_library.models.metrics.metrics as metrics_module
+from min_library.models.metrics.metrics import TXS_IN_FLIGHT, metrics, observe_tx_receipt, observe_tx_sent
+
+
+HASH_1 = '0x' + '11' * 32
+HASH_2 = '0x' + '22' * 32
+
+
+@pytest.fixture(autouse=True)
+def clean_in_flight(monkeypatch):
+    monkeypatch.setattr(metrics_module, '_txs_in_flight', {})
+    monkeypatch.setattr(TXS_IN_FLIGHT, 'values', {})
+
+
+def test_in_flight_counts_sent_transactions_until_their_receipts():
+    observe_tx_sent('bsc', HASH_1)
+    observe_tx_sent('bsc', bytes.fromhex(HASH_2[2:]))
+    assert TXS_IN_FLIGHT.get(network='bsc') == 2
+
+    observe_tx_receipt('bsc', bytes.fromhex(HASH_1[2:]), {'status': 1})
+    assert TXS_IN_FLIGHT.get(network='bsc') == 1
+
+
+def test_second_wait_for_the_same_transaction_does_not_go_negative():
+    observe_tx_sent('bsc', HASH_1)
+
+    observe_tx_receipt('bsc', HASH_1, {'status': 1})
+    observe_tx_receipt('bsc', HASH_1, {'status': 1})
+    # a transaction that was not sent by this process
+    observe_tx_receipt('bsc', HASH_2, None)
+    observe_tx_receipt('eth', HASH_2, None)
+
+    assert TXS_IN_FLIGHT.get(network='bsc') == 0
+    assert TXS_IN_FLIGHT.get(network='eth') == 0
+
+
+def test_transactions_nobody_waits_for_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(metrics_module.time, 'monotonic', lambda: now[0])
+
+    observe_tx_sent('bsc', HASH_1)
+    now[0] += metrics_module.TX_IN_FLIGHT_TTL / 2
+    observe_tx_sent('bsc', HASH_2)
+
+    now[0] += metrics_module.TX_IN_FLIGHT_TTL / 2 + 1
+    metrics.render()
+
+    assert TXS_IN_FLIGHT.get(network='bsc') == 1
@@ -0,0 +1,33 @@
+import json
+import urllib.request
+
+import pytest
+
+from min_library.models.mock_rpc.mock_rpc_server import MockRpcServer
+
+
+def request(url: str, method: str) -> dict:
+    data = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': []}).encode()
+    http_request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(http_request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_server_answers_json_rpc_and_stops():
+    with MockRpcServer() as server:
+        assert request(server.url, 'eth_chainId')['result'] == '0x1'
+        assert request(server.url, 'eth_unknown')['error']['code']
+
+    assert server._loop is None
+
+
+def test_start_raises_if_the_port_is_in_use():
+    with MockRpcServer() as server:
+        busy = MockRpcServer(port=server.port)
+
+        with pytest.raises(OSError):
+            busy.start(timeout=5)
+
+        # nothing to stop
+        busy.stop()
+        assert request(server.url, 'eth_chainId')['result'] == '0x1'
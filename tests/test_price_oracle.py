@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+import min_library.models.prices.price_oracle as price_oracle_module
+from min_library.models.prices.price_oracle import PriceOracle
+
+
+class FakeFetch:
+    """
+    Replaces PriceOracle._fetch, counts the fetched symbols.
+    """
+
+    def __init__(self, prices: dict[str, float], event: asyncio.Event | None = None) -> None:
+        self.prices = prices
+        self.event = event
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, symbols: list[str]) -> dict[str, float]:
+        self.calls.append(sorted(symbols))
+        if self.event:
+            await self.event.wait()
+
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+def test_prices_are_cached_for_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(price_oracle_module.time, 'monotonic', lambda: now[0])
+    oracle = PriceOracle(ttl=60)
+    oracle._fetch = fetch = FakeFetch({'ETH': 3000, 'BNB': 500})
+
+    assert asyncio.run(oracle.get_prices(['ETH', 'WBNB', 'USDC'])) == {'ETH': 3000, 'BNB': 500, 'USDC': 1.0}
+    now[0] += 60
+    assert asyncio.run(oracle.get_price('ETH', 'BNB')) == 6
+    now[0] += 1
+    asyncio.run(oracle.get_prices(['eth']))
+
+    assert fetch.calls == [['BNB', 'ETH'], ['ETH']]
+
+
+def test_concurrent_requests_share_one_fetch():
+    oracle = PriceOracle()
+
+    async def run():
+        oracle._fetch = fetch = FakeFetch({'ETH': 3000, 'BNB': 500}, asyncio.Event())
+        tasks = [
+            asyncio.create_task(oracle.get_prices(['ETH'])),
+            asyncio.create_task(oracle.get_prices(['ETH', 'BNB'])),
+        ]
+        await asyncio.sleep(0)
+        fetch.event.set()
+
+        return fetch, await asyncio.gather(*tasks)
+
+    fetch, results = asyncio.run(run())
+
+    assert fetch.calls == [['ETH'], ['BNB']]
+    assert results == [{'ETH': 3000}, {'ETH': 3000, 'BNB': 500}]
+
+
+def test_unknown_symbol_fails_only_its_callers():
+    oracle = PriceOracle()
+    oracle._fetch = FakeFetch({'ETH': 3000})
+
+    with pytest.raises(ValueError, match='XYZUSDT'):
+        asyncio.run(oracle.get_prices(['ETH', 'XYZ']))
+    assert asyncio.run(oracle.get_prices(['ETH'])) == {'ETH': 3000}
+
+
+def test_cancelled_fetch_does_not_hang_other_callers():
+    oracle = PriceOracle()
+
+    async def run():
+        oracle._fetch = FakeFetch({'ETH': 3000}, asyncio.Event())
+        first = asyncio.create_task(oracle.get_prices(['ETH']))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(oracle.get_prices(['ETH']))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(ValueError, match='cancelled'):
+            await asyncio.wait_for(second, 5)
+
+        # the next request fetches again
+        oracle._fetch = FakeFetch({'ETH': 3000})
+        return await oracle.get_prices(['ETH'])
+
+    assert asyncio.run(run()) == {'ETH': 3000}
+
+
+def test_batch_with_an_unknown_pair_is_asked_one_by_one():
+    oracle = PriceOracle()
+    requests = []
+    tickers = {'ETHUSDT': 3000.0, 'USDTXDAI': 0.5}
+
+    async def request_tickers(session, pairs):
+        requests.append(pairs)
+        # Binance fails the whole batch with 400 if one pair is unknown
+        if any(pair not in tickers for pair in pairs):
+            return None
+        return {pair: tickers[pair] for pair in pairs}
+
+    oracle._request_tickers = request_tickers
+
+    assert asyncio.run(oracle.get_prices(['ETH', 'XDAI'])) == {'ETH': 3000.0, 'XDAI': 2.0}
+    assert sorted(requests[0]) == ['ETHUSDT', 'XDAIUSDT']
+    assert sorted(requests[1:3]) == [['ETHUSDT'], ['XDAIUSDT']]
+    assert requests[3:] == [['USDTXDAI']]
+
+
+def test_prices_file_is_used_instead_of_the_network(tmp_path):
+    path = tmp_path / 'prices.json'
+    path.write_text(json.dumps({'ETHUSDT': 3000, 'BNB': '500.5'}))
+    oracle = PriceOracle(prices_file=str(path))
+
+    assert asyncio.run(oracle.get_prices(['WETH', 'BNB'])) == {'ETH': 3000.0, 'BNB': 500.5}
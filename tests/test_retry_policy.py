@@ -0,0 +1,248 @@
+import asyncio
+
+import pytest
+from aiohttp import ClientConnectionError, ClientResponseError
+from web3.exceptions import ContractLogicError
+
+import min_library.models.others.exceptions as exceptions
+import min_library.models.retry.retry_policy as retry_policy_module
+from min_library.models.retry.retry_policy import (
+    CircuitBreaker,
+    ErrorClass,
+    RetryBudget,
+    RetryPolicy,
+    RetryRule,
+    build_retry_middleware,
+    classify_error
+)
+
+
+def response_error(status: int) -> ClientResponseError:
+    return ClientResponseError(request_info=None, history=(), status=status)
+
+
+@pytest.mark.parametrize(('error', 'error_class'), [
+    (ValueError({'code': -32000, 'message': 'insufficient funds for gas * price + value'}),
+     ErrorClass.INSUFFICIENT_FUNDS),
+    (ValueError({'code': -32000, 'message': 'already known'}), ErrorClass.KNOWN),
+    (ValueError({'code': -32000, 'message': 'replacement transaction underpriced'}), ErrorClass.UNDERPRICED),
+    (ValueError({'code': -32000, 'message': 'max fee per gas less than block base fee'}), ErrorClass.UNDERPRICED),
+    (ValueError({'code': -32000, 'message': 'nonce too low: next nonce 8, tx nonce 5'}), ErrorClass.NONCE),
+    (ValueError({'code': -32000, 'message': 'header not found'}), ErrorClass.TRANSIENT),
+    (ValueError({'code': -32005, 'message': 'daily request count exceeded'}), ErrorClass.RATE_LIMITED),
+    (ValueError({'code': -32603, 'message': 'internal error'}), ErrorClass.TRANSIENT),
+    (ValueError({'code': -32602, 'message': 'invalid argument 0'}), ErrorClass.FATAL),
+    ({'code': 429, 'message': 'Too Many Requests'}, ErrorClass.RATE_LIMITED),
+    (ContractLogicError('execution reverted: TRANSFER_FAILED'), ErrorClass.REVERT),
+    (response_error(429), ErrorClass.RATE_LIMITED),
+    (response_error(502), ErrorClass.TRANSIENT),
+    (response_error(404), ErrorClass.FATAL),
+    (ClientConnectionError(), ErrorClass.TRANSIENT),
+    (asyncio.TimeoutError(), ErrorClass.TRANSIENT),
+    (ConnectionResetError(), ErrorClass.TRANSIENT),
+    (exceptions.RetryableRPCError({'error': {'code': -32000, 'message': 'request timed out'}}), ErrorClass.TRANSIENT),
+    (Exception('Execution reverted'), ErrorClass.REVERT),
+    (KeyError('data'), ErrorClass.FATAL),
+])
+def test_classify_error(error, error_class):
+    assert classify_error(error) == error_class
+
+
+def test_the_first_matching_message_decides_the_class():
+    # a transaction with a low nonce may also be reported as underpriced by some nodes
+    assert classify_error({'message': 'insufficient funds, nonce too low'}) == ErrorClass.INSUFFICIENT_FUNDS
+    assert classify_error({'message': 'transaction underpriced: nonce too low'}) == ErrorClass.UNDERPRICED
+
+
+def test_retry_rule_delay_is_jittered_exponential_backoff_with_cap():
+    rule = RetryRule(max_attempts=10, base_delay=1, max_delay=5)
+
+    for attempt, max_delay in [(1, 1), (2, 2), (3, 4), (4, 5), (9, 5)]:
+        delays = [rule.get_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= max_delay for delay in delays)
+        assert max(delays) > max_delay / 2
+
+
+def test_circuit_breaker_opens_after_failures_and_lets_one_probe_through(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(retry_policy_module.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow()
+    # only one request probes the endpoint
+    assert not breaker.allow()
+
+    # a failed probe opens the circuit at once
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow() and breaker.allow()
+
+
+def test_circuit_breaker_counts_failures_in_a_row():
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert not breaker.is_open
+
+
+def test_retry_budget_refills_by_requests():
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+
+    budget.record_request()
+    assert not budget.try_spend()
+    budget.record_request()
+    assert budget.try_spend()
+
+    for _ in range(10):
+        budget.record_request()
+    assert budget.tokens == 2
+
+
+def test_get_retry_delay_follows_rules_and_budget():
+    policy = RetryPolicy(rules={ErrorClass.TRANSIENT: RetryRule(3)}, budget_max=3)
+
+    assert policy.get_retry_delay(ErrorClass.FATAL, 1) is None
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 1) == 0
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 2) == 0
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 3) is None
+
+    # budgets are by endpoint
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 1, 'bsc:a') == 0
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 1, 'bsc:a') == 0
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 1, 'bsc:a') == 0
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 1, 'bsc:a') is None
+    assert policy.get_retry_delay(ErrorClass.TRANSIENT, 1, 'bsc:b') == 0
+
+    assert policy.retries == {ErrorClass.TRANSIENT: 6}
+
+
+def test_call_retries_retryable_errors_and_calls_on_retry(no_sleep):
+    policy = RetryPolicy(rules={ErrorClass.TRANSIENT: RetryRule(3), ErrorClass.NONCE: RetryRule(3)})
+    errors = [asyncio.TimeoutError(), ValueError({'message': 'nonce too low'})]
+    retried = []
+
+    async def func(value):
+        if errors:
+            raise errors.pop(0)
+        return value
+
+    async def on_retry(error_class):
+        retried.append(error_class)
+
+    assert asyncio.run(policy.call(func, 'ok', on_retry=on_retry)) == 'ok'
+    assert retried == [ErrorClass.TRANSIENT, ErrorClass.NONCE]
+    assert len(no_sleep) == 2
+
+
+def test_call_raises_errors_that_are_not_retried(no_sleep):
+    policy = RetryPolicy(rules={ErrorClass.TRANSIENT: RetryRule(3)})
+    calls = []
+
+    async def func():
+        calls.append(1)
+        raise ContractLogicError('execution reverted')
+
+    with pytest.raises(ContractLogicError):
+        asyncio.run(policy.call(func))
+    assert len(calls) == 1
+    # a revert does not mean the endpoint is down
+    assert not policy.get_breaker('').is_open
+
+
+def test_call_fails_fast_while_the_breaker_is_open(no_sleep):
+    policy = RetryPolicy(rules={ErrorClass.TRANSIENT: RetryRule(10)}, breaker_failures=2, breaker_reset=60)
+    calls = []
+
+    async def func():
+        calls.append(1)
+        raise ConnectionResetError()
+
+    # the call that opens the circuit raises its own error
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(policy.call(func, endpoint='bsc:a'))
+    assert len(calls) == 2
+
+    with pytest.raises(exceptions.CircuitBreakerOpen):
+        asyncio.run(policy.call(func, endpoint='bsc:a'))
+    assert len(calls) == 2
+
+    async def other():
+        return 1
+
+    assert asyncio.run(policy.call(other, endpoint='bsc:b')) == 1
+
+
+def test_cancelled_probe_does_not_keep_the_circuit_open(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(retry_policy_module.time, 'monotonic', lambda: now[0])
+    policy = RetryPolicy(rules={}, breaker_failures=1, breaker_reset=10)
+    hang_started = []
+
+    async def fail():
+        raise ConnectionResetError()
+
+    async def hang():
+        hang_started.append(1)
+        await asyncio.Event().wait()
+
+    async def ok():
+        return 1
+
+    async def run():
+        with pytest.raises(ConnectionResetError):
+            await policy.call(fail)
+
+        now[0] += 10
+        task = asyncio.create_task(policy.call(hang))
+        while not hang_started:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        return await policy.call(ok)
+
+    assert asyncio.run(run()) == 1
+    assert not policy.get_breaker('').is_open
+
+
+def test_retry_middleware_retries_reads_only(no_sleep):
+    policy = RetryPolicy(rules={ErrorClass.TRANSIENT: RetryRule(2)})
+    error = {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'header not found'}}
+    requests = []
+
+    async def make_request(method, params):
+        requests.append(method)
+        return error
+
+    async def run():
+        middleware = await build_retry_middleware('bsc', 'http://node', policy)(make_request, None)
+        return [
+            await middleware('eth_call', []),
+            await middleware('eth_sendRawTransaction', ['0x00']),
+        ]
+
+    responses = asyncio.run(run())
+
+    assert responses == [error, error]
+    assert requests == ['eth_call', 'eth_call', 'eth_sendRawTransaction']
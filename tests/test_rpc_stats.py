@@ -0,0 +1,35 @@
+import asyncio
+
+from min_library.models.rpc.rpc_stats import RpcStats, build_rpc_stats_middleware
+
+
+def request(is_payload_sizes: bool) -> RpcStats:
+    stats = RpcStats()
+    response = {'jsonrpc': '2.0', 'id': 1, 'result': '0x' + '00' * 1000}
+
+    async def make_request(method, params):
+        return response
+
+    async def run():
+        middleware = await build_rpc_stats_middleware(
+            'bsc', 'http://127.0.0.1:8545', stats=stats, is_payload_sizes=is_payload_sizes
+        )(make_request, None)
+        assert await middleware('eth_call', [{'to': '0x00'}, 'latest']) is response
+
+    asyncio.run(run())
+
+    return stats
+
+
+def test_payload_sizes_are_not_counted_by_default():
+    method_stats, = request(is_payload_sizes=False).methods.values()
+
+    assert method_stats.count == 1
+    assert method_stats.request_bytes == method_stats.response_bytes == 0
+
+
+def test_payload_sizes_are_counted_when_enabled():
+    method_stats, = request(is_payload_sizes=True).methods.values()
+
+    assert method_stats.request_bytes > 0
+    assert method_stats.response_bytes > 2000
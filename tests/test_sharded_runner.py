@@ -0,0 +1,77 @@
+import asyncio
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+import min_library.models.runner.sharded_runner as sharded_runner_module
+from min_library.models.runner.sharded_runner import ShardedRunner
+
+
+class LateQueue(queue.Queue):
+    """
+    A queue whose first get times out, like a shard that writes its last messages right after the timeout.
+    """
+
+    def __init__(self, messages: list[tuple]) -> None:
+        super().__init__()
+        self.is_late = True
+        for message in messages:
+            self.put(message)
+
+    def get(self, block: bool = True, timeout: float | None = None) -> tuple:
+        if self.is_late:
+            self.is_late = False
+            raise queue.Empty
+
+        return super().get(block, timeout)
+
+
+class FakeStore:
+    def __init__(self) -> None:
+        self.changes = []
+
+    def merge(self, changes) -> None:
+        self.changes.append(changes)
+
+
+@pytest.fixture
+def store(monkeypatch) -> FakeStore:
+    store = FakeStore()
+    monkeypatch.setattr(sharded_runner_module, 'STORES', {'gas_samples': store})
+
+    return store
+
+
+def read_messages(messages: list[tuple], pids: list[int]) -> ShardedRunner:
+    runner = ShardedRunner(SimpleNamespace(__name__='module'), shards=len(pids))
+    processes = [SimpleNamespace(pid=pid, exitcode=0, is_alive=lambda: False) for pid in pids]
+    for pid in pids:
+        runner._in_flight[pid] = set()
+
+    asyncio.run(runner._read_messages(LateQueue(messages), processes))
+
+    return runner
+
+
+def test_last_messages_of_exited_shards_are_read(store):
+    runner = read_messages([
+        ('started', 1, 'a'),
+        ('finished', 1, 'a', True),
+        ('stores', 1, {'gas_samples': {'56:0x:0x': [21000]}}),
+        ('done', 1),
+    ], [1])
+
+    assert runner.results == {'success': 1, 'fail': 0}
+    assert store.changes == [{'56:0x:0x': [21000]}]
+
+
+def test_accounts_of_a_crashed_shard_are_failed(store):
+    runner = read_messages([
+        ('started', 1, 'a'),
+        ('started', 2, 'b'),
+        ('finished', 2, 'b', True),
+        ('done', 2),
+    ], [1, 2])
+
+    assert runner.results == {'success': 1, 'fail': 1}
@@ -0,0 +1,106 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from min_library.models.others.token_amount import TokenAmount, percent_to_bps
+from min_library.models.swap.swap_info import SwapInfo
+from tasks.swap_task import SwapTask
+
+
+def test_equal_amounts_have_equal_hashes():
+    amount = TokenAmount(5, decimals=6, wei=True)
+
+    assert amount == 5
+    assert hash(amount) == hash(5)
+    assert {amount, 5} == {5}
+    assert {5: 'int'}[amount] == 'int'
+    assert TokenAmount(5, decimals=18, wei=True) != amount
+
+
+def test_ether_amounts_are_converted_without_float_errors():
+    assert TokenAmount(0.1, decimals=18).Wei == 10 ** 17
+    assert TokenAmount('1.000001', decimals=6).Wei == 1_000_001
+    assert TokenAmount(3, decimals=6).Wei == 3_000_000
+    # the extra digits don't fit into the decimals and are cut
+    assert TokenAmount('0.0000019', decimals=6).Wei == 1
+    assert TokenAmount(1_000_001, decimals=6, wei=True).Ether == Decimal('1.000001')
+
+
+def test_arithmetic_is_exact_and_refuses_other_decimals():
+    amount = TokenAmount(10, decimals=6, wei=True)
+
+    assert (amount + 1).Wei == 11
+    assert (1 + amount).Wei == 11
+    assert (amount - TokenAmount(4, decimals=6, wei=True)).Wei == 6
+    assert (amount * 3).Wei == 30
+    assert (amount * 0.15).Wei == 1
+    assert (amount // 3).Wei == 3
+    assert min(amount, TokenAmount(9, decimals=6, wei=True)).Wei == 9
+
+    with pytest.raises(ValueError):
+        amount + TokenAmount(1, decimals=18, wei=True)
+    with pytest.raises(TypeError):
+        amount + 1.5
+
+
+def test_mul_div_rounds_down():
+    assert TokenAmount(10, wei=True).mul_div(1, 3).Wei == 3
+    assert TokenAmount(2 ** 255, wei=True).mul_div(3, 2 ** 200).Wei == 3 * 2 ** 55
+    assert TokenAmount(1, wei=True).mul_div(9_999, 10_000).Wei == 0
+
+
+@pytest.mark.parametrize('wei, slippage_bps, expected', [
+    (1_000_000, 50, 995_000),
+    (1_000_001, 50, 995_000),
+    (199, 50, 198),
+    (1, 1, 0),
+    (1_000_000, 0, 1_000_000),
+    (1_000_000, 10_000, 0),
+    (10 ** 30 + 7, 1, 999_900_000_000_000_000_000_000_000_006),
+])
+def test_apply_slippage_rounds_down(wei, slippage_bps, expected):
+    assert TokenAmount(wei, wei=True).apply_slippage(slippage_bps).Wei == expected
+
+
+@pytest.mark.parametrize('percent, bps', [
+    (0.5, 50), (1, 100), (0.1, 10), (0.35, 35), (3.3, 330), (Decimal('0.01'), 1), (0, 0),
+])
+def test_percent_to_bps(percent, bps):
+    assert percent_to_bps(percent) == bps
+
+
+def compute_source_amount(balance_wei: int, **swap_info_fields) -> int:
+    async def get_balance(token=None):
+        return TokenAmount(balance_wei, decimals=18, wei=True)
+
+    client = SimpleNamespace(
+        account_manager=SimpleNamespace(
+            network=SimpleNamespace(name='bsc'),
+            custom_logger=SimpleNamespace(module_name=None)
+        ),
+        contract=SimpleNamespace(get_balance=get_balance)
+    )
+    swap_info = SwapInfo(from_token='USDT', to_token='USDC')
+    for name, value in swap_info_fields.items():
+        setattr(swap_info, name, value)
+
+    swap_query = asyncio.run(SwapTask(client).compute_source_token_amount(swap_info))
+
+    return swap_query.amount_from.Wei
+
+
+def test_source_amount_is_the_balance_by_default():
+    assert compute_source_amount(123) == 123
+
+
+def test_source_amount_is_capped_by_the_balance():
+    assert compute_source_amount(5 * 10 ** 18, amount=2) == 2 * 10 ** 18
+    assert compute_source_amount(10 ** 18, amount=2) == 10 ** 18
+
+
+def test_source_amount_by_percent_goes_before_the_amount():
+    assert compute_source_amount(10 ** 18, amount=0.1, amount_by_percent=0.35) == 35 * 10 ** 16
+    # about 12.345% of 1001 Wei is 123.57 Wei, rounded down
+    assert compute_source_amount(1001, amount_by_percent=0.12345) == 123
@@ -0,0 +1,159 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from eth_account import Account
+from eth_utils import keccak
+from web3.exceptions import TransactionNotFound
+
+import min_library.models.others.exceptions as exceptions
+import min_library.models.transactions.transaction as transaction_module
+from min_library.models.networks.network import Network
+from min_library.models.retry.retry_policy import RetryPolicy, RetryRule
+from min_library.models.runner.job_lease import JobLease, current_lease
+from min_library.models.transactions.transaction import Transaction
+
+
+NONCE_TOO_LOW = ValueError({'code': -32000, 'message': 'nonce too low'})
+UNDERPRICED = ValueError({'code': -32000, 'message': 'replacement transaction underpriced'})
+
+
+class FakeEth:
+    """
+    Replays the given outcomes of eth_sendRawTransaction.
+
+    An outcome is an exception to raise or None to accept the transaction,
+    ('lost', exception) accepts it and raises the exception, like a response
+    lost after the node got the request.
+
+    """
+
+    def __init__(self, outcomes: list) -> None:
+        self.outcomes = list(outcomes)
+        self.sent: list[bytes] = []
+        self.known: set[bytes] = set()
+        self.pending_nonce = 7
+
+    @property
+    async def gas_price(self) -> int:
+        return 10 ** 9
+
+    async def send_raw_transaction(self, transaction: bytes) -> bytes:
+        self.sent.append(bytes(transaction))
+        tx_hash = keccak(transaction)
+
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if isinstance(outcome, tuple):
+            self.known.add(tx_hash)
+            raise outcome[1]
+        if outcome:
+            raise outcome
+
+        self.known.add(tx_hash)
+        return tx_hash
+
+    async def get_transaction(self, tx_hash: bytes) -> dict:
+        if bytes(tx_hash) not in self.known:
+            raise TransactionNotFound(f'{tx_hash!r} is not found')
+        return {'hash': tx_hash}
+
+    async def get_transaction_count(self, address: str, block: str = 'latest') -> int:
+        return self.pending_nonce
+
+
+def send(outcomes: list) -> tuple[FakeEth, object]:
+    eth = FakeEth(outcomes)
+    account = Account.from_key('0x' + '11' * 32)
+    account_manager = SimpleNamespace(
+        account=account,
+        network=Network(name='test', rpc='http://fake', chain_id=1, coin_symbol='ETH', decimals=18),
+        w3=SimpleNamespace(eth=eth, provider=SimpleNamespace(endpoint_uri='http://fake'))
+    )
+    tx_params = {
+        'chainId': 1,
+        'nonce': 5,
+        'from': account.address,
+        'to': '0x000000000000000000000000000000000000dEaD',
+        'value': 1,
+        'gas': 21000,
+    }
+
+    async def run():
+        return await Transaction(account_manager).sign_and_send(tx_params)
+
+    try:
+        return eth, asyncio.run(run())
+    except Exception as e:
+        return eth, e
+
+
+@pytest.fixture(autouse=True)
+def policy(monkeypatch, no_sleep):
+    monkeypatch.setattr(transaction_module, 'retry_policy', RetryPolicy(
+        rules={
+            'transient': RetryRule(4),
+            'nonce': RetryRule(3),
+            'underpriced': RetryRule(3),
+        },
+        budget_max=100
+    ))
+
+
+def test_lost_response_then_nonce_too_low_returns_first_transaction():
+    eth, tx = send([('lost', asyncio.TimeoutError()), NONCE_TOO_LOW])
+
+    assert len(eth.sent) == 2
+    # the same signed transaction was sent again, nothing new was signed
+    assert eth.sent[0] == eth.sent[1]
+    assert bytes(tx.hash) == keccak(eth.sent[0])
+    assert tx.params['nonce'] == 5
+
+
+def test_timeout_then_nonce_too_low_does_not_sign_again():
+    eth, error = send([asyncio.TimeoutError(), NONCE_TOO_LOW])
+
+    # the first transaction is not found, but it may still be accepted by another node
+    assert error is NONCE_TOO_LOW
+    assert len(eth.sent) == 2
+
+
+def test_nonce_too_low_without_timeouts_signs_with_pending_nonce():
+    eth, tx = send([NONCE_TOO_LOW])
+
+    assert len(eth.sent) == 2
+    assert eth.sent[0] != eth.sent[1]
+    assert tx.params['nonce'] == eth.pending_nonce
+
+
+def test_lost_response_then_underpriced_returns_first_transaction():
+    eth, tx = send([('lost', ConnectionError()), UNDERPRICED])
+
+    assert len(eth.sent) == 2
+    assert tx.params['gasPrice'] == 10 ** 9
+
+
+def test_underpriced_without_timeouts_bumps_gas_price():
+    eth, tx = send([UNDERPRICED])
+
+    assert len(eth.sent) == 2
+    assert tx.params['gasPrice'] > 10 ** 9
+
+
+def test_already_known_returns_hash_of_signed_transaction():
+    eth, tx = send([ValueError({'code': -32000, 'message': 'already known'})])
+
+    assert len(eth.sent) == 1
+    assert bytes(tx.hash) == keccak(eth.sent[0])
+
+
+def test_job_with_lost_lease_sends_nothing():
+    lease = JobLease('1:module')
+    lease.is_lost = True
+    token = current_lease.set(lease)
+    try:
+        eth, error = send([])
+    finally:
+        current_lease.reset(token)
+
+    assert isinstance(error, exceptions.LeaseLost)
+    assert eth.sent == []
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from min_library.models.swap.v2_quoter import V2Quoter, get_amount_out, sort_tokens
+
+
+TOKEN_A = '0x' + '11' * 20
+TOKEN_B = '0x' + '22' * 20
+PAIR = '0x' + '33' * 20
+PATH = [TOKEN_A, TOKEN_B]
+
+
+class FakeRouter:
+    def __init__(self, quoter: V2Quoter) -> None:
+        self.quoter = quoter
+        self.calls = 0
+        # the share of the output lost on transfer (a fee-on-transfer token)
+        self.transfer_fee = 0
+        self.functions = SimpleNamespace(getAmountsOut=self.get_amounts_out)
+
+    def get_amounts_out(self, amount_in: int, path: list[str]) -> SimpleNamespace:
+        async def call() -> list[int]:
+            self.calls += 1
+            amounts = self.quoter.quote(amount_in, tuple(path))
+            amounts[-1] -= amounts[-1] * self.transfer_fee // 100
+            return amounts
+
+        return SimpleNamespace(call=call)
+
+
+def create_quoter(**kwargs) -> tuple[V2Quoter, FakeRouter]:
+    quoter = V2Quoter(reserves_ttl=3600, **kwargs)
+    # the reserves are known already, nothing is fetched
+    quoter._pairs[sort_tokens(TOKEN_A, TOKEN_B)] = PAIR
+    quoter._reserves[PAIR] = (10 ** 24, 2 * 10 ** 24)
+    quoter._updated_at = time.monotonic()
+
+    return quoter, FakeRouter(quoter)
+
+
+def quote(quoter: V2Quoter, router: FakeRouter, times: int = 1) -> list[int]:
+    async def run():
+        for _ in range(times):
+            amounts = await quoter.get_amounts_out(router, 10 ** 18, PATH)
+        return amounts
+
+    return asyncio.run(run())
+
+
+def test_get_amount_out_matches_uniswap_v2_library():
+    assert get_amount_out(1000, 10_000, 10_000) == 906
+
+    # UniswapV2Library.getAmountOut with its 997 / 1000
+    amount_in, reserve_in, reserve_out = 123 * 10 ** 18, 4 * 10 ** 22, 7 * 10 ** 24
+    amount_in_with_fee = amount_in * 997
+    assert get_amount_out(amount_in, reserve_in, reserve_out) == (
+        amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee)
+    )
+
+
+def test_matched_path_is_checked_again_after_verify_every_quotes():
+    quoter, router = create_quoter(verify_every=3)
+
+    quote(quoter, router)
+    assert router.calls == 1
+
+    quote(quoter, router, times=3)
+    assert router.calls == 1
+
+    quote(quoter, router)
+    assert router.calls == 2
+
+
+def test_matched_path_is_checked_again_after_verify_ttl():
+    quoter, router = create_quoter(verify_every=100, verify_ttl=60)
+
+    quote(quoter, router)
+    quoter._verified_paths[tuple(PATH)] = (time.monotonic() - 61, 100)
+    quote(quoter, router)
+
+    assert router.calls == 2
+
+
+def test_fee_on_transfer_found_on_check_again_uses_router_since():
+    quoter, router = create_quoter(verify_every=1)
+    quote(quoter, router, times=2)
+    assert router.calls == 1
+
+    router.transfer_fee = 5
+    amounts = quote(quoter, router, times=3)
+
+    assert router.calls == 4
+    assert amounts[-1] < quoter.quote(10 ** 18, tuple(PATH))[-1]
+
+
+def test_invalidate_checks_path_against_router_again():
+    quoter, router = create_quoter(verify_every=100)
+    quote(quoter, router, times=2)
+
+    quoter.invalidate([TOKEN_A.upper().replace('0X', '0x'), TOKEN_B])
+    quote(quoter, router)
+
+    assert router.calls == 2
@@ -0,0 +1,146 @@
+import asyncio
+import math
+
+import pytest
+
+from min_library.models.swap.v3_quoter import Q96, PoolState, V3Quoter, compute_pool_address, sort_tokens
+
+
+PANCAKE_DEPLOYER = '0x41ff9AA7e16B8B1a8a8dc4f0eFacd93D02d071c9'
+PANCAKE_INIT_CODE_HASH = '0x6ce8eb472fa82df5469c6ab6d485f17c3ad13c8cd7af59b3d4a8026c5ce0f7e2'
+UNISWAP_FACTORY = '0x1F98431c8aD98523631AE4a59f267346ea31F984'
+UNISWAP_INIT_CODE_HASH = '0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54'
+
+BSC_WBNB = '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c'
+BSC_USDT = '0x55d398326f99059fF775485246999027B3197955'
+ETH_USDC = '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48'
+ETH_WETH = '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2'
+
+TOKEN_0 = '0x1000000000000000000000000000000000000000'
+TOKEN_1 = '0x2000000000000000000000000000000000000000'
+
+
+# the SqrtPriceMath and SwapMath of Uniswap V3 with the rounding of the contracts,
+# it is what QuoterV2 runs for a swap that does not cross a tick
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    return -(-a * b // denominator)
+
+
+def get_next_sqrt_price_from_input(sqrt_price: int, liquidity: int, amount_in: int, zero_for_one: bool) -> int:
+    if zero_for_one:
+        numerator = liquidity << 96
+        return mul_div_rounding_up(numerator, sqrt_price, numerator + amount_in * sqrt_price)
+
+    return sqrt_price + (amount_in << 96) // liquidity
+
+
+def get_amount_0_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    sqrt_a, sqrt_b = sorted((sqrt_a, sqrt_b))
+    if round_up:
+        return -(-mul_div_rounding_up(liquidity << 96, sqrt_b - sqrt_a, sqrt_b) // sqrt_a)
+
+    return (liquidity << 96) * (sqrt_b - sqrt_a) // sqrt_b // sqrt_a
+
+
+def get_amount_1_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    sqrt_a, sqrt_b = sorted((sqrt_a, sqrt_b))
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_b - sqrt_a, Q96)
+
+    return liquidity * (sqrt_b - sqrt_a) // Q96
+
+
+def compute_swap_step_out(sqrt_price: int, liquidity: int, amount_in: int, fee: int, zero_for_one: bool) -> int:
+    amount = amount_in * (10 ** 6 - fee) // 10 ** 6
+    next_sqrt_price = get_next_sqrt_price_from_input(sqrt_price, liquidity, amount, zero_for_one)
+
+    if zero_for_one:
+        return get_amount_1_delta(next_sqrt_price, sqrt_price, liquidity, False)
+
+    return get_amount_0_delta(sqrt_price, next_sqrt_price, liquidity, False)
+
+
+def encode_price_sqrt(reserve_1: int, reserve_0: int) -> int:
+    return math.isqrt(reserve_1 * Q96 * Q96 // reserve_0)
+
+
+def create_pool(sqrt_price_x96: int, liquidity: int, fee: int = 500) -> PoolState:
+    tick = math.floor(math.log((sqrt_price_x96 / Q96) ** 2, 1.0001))
+    return PoolState(address='0x' + '00' * 20, fee=fee, sqrt_price_x96=sqrt_price_x96, tick=tick, liquidity=liquidity)
+
+
+@pytest.mark.parametrize(('deployer', 'init_code_hash', 'token_a', 'token_b', 'fee', 'address'), [
+    # PancakeSwap V3 WBNB/USDT on BNB Chain
+    (PANCAKE_DEPLOYER, PANCAKE_INIT_CODE_HASH, BSC_WBNB, BSC_USDT, 500, '0x36696169C63e42cd08ce11f5deeBbCeBae652050'),
+    (PANCAKE_DEPLOYER, PANCAKE_INIT_CODE_HASH, BSC_USDT, BSC_WBNB, 100, '0x172fcD41E0913e95784454622d1c3724f546f849'),
+    # Uniswap V3 USDC/WETH on Ethereum
+    (UNISWAP_FACTORY, UNISWAP_INIT_CODE_HASH, ETH_USDC, ETH_WETH, 500, '0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640'),
+])
+def test_compute_pool_address_matches_deployed_pools(deployer, init_code_hash, token_a, token_b, fee, address):
+    assert compute_pool_address(deployer, init_code_hash, token_a, token_b, fee) == address
+
+
+def test_reference_math_matches_uniswap_vectors():
+    # SqrtPriceMath.spec.ts of Uniswap v3-core
+    price = encode_price_sqrt(1, 1)
+    assert get_next_sqrt_price_from_input(price, 10 ** 18, 10 ** 17, False) == 87150978765690771352898345369
+    assert get_next_sqrt_price_from_input(price, 10 ** 18, 10 ** 17, True) == 72025602285694852357767227579
+
+    price_121_100 = encode_price_sqrt(121, 100)
+    assert get_amount_0_delta(price, price_121_100, 10 ** 18, True) == 90909090909090910
+    assert get_amount_0_delta(price, price_121_100, 10 ** 18, False) == 90909090909090909
+    assert get_amount_1_delta(price, price_121_100, 10 ** 18, True) == 100000000000000000
+    assert get_amount_1_delta(price, price_121_100, 10 ** 18, False) == 99999999999999999
+
+
+@pytest.mark.parametrize('fee', [100, 500, 2500, 10000])
+@pytest.mark.parametrize('zero_for_one', [True, False])
+@pytest.mark.parametrize(('sqrt_price_x96', 'liquidity', 'amount_in'), [
+    (encode_price_sqrt(121, 100), 10 ** 24, 10 ** 17),
+    # about 600 USDT per BNB
+    (encode_price_sqrt(600, 1), 3 * 10 ** 24, 10 ** 15),
+    (encode_price_sqrt(1, 3000 * 10 ** 12), 10 ** 20, 12345),
+])
+def test_quote_in_tick_matches_swap_step(fee, zero_for_one, sqrt_price_x96, liquidity, amount_in):
+    quoter = V3Quoter(PANCAKE_DEPLOYER, PANCAKE_INIT_CODE_HASH, {fee: 10 ** 5})
+    pool = create_pool(sqrt_price_x96, liquidity, fee)
+    token_in, token_out = (TOKEN_0, TOKEN_1) if zero_for_one else (TOKEN_1, TOKEN_0)
+
+    assert quoter.quote_in_tick(pool, token_in, token_out, amount_in) == compute_swap_step_out(
+        sqrt_price_x96, liquidity, amount_in, fee, zero_for_one
+    )
+
+
+@pytest.mark.parametrize('zero_for_one', [True, False])
+def test_quote_in_tick_leaves_swaps_crossing_a_tick_to_the_quoter(zero_for_one):
+    quoter = V3Quoter(PANCAKE_DEPLOYER, PANCAKE_INIT_CODE_HASH, {500: 10})
+    pool = create_pool(encode_price_sqrt(121, 100), 10 ** 18)
+    token_in, token_out = (TOKEN_0, TOKEN_1) if zero_for_one else (TOKEN_1, TOKEN_0)
+
+    assert quoter.quote_in_tick(pool, token_in, token_out, 10 ** 14) is not None
+    # moves the price by far more than the 10 ticks of the spacing
+    assert quoter.quote_in_tick(pool, token_in, token_out, 10 ** 17) is None
+
+
+def test_pools_are_cached_per_chain(monkeypatch):
+    fetched = []
+
+    async def fetch_pool(self, w3, pair):
+        fetched.append((w3, pair))
+        return create_pool(Q96, len(fetched))
+
+    monkeypatch.setattr(V3Quoter, '_fetch_pool', fetch_pool)
+    quoter = V3Quoter(PANCAKE_DEPLOYER, PANCAKE_INIT_CODE_HASH, {500: 10})
+
+    async def run():
+        return [
+            await quoter.get_pool('bsc', 56, BSC_WBNB, BSC_USDT),
+            await quoter.get_pool('bsc', 56, BSC_USDT, BSC_WBNB),
+            await quoter.get_pool('eth', 1, BSC_WBNB, BSC_USDT),
+        ]
+
+    bsc_pool, same_pool, eth_pool = asyncio.run(run())
+
+    assert bsc_pool is same_pool
+    assert eth_pool is not bsc_pool
+    assert fetched == [('bsc', sort_tokens(BSC_WBNB, BSC_USDT)), ('eth', sort_tokens(BSC_WBNB, BSC_USDT))]
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+import min_library.models.others.exceptions as exceptions
+import min_library.models.runner.worker as worker_module
+from min_library.models.runner.job_lease import JobLease, check_lease, current_lease
+from min_library.models.runner.worker import CoordinatorWorker
+
+
+async def heartbeat(handler, leases: dict[str, JobLease], lease_ttl: float | None = None) -> float:
+    app = web.Application()
+    app.router.add_post('/heartbeat', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    worker = CoordinatorWorker(f'http://127.0.0.1:{port}', accounts=[], modules={})
+    worker.lease_ttl = lease_ttl
+    worker._leases = leases
+
+    try:
+        async with aiohttp.ClientSession() as worker._session:
+            start = time.monotonic()
+            await worker._send_heartbeat()
+            return time.monotonic() - start
+    finally:
+        await runner.cleanup()
+
+
+def test_check_lease_raises_only_in_a_job_with_lost_lease():
+    check_lease()
+
+    lease = JobLease('1:bridge_coredao')
+    token = current_lease.set(lease)
+    try:
+        check_lease()
+
+        lease.is_lost = True
+        with pytest.raises(exceptions.LeaseLost):
+            check_lease()
+    finally:
+        current_lease.reset(token)
+
+    check_lease()
+
+
+def test_heartbeat_marks_leases_reported_lost():
+    async def handle(request):
+        return web.json_response({'lost': ['1:module']})
+
+    leases = {'1:module': JobLease('1:module'), '2:module': JobLease('2:module')}
+    asyncio.run(heartbeat(handle, leases))
+
+    assert leases['1:module'].is_lost
+    assert not leases['2:module'].is_lost
+
+
+def test_slow_heartbeat_is_not_retried(monkeypatch):
+    monkeypatch.setattr(worker_module, 'HEARTBEAT_TIMEOUT', 0.2)
+
+    async def handle(request):
+        await asyncio.sleep(3)
+        return web.json_response({'lost': []})
+
+    lease = JobLease('1:module')
+    duration = asyncio.run(heartbeat(handle, {'1:module': lease}, lease_ttl=60))
+
+    assert duration < 1
+    assert not lease.is_lost
+
+
+def test_failed_heartbeats_lose_leases_not_renewed_for_lease_ttl():
+    async def handle(request):
+        raise web.HTTPServiceUnavailable()
+
+    expired = JobLease('1:module')
+    expired.renewed_at -= 61
+    leases = {'1:module': expired, '2:module': JobLease('2:module')}
+    asyncio.run(heartbeat(handle, leases, lease_ttl=60))
+
+    assert leases['1:module'].is_lost
+    assert not leases['2:module'].is_lost
@@ -4,16 +4,19 @@ from typing import (
 )
 
 from min_library.models.account.account_manager import AccountInfo
-from min_library.models.client import Client
+from min_library.models.account.account_session import get_account_session
 from min_library.models.logger.logger import console_logger
 from min_library.models.networks.networks import Networks
 from min_library.models.others.constants import LogStatus, TokenSymbol
+from min_library.models.runner.shared_slots import shared_slots
 from min_library.models.swap.swap_info import SwapInfo
+from min_library.models.tracing.tracer import tracer
 from min_library.utils.helpers import delay
 from tasks.pancake_swap.pancake_swap import PancakeSwap
 from tasks.shadow_swap.shadow_swap import ShadowSwap
 from tasks.coredao.coredao import CoreDaoBridge
 from tasks.stargate.stargate import Stargate
+from tasks.swap_task import SwapTask
 from tasks.testnet_bridge.testnet_bridge import TestnetBridge
 from user_data.settings.settings import (
     IS_SLEEP
@@ -30,27 +33,27 @@ async def _default_settings(
     module_info: SwapInfo,
     swap_info: SwapInfo,
 ) -> int:
-    client = Client(
-        account_id=account_info.account_id,
-        private_key=account_info.private_key,
-        proxy=account_info.proxy,
-        network=(
-            module_info.from_network
-            if module_info
-            else swap_info.from_network
-        )
-    )
+    tracer.set_track(account_info.account_id)
 
-    module_instance = module(client=client)
+    with tracer.span(module.__name__, 'module', account=account_info.account_id):
+        network = module_info.from_network if module_info else swap_info.from_network
 
-    if module_info:
-        swap_info = module_info
+        with tracer.span('Client', 'setup'):
+            client = get_account_session(account_info).get_client(network)
 
-    client.account_manager.custom_logger.log_message(
-        LogStatus.INFO, f'Started {module.__name__}'
-    )
+        module_instance = module(client=client)
+
+        if module_info:
+            swap_info = module_info
+
+        client.account_manager.custom_logger.log_message(
+            LogStatus.INFO, f'Started {module.__name__}'
+        )
+
+        # the limit of accounts in the network is shared by all shards
+        async with shared_slots.network(network.name):
+            wait_time = await action(module_instance, swap_info)
 
-    wait_time = await action(module_instance, swap_info)
     return wait_time
 
 
@@ -70,7 +73,7 @@ async def bridge_stargate(
 
     return await _default_settings(
         module=stargate_instance,
-        action=stargate_instance.crosschain_swap,
+        action=stargate_instance.bridge,
         account_info=account_info,
         module_info=module_info,
         swap_info=swap_info
@@ -127,9 +130,8 @@ async def swap_pancake(
 ) -> int:
     swap_info = SwapInfo(
         from_token=TokenSymbol.USDT,
-        to_token=TokenSymbol.USDT,
-        from_network=Networks.Polygon,
-        to_network=Networks.Polygon
+        to_token=TokenSymbol.USDC,
+        from_network=Networks.BSC
     )
 
     pancakeswap_instance = PancakeSwap
@@ -166,6 +168,30 @@ async def swap_shadowswap(
     )
 
 
+async def transfer_tokens(
+    account_info: AccountInfo,
+    module_info: SwapInfo | None = None
+) -> int:
+    swap_info = SwapInfo(
+        from_network=Networks.BSC,
+        from_token=TokenSymbol.USDT,
+        amount_from=0.9,
+        amount_to=1.0
+    )
+
+    transfer_instance = SwapTask
+
+    return await _default_settings(
+        module=transfer_instance,
+        action=lambda task, info: task.transfer(
+            info, account_info.recipient_address
+        ),
+        account_info=account_info,
+        module_info=module_info,
+        swap_info=swap_info
+    )
+
+
 async def custom_routes(account_info: AccountInfo):    
     CLASSIC_ROUTES_MODULES_USING = [    
         # [
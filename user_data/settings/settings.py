@@ -44,8 +44,175 @@ SLEEP_BETWEEN_BRIDGES_ON_ONE_ACCOUNT_TO = 60  # secs
 SLEEP_BETWEEN_ACCS_FROM = 100  # secs
 SLEEP_BETWEEN_ACCS_TO = 600  # secs
 
+# How many processes run the accounts (1 - all accounts in this process one by one)
+# Every process has its own event loop and RPC connections, use it for hundreds of wallets
+# (can be changed with: python main.py --shards 4)
+SHARDS = 1
+# How many accounts one process runs at the same time
+ACCOUNTS_PER_SHARD = 20
+# How many accounts all processes run at the same time (None - no limit)
+MAX_CONCURRENT_ACCOUNTS = None
+# How many accounts all processes run at the same time in a network, like {'bsc': 10}
+# (the network a module starts in, the limit is held while the module runs)
+NETWORK_CONCURRENCY_LIMITS = {}
+
+# Coordinator/worker mode to spread accounts across several machines:
+#   python main.py --coordinator                       (one machine, owns the account queue)
+#   python main.py --worker http://<coordinator>:8600  (every machine, with the same private keys)
+# Add --resume to the coordinator to skip the accounts succeeded in the last run of the journal
+COORDINATOR_HOST = '127.0.0.1'  # '0.0.0.0' - accept workers from other machines
+COORDINATOR_PORT = 8600
+# The shared secret of the coordinator and workers (None - no check)
+COORDINATOR_TOKEN = None
+COORDINATOR_JOURNAL_FILE = 'user_data/logs/journal.jsonl'
+# A job is given to another worker if its worker sends no heartbeat for this time (secs)
+LEASE_TTL = 60
+# How often (secs) workers renew their leases (must be less than LEASE_TTL)
+HEARTBEAT_INTERVAL = 15
+# How many times a job is given to workers before it is failed
+MAX_JOB_ATTEMPTS = 3
+# How many accounts one worker runs at the same time
+WORKER_CAPACITY = 20
+
 # Do you want to create log file for every wallet? Yes - True, No - False
 IS_CREATE_LOGS_FOR_EVERY_WALLET = True
 
-# (not working now) How many retries will be executed if fail?
-RETRY_COUNT = 3
+# How many wallet log files can be opened at the same time?
+# The least recently used file is closed when the limit is reached
+MAX_OPEN_ACCOUNT_LOG_FILES = 64
+
+# Rotate wallet log file when it reaches this size in bytes (0 - never rotate)
+ACCOUNT_LOG_MAX_BYTES = 5 * 1024 * 1024
+# How many rotated wallet log files to keep
+ACCOUNT_LOG_BACKUP_COUNT = 3
+# Do you want to compress rotated wallet log files (.gz)? Yes - True, No - False
+IS_COMPRESS_ACCOUNT_LOGS = True
+
+# Do you want to write machine-readable events (APPROVED, BRIDGED, SWAPPED, FAILED)
+# to a JSONL file? Yes - True, No - False
+# Summary: python -m min_library.utils.events_report user_data/logs/events.jsonl
+IS_WRITE_EVENTS = True
+EVENTS_FILE = 'user_data/logs/events.jsonl'
+# How many events to keep in memory before writing them to the file
+EVENTS_BUFFER_SIZE = 50
+
+# Send all RPC requests of all networks to this URL (for example, to the local
+# mock server: python -m min_library.models.mock_rpc.mock_rpc_server --port 8545)
+# Set None to use real RPCs
+RPC_OVERRIDE = None
+
+# How long (secs) token prices from Binance are cached
+PRICE_CACHE_TTL = 60
+# Path to JSON file with local prices for offline runs, like {"ETH": 3000, "BNB": 550}
+# Set None to use Binance
+PRICES_FILE = None
+
+# Do you want to collect per-method RPC statistics (count, latency, errors)
+# and save them at the end of work? Yes - True, No - False
+IS_RPC_STATS = True
+RPC_STATS_FILE = 'user_data/logs/rpc_stats.json'
+# Do you want the statistics to count the payload sizes too? Every request and response
+# is serialized once more to be measured, so it's off for production runs
+IS_RPC_PAYLOAD_SIZES = False
+
+# Do you want to publish Prometheus metrics (accounts, txs in flight, confirmations,
+# RPC errors, gas spent)? Yes - True, No - False
+IS_METRICS = False
+# The file for node_exporter's textfile collector (None - don't write)
+METRICS_FILE = 'user_data/logs/metrics.prom'
+# How often (secs) the metrics file is rewritten
+METRICS_INTERVAL = 15
+# The port of the HTTP endpoint http://<host>:<port>/metrics (None - don't serve)
+METRICS_PORT = None
+
+# Do you want to record a timeline of every account (module stages, RPC calls, sleeps)?
+# Yes - True, No - False
+# Open the file in chrome://tracing or https://ui.perfetto.dev
+IS_TRACING = False
+TRACE_FILE = 'user_data/logs/trace.json'
+# How many spans to keep at most (the rest are dropped)
+TRACE_MAX_EVENTS = 1_000_000
+
+# Where to save reports of `python main.py --profile`
+PROFILE_FOLDER = 'user_data/logs/profiles'
+# How often (secs) the profiler takes samples
+PROFILE_INTERVAL = 0.005
+
+# Do you want to watch for code that blocks the event loop (sync HTTP requests,
+# file I/O, ...) and log its stack? Yes - True, No - False
+IS_LOOP_MONITOR = False
+# Report the event loop blocked for longer than this (secs)
+LOOP_BLOCK_THRESHOLD = 0.25
+
+# How long (secs) DEX pool states (V2 reserves, V3 slot0 and liquidity) are used
+# for local quotes (about a block of the network)
+RESERVES_CACHE_TTL = 3
+# A local V2 quote that matched the router is trusted for this many quotes and at most
+# this long (secs), then it is checked against the router again (fee-on-transfer tokens,
+# changed pair fees)
+V2_QUOTE_VERIFY_EVERY = 20
+V2_QUOTE_VERIFY_TTL = 300
+
+# Do you want to take gas limits from the gasUsed of previous transactions of the same
+# contract method instead of eth_estimateGas? Yes - True, No - False
+# (eth_estimateGas also fails on a transaction that would revert, with learned limits
+# such a transaction is sent and reverts on chain)
+IS_GAS_MODEL = True
+GAS_MODEL_FILE = 'user_data/logs/gas_model.json'
+# How many successful transactions of a contract method are needed to skip eth_estimateGas
+GAS_MODEL_MIN_SAMPLES = 5
+# The gas limit is this percentile of gasUsed plus the headroom (0.2 - 20%)
+GAS_MODEL_PERCENTILE = 95
+GAS_MODEL_HEADROOM = 0.2
+# How many latest gasUsed values are kept for a contract method
+GAS_MODEL_MAX_SAMPLES = 200
+
+# Do you want to remember token allowances of wallets across runs and read them on chain
+# only when the known allowance is not enough? Yes - True, No - False
+IS_ALLOWANCE_LEDGER = True
+ALLOWANCE_LEDGER_FILE = 'user_data/logs/allowances.json'
+
+# The snapshot of user agents for RPC requests ([{"useragent": ..., "percent": ...}])
+USER_AGENTS_FILE = 'user_data/input_data/user_agents.json'
+# Every account gets a user agent once and keeps it in this file across runs
+ACCOUNT_USER_AGENTS_FILE = 'user_data/input_data/account_user_agents.json'
+
+# Encrypted keystores (Web3 Secret Storage) used in addition to private_keys.txt
+# Create them: python -m min_library.models.account.key_store encrypt
+KEYSTORES_FOLDER = 'user_data/input_data/keystores'
+# The environment variable with the keystores password (asked in the console if not set)
+KEYSTORE_PASSWORD_ENV = 'KEYSTORE_PASSWORD'
+# How many processes decrypt keystores (None - all cores)
+KEYSTORE_WORKERS = None
+
+# Limits of RPC requests per second, requests over the limit wait in a queue instead of failing:
+#   (requests per second, burst - how many requests may be sent at once)
+# By a part of the RPC URL, the matching RPCs of all networks share the limit (one API key), like
+#   {'rpc.ankr.com': (25, 50), 'bsc-dataseed': (10, 20)}
+RPC_RATE_LIMITS = {}
+# The limit of every other RPC (None - no limit)
+DEFAULT_RPC_RATE_LIMIT = None
+# The limit of every proxy (None - no limit)
+PROXY_RATE_LIMIT = None
+# (the limits are per process, with SHARDS divide them by the number of shards)
+
+# Retries of failed RPC requests and transactions by the kind of error:
+#   'kind': (attempts including the first one, the first delay, the max delay (secs))
+# The delay doubles on every retry and is randomized (0..delay). Other errors
+# (reverts, insufficient funds, ...) are not retried
+RETRY_RULES = {
+    'transient': (4, 0.5, 8),  # timeouts, dropped connections, 5xx, node internal errors
+    'rate_limited': (5, 1, 30),  # HTTP 429, JSON-RPC -32005
+    'nonce': (3, 0.5, 2),  # nonce too low, the nonce is read again
+    'underpriced': (3, 1, 5),  # the gas price is raised by UNDERPRICED_GAS_BUMP
+}
+# How many retries may be made per request to one RPC (0.2 - one retry per 5 requests)
+# and at most in a burst, so retries don't multiply the load of a failing RPC
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MAX = 20
+# Requests to an RPC fail at once for CIRCUIT_BREAKER_RESET secs after this number of
+# timeouts or rate limit errors in a row
+CIRCUIT_BREAKER_FAILURES = 5
+CIRCUIT_BREAKER_RESET = 30
+# How much the gas price of an underpriced transaction is raised (0.125 - 12.5%)
+UNDERPRICED_GAS_BUMP = 0.125